@@ -45,6 +45,13 @@ setup(
     python_requires=">=3.7",
     install_requires=requirements,
     extras_require={
+        "sparse": [
+            "scipy>=1.5.0",
+        ],
+        "numba": [
+            "numba>=0.53.0",
+            "scipy>=1.5.0",
+        ],
         "dev": [
             "pytest>=6.0.0",
             "pytest-cov>=2.0.0",
@@ -1,9 +1,548 @@
-from ._general import Enviroment
-import matplotlib
+from ._general import Enviroment, SparseMatrix, _COMPILED_MAX_REACTIONS, _compile_rate_of_change, _compound_index, _indexed_items, _mass_action_jacobian, _read_only, _resolve_backend
+import numbers
+import os
+import queue
 import random
-from itertools import count
+import threading
 import numpy as np
 
+# Dormand–Prince 5(4) tableau used by the "rk45" integration method.
+_DOPRI_C = np.array([0, 1/5, 3/10, 4/5, 8/9, 1])
+_DOPRI_A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+]
+_DOPRI_B = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84])
+_DOPRI_E = np.array([71/57600, 0, -71/16695, 71/1920, -17253/339200, 22/525, -1/40])
+
+# TR-BDF2 constants: trapezoidal stage to t + gamma*h, then BDF2 to t + h.
+_TRBDF2_GAMMA = 2 - np.sqrt(2)
+_TRBDF2_D = _TRBDF2_GAMMA / 2
+_TRBDF2_W = (1 + np.sqrt(2)) / 2
+_TRBDF2_ERROR = (-3 * _TRBDF2_GAMMA ** 2 + 4 * _TRBDF2_GAMMA - 2) / (12 * (2 - _TRBDF2_GAMMA))
+
+class _RateLaw:
+    """
+    Evaluates the power-law products `prod_j c_j ** a_rj` of every reaction `r` in one direction.
+
+    Integer and half-integer orders are expanded once into a padded `(n_factors, n_reactions)`
+    table of indices: an order of 2 lists the compound twice, the half of 1.5 points at its
+    square root, and unused slots point at a constant 1. A product is then a single gather
+    and `prod` with no transcendental calls, and a depleted reactant gives an exact zero.
+    Only truly fractional (or negative) orders go through `exp(orders @ log(c + eps))`.
+    """
+    # Higher orders are left to the log/exp path rather than expanded into that many factors.
+    _MAX_EXPANDED_ORDER = 8
+
+    def __init__(self , orders , eps = 1e-300):
+        if isinstance(orders , SparseMatrix):
+            rows , columns , values = orders.rows , orders.indices , orders.data.astype(float)
+        else:
+            orders = np.asarray(orders , dtype=float)
+            rows , columns = np.nonzero(orders)
+            values = orders[rows , columns]
+        n_reactions , n_compounds = orders.shape
+        self.n_compounds = n_compounds
+        self.eps = eps
+        twice = 2 * values
+        expanded = (values > 0) & (values <= self._MAX_EXPANDED_ORDER) & (twice == np.round(twice))
+        # Gathered vector layout: [c, sqrt(c[half_columns]), 1].
+        half = expanded & (np.round(twice) % 2 == 1)
+        self._half_columns = columns[half]
+        repeats = np.floor(values[expanded]).astype(int)
+        factor_rows = np.concatenate([np.repeat(rows[expanded] , repeats) , rows[half]])
+        factor_columns = np.concatenate([np.repeat(columns[expanded] , repeats) , n_compounds + np.arange(half.sum())])
+        order = np.argsort(factor_rows , kind="stable")
+        factor_rows , factor_columns = factor_rows[order] , factor_columns[order]
+        slot = np.arange(len(factor_rows)) - np.searchsorted(factor_rows , factor_rows)
+        n_factors = slot.max() + 1 if len(slot) else 0
+        self._factors = np.full((n_factors , n_reactions) , n_compounds + len(self._half_columns))
+        self._factors[slot , factor_rows] = factor_columns
+        fractional = ~expanded
+        reactions , local_rows = np.unique(rows[fractional] , return_inverse=True)
+        indptr = np.concatenate([[0] , np.cumsum(np.bincount(local_rows , minlength=len(reactions)))])
+        self._fractional = (reactions , SparseMatrix(values[fractional] , columns[fractional] , indptr , (len(reactions) , n_compounds)))
+
+    def __call__(self , concentrations):
+        """
+        Args:
+            concentrations (numpy.ndarray): Non-negative concentrations of shape `(..., n_compounds)`.
+
+        Returns:
+            numpy.ndarray: Products of shape `(..., n_reactions)`; reactions without orders give 1.
+        """
+        gathered = np.empty(concentrations.shape[:-1] + (self.n_compounds + len(self._half_columns) + 1 ,))
+        gathered[..., :self.n_compounds] = concentrations
+        if len(self._half_columns):
+            np.sqrt(concentrations[..., self._half_columns] , out=gathered[..., self.n_compounds:-1])
+        gathered[..., -1] = 1.0
+        if concentrations.ndim == 1:
+            products = gathered[self._factors].prod(axis=0)
+        else:
+            products = gathered[..., self._factors].prod(axis=-2)
+        reactions , orders = self._fractional
+        if len(reactions):
+            log_c = np.log(concentrations + self.eps)
+            products[..., reactions] *= np.exp(orders @ log_c.T).T
+        return products
+
+def _rate_laws(rate_dependencies):
+    """
+    Build the forward and backward `_RateLaw` of a network.
+
+    Args:
+        rate_dependencies (numpy.ndarray | list[SparseMatrix]): Rate orders of shape
+            `(n_reactions, 2, n_compounds)`, or the `[forward, backward]` CSR pair.
+
+    Returns:
+        tuple[_RateLaw, _RateLaw]: `(forward, backward)`.
+    """
+    if isinstance(rate_dependencies , np.ndarray):
+        return _RateLaw(rate_dependencies[:, 0, :]) , _RateLaw(rate_dependencies[:, 1, :])
+    return _RateLaw(rate_dependencies[0]) , _RateLaw(rate_dependencies[1])
+
+def _rate_of_change(concentrations, rate_laws, stoichiometric_coefficient, rate_constants):
+    """
+    Evaluate dc/dt for the mass-action network described by the environment arrays.
+
+    Args:
+        concentrations (numpy.ndarray): Concentration vector of shape `(n_compounds,)`, or
+            `(n_members, n_compounds)` for an ensemble.
+        rate_laws (tuple[_RateLaw, _RateLaw]): Forward and backward rate laws, see `_rate_laws`.
+        stoichiometric_coefficient (numpy.ndarray): Stoichiometric matrix of shape `(n_reactions, n_compounds)`.
+        rate_constants (numpy.ndarray): `[kf, kb]` rows of shape `(n_reactions, 2)`, or
+            `(n_members, n_reactions, 2)` for per-member rate constants.
+
+    Returns:
+        numpy.ndarray: Rate of change of every concentration, with the shape of `concentrations`.
+    """
+    c = np.maximum(concentrations, 0)
+    rf = rate_laws[0](c) * rate_constants[..., 0]
+    rb = rate_laws[1](c) * rate_constants[..., 1]
+    return (rb - rf) @ stoichiometric_coefficient
+
+def _sparse_rate_of_change(concentrations, rate_laws, stoichiometric_coefficient, rate_constants):
+    """
+    Sparse counterpart of `_rate_of_change`; the cost scales with the non-zero species entries.
+
+    Args:
+        concentrations (numpy.ndarray): Concentration vector of shape `(n_compounds,)`, or
+            `(n_members, n_compounds)` for an ensemble.
+        rate_laws (tuple[_RateLaw, _RateLaw]): Forward and backward rate laws, see `_rate_laws`.
+        stoichiometric_coefficient (SparseMatrix): Stoichiometric matrix of shape `(n_reactions, n_compounds)`.
+        rate_constants (numpy.ndarray): `[kf, kb]` rows of shape `(n_reactions, 2)`, or
+            `(n_members, n_reactions, 2)` for per-member rate constants.
+
+    Returns:
+        numpy.ndarray: Rate of change of every concentration, with the shape of `concentrations`.
+    """
+    c = np.maximum(concentrations, 0)
+    rf = rate_laws[0](c) * rate_constants[..., 0]
+    rb = rate_laws[1](c) * rate_constants[..., 1]
+    # Members are laid out as columns so the CSR product acts on all of them at once.
+    return (stoichiometric_coefficient.T @ (rb - rf).T).T
+
+class _Network:
+    """
+    Rate-law structure of a mass-action network: rate orders and stoichiometry.
+
+    The structure is fixed while rate constants vary, so the rate laws are built
+    once and `rate_functions` only binds a set of rate constants. Instances hold
+    plain arrays (dense, or `SparseMatrix` for sparse networks) and pickle
+    compactly, so they can be shipped to worker processes once.
+
+    Args:
+        rate_dependencies (numpy.ndarray | list[SparseMatrix]): Rate orders of shape
+            `(n_reactions, 2, n_compounds)`, or the `[forward, backward]` CSR pair.
+        stoichiometric_coefficient (numpy.ndarray | SparseMatrix): Stoichiometric matrix of
+            shape `(n_reactions, n_compounds)`.
+    """
+    def __init__(self , rate_dependencies , stoichiometric_coefficient):
+        self.sparse = isinstance(stoichiometric_coefficient , SparseMatrix)
+        self.rate_dependencies = rate_dependencies
+        self.stoichiometric_coefficient = stoichiometric_coefficient
+        self.rate_laws = _rate_laws(rate_dependencies)
+        self._dense_arrays = None
+
+    @classmethod
+    def from_enviroment(cls , enviroment , sparse = False):
+        """Read the network structure of an `Enviroment` in dense or sparse form."""
+        compiled = enviroment.compiled
+        if sparse:
+            return cls(compiled.sparse_rate_dependency_array , compiled.sparse_stoichiometric_coefficient_array)
+        return cls(compiled.rate_dependency_array , compiled.stoichiometric_coefficient_array)
+
+    @property
+    def shape(self):
+        """tuple: `(n_reactions, n_compounds)`."""
+        return self.stoichiometric_coefficient.shape
+
+    def rate_functions(self , rate_constants):
+        """
+        Bind rate constants and return `(rate_of_change, jacobian)` evaluators.
+
+        Args:
+            rate_constants (numpy.ndarray): `[kf, kb]` rows of shape `(n_reactions, 2)`, or
+                `(n_members, n_reactions, 2)` for an ensemble.
+
+        Returns:
+            tuple: `(rate_of_change, jacobian)`, both taking a concentration vector or an
+                `(n_members, n_compounds)` batch. The Jacobian is always dense; for sparse
+                networks the dense arrays are only built when it is first requested.
+        """
+        rate_laws , stoichiometric_coefficient = self.rate_laws , self.stoichiometric_coefficient
+        if self.sparse:
+            def rate_of_change(c):
+                return _sparse_rate_of_change(c, rate_laws, stoichiometric_coefficient, rate_constants)
+        else:
+            def rate_of_change(c):
+                return _rate_of_change(c, rate_laws, stoichiometric_coefficient, rate_constants)
+        def jacobian(c):
+            rate_dependencies , stoichiometry = self._dense()
+            return _mass_action_jacobian(c, rate_dependencies, stoichiometry, rate_constants)
+        return rate_of_change , jacobian
+
+    def _dense(self):
+        if self._dense_arrays is None:
+            if self.sparse:
+                forward , backward = self.rate_dependencies
+                self._dense_arrays = (np.stack([forward.toarray() , backward.toarray()] , axis=1) ,
+                                      self.stoichiometric_coefficient.toarray())
+            else:
+                self._dense_arrays = (self.rate_dependencies , self.stoichiometric_coefficient)
+        return self._dense_arrays
+
+def _error_norm(scaled_error):
+    """
+    RMS norm of a scaled local error estimate.
+
+    For an ensemble of shape `(n_members, n_compounds)` the worst member decides, so
+    every member shares the accepted step size. A network without compounds has no error.
+    """
+    if np.shape(scaled_error)[-1] == 0:
+        return 0.0
+    return np.sqrt(np.max(np.mean(scaled_error ** 2, axis=-1)))
+
+def _check_finite(values , t):
+    """
+    Stop an adaptive run whose state, rate or error estimate is no longer finite.
+
+    Raises:
+        FloatingPointError: If `values` contains NaN or infinity.
+    """
+    if not np.all(np.isfinite(values)):
+        raise FloatingPointError(f"The integration produced non-finite values at t = {t:g}; "
+                                 "a rate overflowed or the concentrations diverged.")
+
+def _check_step_size(h , t):
+    """
+    Stop an adaptive run whose step size has collapsed below the resolution of `t`.
+
+    Raises:
+        FloatingPointError: If `h` is smaller than `16 * eps * max(|t|, 1)`.
+    """
+    if h < 16 * np.finfo(float).eps * max(abs(t) , 1.0):
+        raise FloatingPointError(f"The step size dropped to {h:g} at t = {t:g}, below the floating point "
+                                 "resolution; the tolerances cannot be met.")
+
+def _factorized_solver(matrix):
+    """
+    Factorize `matrix` once and return a callable that solves it for new right-hand sides.
+
+    A single matrix is LU-factorized with `scipy.linalg.lu_factor` and every solve reuses
+    the factors through `lu_solve`. Without SciPy, or for a stack of per-member matrices of
+    shape `(n_members, n_compounds, n_compounds)`, each call falls back to `np.linalg.solve`.
+    """
+    if matrix.ndim == 2:
+        try:
+            from scipy.linalg import lu_factor, lu_solve
+        except ImportError:
+            pass
+        else:
+            factors = lu_factor(matrix , check_finite=False)
+            return lambda rhs: lu_solve(factors , rhs.T , check_finite=False).T
+    return lambda rhs: np.linalg.solve(matrix , rhs[... , None])[... , 0]
+
+class _CheckpointCursor:
+    """
+    Records concentrations at requested checkpoint times while a run advances.
+
+    The checkpoint times are sorted once and walked with a cursor, so a step that
+    contains no checkpoint costs a single comparison. Values are interpolated at
+    the exact requested times inside the step that contains them: linearly for the
+    explicit Euler polygon, and with a cubic Hermite polynomial built from the
+    end-point rates for the adaptive methods.
+    """
+    def __init__(self , checkpoint_time):
+        self.times = sorted(float(checkpoint_t) for checkpoint_t in checkpoint_time if checkpoint_t >= 0)
+        self.position = 0
+        self.states = []
+
+    def advance(self , t , step_size , old_concentrations , new_concentrations , rates = None):
+        """
+        Capture every pending checkpoint that falls inside the step ending at `t`.
+
+        Args:
+            t (float): Time at the end of the step.
+            step_size (float): Length of the step.
+            old_concentrations (numpy.ndarray): State at `t - step_size`.
+            new_concentrations (numpy.ndarray): State at `t`.
+            rates (tuple | None): `(start_rate, end_rate)` for Hermite interpolation, or None for linear.
+        """
+        while self.position < len(self.times) and self.times[self.position] <= t:
+            theta = 1.0 - (t - self.times[self.position]) / step_size if step_size > 0 else 1.0
+            theta = min(max(theta , 0.0) , 1.0)
+            if rates is None:
+                state = old_concentrations + theta * (new_concentrations - old_concentrations)
+            else:
+                theta2 , theta3 = theta * theta , theta * theta * theta
+                state = ((2 * theta3 - 3 * theta2 + 1) * old_concentrations
+                         + (theta3 - 2 * theta2 + theta) * step_size * rates[0]
+                         + (3 * theta2 - 2 * theta3) * new_concentrations
+                         + (theta3 - theta2) * step_size * rates[1])
+                state = np.maximum(state , 0)
+            self.states.append(state)
+            self.position += 1
+
+    def hold(self , concentrations , t):
+        """Record `concentrations` for every pending checkpoint up to `t` (used after a steady state)."""
+        while self.position < len(self.times) and self.times[self.position] <= t:
+            self.states.append(concentrations)
+            self.position += 1
+
+class _TrajectoryBuffer:
+    """
+    Preallocated `(time, concentrations)` storage filled while a run advances.
+
+    Every `stride`-th step is written into NumPy arrays that are sized up front
+    (and doubled if an adaptive run needs more room), so recording costs one row
+    copy per kept step and the plot can be drawn afterwards with one line per species.
+    The initial and final states are always kept.
+    """
+    def __init__(self , initial_concentrations , capacity , stride = 1 , start_time = 0.0 , record_initial = True):
+        self.initial_concentrations = np.asarray(initial_concentrations , dtype=float)
+        self.start_time = start_time
+        self.stride = stride
+        self.size = 0
+        self._steps_since_record = 0
+        self._pending = None
+        self._allocate(capacity , self.initial_concentrations.shape)
+        if record_initial:
+            self._append(start_time , self.initial_concentrations)
+
+    def record(self , t , concentrations):
+        """Keep the state at time `t` if it falls on the stride."""
+        self._steps_since_record += 1
+        if self._steps_since_record >= self.stride:
+            self._append(t , concentrations)
+            self._steps_since_record = 0
+            self._pending = None
+        else:
+            self._pending = (t , concentrations)
+
+    def finish(self):
+        """Keep the last state even when it is not on the stride."""
+        if self._pending is not None:
+            self._append(*self._pending)
+            self._pending = None
+
+    @property
+    def time(self):
+        """numpy.ndarray: Recorded times, shape `(n_records,)`."""
+        return self.times[:self.size]
+
+    @property
+    def concentrations(self):
+        """numpy.ndarray: Recorded states, shape `(n_records, n_compounds)`."""
+        return self.states[:self.size]
+
+    def _allocate(self , capacity , shape):
+        self.times = np.empty(max(int(capacity) , 1) + 1)
+        self.states = np.empty((len(self.times) ,) + shape)
+
+    def _append(self , t , concentrations):
+        if self.size == len(self.times):
+            self.times = np.concatenate([self.times , np.empty(len(self.times))])
+            self.states = np.concatenate([self.states , np.empty(self.states.shape)])
+        self.times[self.size] = t
+        self.states[self.size] = concentrations
+        self.size += 1
+
+class _RingBuffer:
+    """
+    Fixed-capacity `(time, concentrations)` storage keeping only the latest records.
+
+    Once full, each append overwrites the oldest record, so memory and the cost of
+    reading the buffer back stay constant however long a live run lasts.
+    """
+    def __init__(self , capacity , n_compounds):
+        self.times = np.empty(capacity)
+        self.states = np.empty((capacity , n_compounds))
+        self.size = 0
+        self._next = 0
+
+    def __len__(self):
+        return self.size
+
+    def append(self , t , concentrations):
+        """Store a record, overwriting the oldest one when full."""
+        self.times[self._next] = t
+        self.states[self._next] = concentrations
+        self._next = (self._next + 1) % len(self.times)
+        self.size = min(self.size + 1 , len(self.times))
+
+    def ordered(self):
+        """
+        Return the records in time order as `(times, states)`.
+
+        The arrays are views while the buffer has not wrapped around yet and copies afterwards.
+        """
+        if self.size < len(self.times):
+            return self.times[:self.size] , self.states[:self.size]
+        return (np.concatenate([self.times[self._next:] , self.times[:self._next]]) ,
+                np.concatenate([self.states[self._next:] , self.states[:self._next]]))
+
+def _expanded_limits(low , high , data_low , data_high , margin = 0.1):
+    """
+    Grow the axis range `(low, high)` so it covers `[data_low, data_high]` with some headroom.
+
+    Returns None when the data already fits, so the axes (and the blitting
+    background) only have to be redrawn when the range actually changes.
+    """
+    if low <= data_low and data_high <= high:
+        return None
+    span = max(data_high - data_low , abs(data_high) , 1e-12)
+    return (min(low , data_low - margin * span) , max(high , data_high + margin * span))
+
+def _trajectory_paths(path):
+    """Return the `(states, time, species)` `.npy` paths of an on-disk trajectory."""
+    path = os.fspath(path)
+    root = path[:-4] if path.endswith(".npy") else path
+    return root + ".npy" , root + ".time.npy" , root + ".species.npy"
+
+class _NpyAppender:
+    """
+    `.npy` file that grows along its first axis while rows are written into a memmap.
+
+    Rows go straight into a memory-mapped block of `block_rows` rows at the end of the
+    file; when the block is full the file is extended and the next block is mapped.
+    The header is rewritten in place after every block, so an interrupted run still
+    leaves a readable file holding everything up to the last flushed block.
+    """
+    HEADER_LENGTH = 128
+
+    def __init__(self , path , row_shape , dtype = float , append = False , block_rows = 4096):
+        self.path = path
+        self.row_shape = tuple(row_shape)
+        self.dtype = np.dtype(dtype)
+        self.block_rows = block_rows
+        self.row_bytes = int(np.prod(self.row_shape , dtype=int)) * self.dtype.itemsize
+        self._block = None
+        if append and os.path.exists(path):
+            with open(path , "rb") as f:
+                version = np.lib.format.read_magic(f)
+                if version == (1 , 0):
+                    shape , fortran_order , dtype = np.lib.format.read_array_header_1_0(f)
+                else:
+                    shape , fortran_order , dtype = np.lib.format.read_array_header_2_0(f)
+                self.offset = f.tell()
+            if fortran_order or dtype != self.dtype or tuple(shape[1:]) != self.row_shape:
+                raise ValueError(f"Cannot append to {path}: stored array has shape {shape} and dtype {dtype}.")
+            self.rows = shape[0]
+        else:
+            self.offset = self.HEADER_LENGTH
+            self.rows = 0
+            with open(path , "wb") as f:
+                f.write(self._header())
+
+    def append(self , row):
+        if self._block is None or self._block_size == len(self._block):
+            self._flush()
+            with open(self.path , "r+b") as f:
+                f.truncate(self.offset + (self.rows + self.block_rows) * self.row_bytes)
+            self._block = np.memmap(self.path , dtype=self.dtype , mode="r+" , offset=self.offset + self.rows * self.row_bytes , shape=(self.block_rows ,) + self.row_shape)
+            self._block_size = 0
+        self._block[self._block_size] = row
+        self._block_size += 1
+        self.rows += 1
+
+    def close(self):
+        """Flush the last block and trim the unused tail of the file."""
+        self._flush()
+        with open(self.path , "r+b") as f:
+            f.truncate(self.offset + self.rows * self.row_bytes)
+
+    def _flush(self):
+        if self._block is not None:
+            self._block.flush()
+            self._block = None
+        with open(self.path , "r+b") as f:
+            f.write(self._header())
+
+    def _header(self):
+        header = repr({"descr": np.lib.format.dtype_to_descr(self.dtype) , "fortran_order": False , "shape": (self.rows ,) + self.row_shape})
+        magic = np.lib.format.magic(1 , 0)
+        padding = self.offset - len(magic) - 2 - len(header) - 1
+        if padding < 0:
+            raise ValueError(f"Cannot append to {self.path}: its header has no room to grow.")
+        header = (header + " " * padding + "\n").encode("latin1")
+        return magic + len(header).to_bytes(2 , "little") + header
+
+class _TrajectoryFile(_TrajectoryBuffer):
+    """
+    `_TrajectoryBuffer` that writes into on-disk `.npy` memmaps instead of RAM.
+
+    States go to `<root>.npy`, times to `<root>.time.npy` and the compound names to
+    `<root>.species.npy`, so the trajectory can be opened lazily afterwards with
+    `numpy.load(path, mmap_mode="r")`. With `append=True` an existing trajectory is
+    extended: `start_time` and `initial_concentrations` are its last recorded time and
+    state, so the run picks up where the previous one stopped.
+    """
+    def __init__(self , path , species , initial_concentrations , stride = 1 , append = False):
+        state_path , time_path , species_path = _trajectory_paths(path)
+        species = np.array(species)
+        resume = append and os.path.exists(state_path)
+        if resume and list(np.load(species_path)) != list(species):
+            raise ValueError(f"Cannot append to {state_path}: it was recorded for compounds {list(np.load(species_path))}.")
+        self.state_file = _NpyAppender(state_path , (len(species) ,) , append=resume)
+        self.time_file = _NpyAppender(time_path , () , append=resume)
+        if self.state_file.rows != self.time_file.rows:
+            raise ValueError(f"Cannot append to {state_path}: its time axis has {self.time_file.rows} entries for {self.state_file.rows} states.")
+        if not resume:
+            np.save(species_path , species)
+        if self.state_file.rows:
+            super().__init__(np.array(np.load(state_path , mmap_mode="r")[-1]) , 0 , stride ,
+                             float(np.load(time_path , mmap_mode="r")[-1]) , record_initial=False)
+        else:
+            super().__init__(initial_concentrations , 0 , stride)
+
+    def finish(self):
+        super().finish()
+        self.state_file.close()
+        self.time_file.close()
+
+    @property
+    def time(self):
+        """numpy.memmap: Recorded times, read lazily from disk."""
+        return np.load(self.time_file.path , mmap_mode="r")
+
+    @property
+    def concentrations(self):
+        """numpy.memmap: Recorded states, read lazily from disk."""
+        return np.load(self.state_file.path , mmap_mode="r")
+
+    def _allocate(self , capacity , shape):
+        # Rows are appended to the files, so nothing is preallocated in memory.
+        pass
+
+    def _append(self , t , concentrations):
+        self.time_file.append(t)
+        self.state_file.append(concentrations)
+
 class KineticalCalculator:
     """
     Simulates chemical reaction kinetics within an Enviroment instance.
@@ -12,8 +551,26 @@ class KineticalCalculator:
     using the rate constants and stoichiometric relationships defined in an `Enviroment` object.
 
     Attributes:
-        accuracy (float): Time step for numerical integration (default: 1e-3).
+        accuracy (float): Time step for numerical integration (default: 1e-3). With
+            `method="rk45"` it is only the initial step of the adaptive controller.
+        method (str): Integration scheme, "euler" (fixed step), "rk45" (adaptive Dormand–Prince)
+            or "trbdf2" (adaptive implicit TR-BDF2 for stiff networks).
+        rtol (float): Relative tolerance of the adaptive step control.
+        atol (float): Absolute tolerance of the adaptive step control.
+        sparse (bool | None): Whether to use the sparse network kernels; None decides per environment.
+        backend (str): Backend that runs the fixed-step loop, "numpy" or "numba" (after any fallback).
+        rate_of_change (function): Rate of change dc/dt of the fitted environment, built by `fit`.
+            Small dense networks get the fused kernel of `Enviroment.compile_rate_of_change`;
+            larger ones a NumPy (dense or sparse) evaluator. Takes a concentration vector or a
+            `(n_members, n_compounds)` batch and can be reused by other integrators.
+        number_of_steps (int): Number of accepted steps taken by the last `calculate` call.
+        steady_state_time (float | None): Time at which the last `calculate` call with
+            `steady_state_tol` detected a steady state, or None if it ran to the end.
+        trajectory_time (numpy.ndarray): Times recorded for the plot of the last plotting `calculate` call.
+        trajectory (numpy.ndarray): Concentrations recorded at `trajectory_time`, shape `(n_records, n_compounds)`.
         fitted (bool): Indicates whether the calculator has been linked to an `Enviroment` instance.
+        model (KineticModel): Immutable snapshot of the fitted environment whose `solve` can be
+            shared by concurrent threads (after calling `fit`).
         enviroment (Enviroment): The fitted reaction environment (after calling `fit`).
         rate_constants (list[list[float]]): List of forward and backward rate constants for each reaction.
         reactions_by_index (list[list[list[int]]]): Index mapping of reactants and products per reaction.
@@ -22,7 +579,7 @@ class KineticalCalculator:
         number_of_reactions (int): Number of reactions in the environment.
         concentrations (list[float]): Current concentration values for each compound in the environment.
     """
-    def __init__(self , accuracy = 1e-3):
+    def __init__(self , accuracy = 1e-3 , method = "euler" , rtol = 1e-6 , atol = 1e-9 , sparse = None , backend = "numpy"):
         """
         Initialize the kinetic calculator with a specified numerical accuracy.
 
@@ -30,13 +587,55 @@ class KineticalCalculator:
             accuracy (float, optional): Time step (Δt) for concentration updates.
                 Smaller values yield higher accuracy but slower computation.
                 Default is 1e-3.
+            method (str, optional): Integration scheme. Options:
+                - "euler": Fixed-step explicit Euler with Δt = `accuracy` (default).
+                - "rk45": Adaptive Dormand–Prince 5(4) Runge–Kutta; `accuracy` is the initial step.
+                - "trbdf2": Adaptive, L-stable implicit TR-BDF2 for stiff networks (fast and slow
+                  reactions together); `accuracy` is the initial step.
+            rtol (float, optional): Relative tolerance for adaptive methods. Default is 1e-6.
+            atol (float, optional): Absolute tolerance for adaptive methods. Default is 1e-9.
+            sparse (bool | None, optional): Evaluate rates with the sparse (CSR) network
+                representation so each step costs O(nnz) instead of O(reactions × compounds).
+                If None (default), sparse kernels are used automatically for large networks
+                whose species tables are mostly zeros.
+            backend (str, optional): "numpy" (default) or "numba". With "numba" the whole
+                fixed-step Euler loop of `calculate`, checkpoint capture included, runs as
+                compiled code. Needs the optional `numba` package; without it a warning is
+                issued and NumPy is used.
+
+        Raises:
+            ValueError: If `method` is not one of ["euler", "rk45", "trbdf2"].
+            ValueError: If `backend` is not one of ["numpy", "numba"], or "numba" is combined
+                with an adaptive method.
         """
+        if not method in ["euler" , "rk45" , "trbdf2"]:
+            raise ValueError("`method` is not one of ['euler', 'rk45', 'trbdf2'].")
+        if backend == "numba" and method != "euler":
+            raise ValueError("`backend='numba'` only supports method='euler'.")
+        self.backend = _resolve_backend(backend)
         self.accuracy = accuracy
+        self.method = method
+        self.rtol = rtol
+        self.atol = atol
+        self.sparse = sparse
         self.fitted = False
+
+    def _settings(self):
+        # An unfitted calculator with the same, already validated settings; the backend
+        # isn't resolved again, so a missing numba warns only once.
+        calculator = object.__new__(KineticalCalculator)
+        calculator.__dict__.update({name : getattr(self , name) for name in ("backend" , "accuracy" , "method" , "rtol" , "atol" , "sparse")})
+        calculator.fitted = False
+        return calculator
+
     def fit(self , enviroment):
         """
         Link the calculator to an existing `Enviroment` instance.
 
+        The rate of change of the network is prepared here once (see `rate_of_change`),
+        so fit again after changing the environment's reactions or rate constants. An
+        immutable snapshot of the environment is stored as `model` (see `KineticModel`).
+
         Args:
             enviroment (Enviroment): The reaction environment containing all reactions and compounds.
 
@@ -55,20 +654,26 @@ class KineticalCalculator:
         self.concentrations = []
         for compound in enviroment.compounds_concentration :
             self.concentrations.append(compound["concentration"])
+        self.model = KineticModel._from_integrator(enviroment , self._settings())
+        self.rate_of_change = self.model.rate_of_change
+        if self.backend == "numba":
+            self._numba_network = (self.model.rate_constants ,) + self.model._numba_network
         self.fitted = True
 
-    def calculate(self  , time , checkpoint_time = [] , plot = False , directory = "./plot.png", colors = None):
+    def calculate(self  , time , checkpoint_time = [] , plot = False , directory = "./plot.png", colors = None , record_stride = 1 , output = None , append = False , steady_state_tol = None , steady_state_window = None):
         """
         Numerically integrate the reaction kinetics over a specified time interval.
 
         This method simulates the time evolution of compound concentrations in the
-        environment using a fixed time step defined by `self.accuracy`. It supports
+        environment using a fixed time step defined by `self.accuracy` or, with
+        `method="rk45"` / `method="trbdf2"`, an adaptive step controlled by `rtol` and `atol`. It supports
         interactive plotting, saving plots to file, and recording concentration
         snapshots at specific checkpoint times.
 
         Args:
             time (float): Total simulation time in the same units as `self.accuracy`.
             checkpoint_time (list[float], optional): Times at which to record concentrations.
+                Values are interpolated at the exact requested times and returned in time order.
             plot (bool or str, optional): Plotting mode. Options:
                 - False: Do not plot.
                 - "interactive": Display real-time interactive plot.
@@ -77,6 +682,23 @@ class KineticalCalculator:
             colors (list, optional): List of colors for plotting, one per compound.
                 Each color can be a string (e.g., 'red', 'blue') or RGB tuple (e.g., (0.5, 0.3, 0.8)).
                 If None, random colors are generated. Must have length equal to number of compounds.
+            record_stride (int, optional): When plotting or writing `output`, record every
+                `record_stride`-th step of the trajectory (the first and last states are always
+                kept). Larger values downsample long runs. Default is 1.
+            output (str or os.PathLike, optional): Path of a `.npy` file the trajectory is written
+                to as it is computed, through a memory map, so it never has to fit in RAM.
+                The times go to a side-car `<name>.time.npy` and the compound names
+                (`enviroment.compounds_unicode_formula`) to `<name>.species.npy`. Read it back
+                lazily with `numpy.load(output, mmap_mode="r")`. Default is None.
+            append (bool, optional): If `output` already exists, extend it instead of overwriting
+                it. The run resumes from the last stored state and time, and `time` /
+                `checkpoint_time` are counted from there. Default is False.
+            steady_state_tol (float, optional): Stop early once the largest rate of change,
+                `max |dc/dt|` over the compounds, stays at or below this value for
+                `steady_state_window` time units. The detected time is stored in
+                `steady_state_time`. Default is None (always run the full `time`).
+            steady_state_window (float, optional): How long the steady-state criterion has to
+                hold before the run stops. Default is `10 * accuracy`.
 
         Returns:
             list[list]: List of checkpoints, where each entry is `[time, concentrations]`.
@@ -86,11 +708,24 @@ class KineticalCalculator:
             NameError: If the model has not been fitted to an environment (i.e., `fit` not called).
             ValueError: If an invalid plotting mode or directory is provided.
             ValueError: If `plot` is not one of [False, "save", "interactive"].
+            ValueError: If `record_stride` is not a positive integer.
+            ValueError: If `append` is set and the stored trajectory belongs to other compounds.
+            FloatingPointError: If an adaptive method meets non-finite values or its step size
+                collapses below the floating point resolution.
 
         Behavior:
             - Concentrations are clamped to zero if they become negative.
-            - Supports recording concentrations at arbitrary checkpoint times.
+            - Supports recording concentrations at arbitrary checkpoint times; each one is
+              interpolated inside the step that contains it (linearly for "euler", cubic
+              Hermite for the adaptive methods), so it is not snapped to the step grid.
             - Interactive plotting allows the user to type 'exit' to close the plot.
+            - When plotting, the trajectory is written into preallocated arrays during the
+              run (also available as `trajectory_time` / `trajectory`) and drawn once at
+              the end with a single line per compound.
+            - When the run stops at a steady state, checkpoints after the stop (up to `time`)
+              hold the steady-state concentrations.
+            - With `backend="numba"` the loop runs as compiled code, except when writing
+              `output`, which needs the NumPy loop.
 
         Example:
             >>> kc = KineticalCalculator(accuracy=0.01)
@@ -101,12 +736,19 @@ class KineticalCalculator:
             raise NameError("You should fit the model to an enviromt object before calculation")
         if not plot in [False , "save" , "interactive"]:
             raise ValueError("`plot` is not one of [False, 'save', 'interactive'].")
+        if not (isinstance(record_stride , numbers.Integral) and record_stride >= 1):
+            raise ValueError("`record_stride` should be a positive integer.")
+        if steady_state_window is None:
+            steady_state_window = 10 * self.accuracy
         
-        if plot == "interactive" :
-            matplotlib.use("TkAgg", force=True)
-        elif plot == "save" :
-            matplotlib.use("Agg")
-        import matplotlib.pyplot as plt
+        if plot :
+            # matplotlib is only imported by the plotting paths, which keeps `import ChemCompute.Kinetic` light
+            import matplotlib
+            if plot == "interactive" :
+                matplotlib.use("TkAgg", force=True)
+            else :
+                matplotlib.use("Agg")
+            import matplotlib.pyplot as plt
 
         
         plot_colors = []
@@ -127,47 +769,17 @@ class KineticalCalculator:
             
             plt.xlabel("time")
             plt.ylabel("concentration")
-        concentrations = self.enviroment.concentrations_array
-        rate_dependencies = self.enviroment.rate_dependency_array
-        stoichiometric_coefficient = self.enviroment.stoichiometric_coefficient_array
-        rate_constants = self.enviroment.rate_constants_array
-        time_interval = self.accuracy
-        eps = 1e-300
-        def calculate_rf():
-            # rf = kf * prod_j concentrations[j]^order_fwd[j]
-            # Use log form for numerical stability and speed
-            log_c = np.log(concentrations + eps)
-            log_prod = rate_dependencies[:, 0, :] @ log_c  # (R,)
-            rf = np.exp(log_prod) * rate_constants[:, 0] * time_interval
-            return rf
-        def calculate_rb():
-            log_c = np.log(concentrations + eps)
-            log_prod = rate_dependencies[:, 1, :] @ log_c  # (R,)
-            rb = np.exp(log_prod) * rate_constants[:, 1] * time_interval
-            return rb
-        def calculate_concentration_change():
-            # rate vector for reactions
-            rate = -(calculate_rf() - calculate_rb())  # (R,)
-            # concentration change = stoich^T @ rate
-            concentration_change = stoichiometric_coefficient.T @ rate  # (C,)
-            return concentration_change.reshape(-1)
-        t = 0
-        for i in range(int(time/self.accuracy+1)):
-            new_conentratinos = np.add(concentrations, calculate_concentration_change())
-            new_conentratinos[new_conentratinos < 0] = 0
-            if plot :
-                for k in range(len(self.concentrations)):
-                    plt.plot([t , t-self.accuracy],[new_conentratinos[k] , concentrations[k]] , color = plot_colors[k])
-            for checkpoint_t in checkpoint_time:
-                
-                if t <= checkpoint_t < t + self.accuracy:
-                    checkpoints.append(new_conentratinos.copy())
-            concentrations = new_conentratinos
-            t += self.accuracy
-        if plot == "interactive":
+        concentrations , cursor , trajectory_file , start_time = self._prepare_run(checkpoint_time , record_stride , output , append)
+        checkpoints = cursor.states
+        if self.backend == "numba" and trajectory_file is None :
+            concentrations = self._calculate_by_numba(concentrations, time, cursor, record_stride if plot else 0, steady_state_tol, steady_state_window)
+        else :
+            concentrations = self._calculate_by_steps(concentrations, time, cursor, plot, record_stride, trajectory_file, start_time, steady_state_tol, steady_state_window)
+        if plot :
             for k in range(len(self.concentrations)):
-                plt.plot([0 , 0],[0 , 0] , color = plot_colors[k], label = self.enviroment.compounds[k].unicode_formula)
+                plt.plot(self.trajectory_time , self.trajectory[:, k] , color = plot_colors[k], label = self.enviroment.compounds[k].unicode_formula)
             plt.legend()
+        if plot == "interactive":
             plt.show(block = False)
             
             print("Type 'exit' to close the plot:")
@@ -180,16 +792,504 @@ class KineticalCalculator:
                 else:
                     print("Invalid input.")
         elif plot == "save" :
-            for k in range(len(self.concentrations)):
-                plt.plot([0 , 0],[0 , 0] , color = plot_colors[k], label = self.enviroment.compounds[k].unicode_formula)
-            plt.legend()
             plt.savefig(directory)
             plt.close('all')
             del plt
         checkpoints.append(concentrations)  
         return checkpoints
 
-    def fit_calculate(self, enviroment, time, checkpoint_time=[], plot=False, directory="./plot.png", colors=None):
+    def _prepare_run(self , checkpoint_time , record_stride , output , append):
+        """
+        Set up a `calculate` run: returns `(concentrations, cursor, trajectory_file, start_time)`.
+
+        With `output`, the trajectory file is opened and, when appending, the run
+        resumes from its last stored state and time.
+        """
+        concentrations = self.enviroment.concentrations_array
+        start_time = 0.0
+        trajectory_file = None
+        if output is not None :
+            trajectory_file = _TrajectoryFile(output, self.enviroment.compounds_unicode_formula, concentrations, record_stride, append)
+            concentrations = trajectory_file.initial_concentrations
+            start_time = trajectory_file.start_time
+        self.steady_state_time = None
+        return concentrations , _CheckpointCursor(checkpoint_time) , trajectory_file , start_time
+
+    def _calculate_by_steps(self , concentrations , time , cursor , plot , record_stride , trajectory_file , start_time , steady_state_tol , steady_state_window):
+        """
+        Run the NumPy integration loop of `calculate` and return the final concentrations.
+
+        Checkpoints go to `cursor`, recorded states to the plot buffer (`trajectory` /
+        `trajectory_time`) and to `trajectory_file`; `number_of_steps` and
+        `steady_state_time` are updated.
+        """
+        run = self._iterate_steps(concentrations , time , cursor , plot , record_stride , trajectory_file , start_time , steady_state_tol , steady_state_window)
+        while True:
+            try:
+                next(run)
+            except StopIteration as stop:
+                return stop.value
+
+    def _iterate_steps(self , concentrations , time , cursor , plot , record_stride , trajectory_file , start_time , steady_state_tol , steady_state_window , yield_every = None):
+        """
+        Generator form of `_calculate_by_steps` that pauses (yields None) every `yield_every`
+        steps and returns the final concentrations. Closing it early still closes `trajectory_file`.
+        """
+        rate_of_change , jacobian = self._rate_functions()
+        steps = self._steps(concentrations, rate_of_change, jacobian, time)
+        self.number_of_steps = 0
+        trajectory = None
+        steady_since = None
+        if plot :
+            expected_steps = int(time/self.accuracy+1) if self.method == "euler" else 1024
+            trajectory = _TrajectoryBuffer(concentrations, expected_steps // record_stride + 1, record_stride, start_time)
+        try :
+            for t, step_size, new_conentratinos, rates in steps:
+                if trajectory is not None :
+                    trajectory.record(start_time + t, new_conentratinos)
+                if trajectory_file is not None :
+                    trajectory_file.record(start_time + t, new_conentratinos)
+                cursor.advance(t, step_size, concentrations, new_conentratinos, rates)
+                if steady_state_tol is not None :
+                    if np.max(np.abs(new_conentratinos - concentrations)) <= steady_state_tol * step_size :
+                        if steady_since is None :
+                            steady_since = t - step_size
+                    else :
+                        steady_since = None
+                concentrations = new_conentratinos
+                self.number_of_steps += 1
+                if steady_since is not None and t - steady_since >= steady_state_window :
+                    self.steady_state_time = start_time + steady_since
+                    cursor.hold(concentrations, time)
+                    break
+                if yield_every and self.number_of_steps % yield_every == 0 :
+                    yield
+        finally :
+            if trajectory_file is not None :
+                trajectory_file.finish()
+        if trajectory is not None :
+            trajectory.finish()
+            self.trajectory_time = trajectory.time
+            self.trajectory = trajectory.concentrations
+        return concentrations
+
+    def _calculate_by_numba(self , concentrations , time , cursor , record_stride , steady_state_tol , steady_state_window):
+        """
+        Run the whole fixed-step Euler loop of `calculate` in compiled code.
+
+        Same contract as `_calculate_by_steps`; `record_stride=0` skips trajectory recording.
+        """
+        from . import _numba_kernels
+        final , checkpoint_states , self.number_of_steps , steady_state_time , record_time , record_states = _numba_kernels.euler(
+            np.asarray(concentrations , dtype=float) , *self._numba_network , float(self.accuracy) , int(time/self.accuracy+1) , float(time) ,
+            np.array(cursor.times , dtype=float) , record_stride , -1.0 if steady_state_tol is None else float(steady_state_tol) , float(steady_state_window))
+        cursor.states.extend(checkpoint_states)
+        cursor.position = len(checkpoint_states)
+        if not np.isnan(steady_state_time):
+            self.steady_state_time = steady_state_time
+        if record_stride:
+            self.trajectory_time = record_time
+            self.trajectory = record_states
+        return final
+
+    def _rate_functions(self , rate_constants = None):
+        """
+        Build the right-hand side and Jacobian evaluators of the fitted model.
+
+        Both come from the network and rate constants captured by `fit`, so later
+        changes to the environment can't pair a stale right-hand side with a fresh
+        Jacobian. Without overriding rate constants, the right-hand side is the
+        `rate_of_change` prepared by `fit`.
+
+        Args:
+            rate_constants (numpy.ndarray, optional): Rate constants overriding the fitted ones,
+                either `(n_reactions, 2)` or `(n_members, n_reactions, 2)` for an ensemble.
+
+        Returns:
+            tuple: `(rate_of_change, jacobian)`, both taking a concentration vector or an
+                `(n_members, n_compounds)` batch. The Jacobian is always dense; it is only
+                built when first requested.
+        """
+        if rate_constants is None:
+            _ , jacobian = self.model._network.rate_functions(self.model.rate_constants)
+            return self.rate_of_change , jacobian
+        return self.model._network.rate_functions(rate_constants)
+
+    def _run(self , concentrations , rate_of_change , jacobian , time , checkpoint_time = []):
+        """
+        Integrate from `concentrations` without plotting or recording and update `number_of_steps`.
+
+        Returns:
+            numpy.ndarray: The checkpoints in time order followed by the final state, stacked along
+                the second-to-last axis, i.e. `(n_checkpoints + 1, n_compounds)` or with a leading
+                member axis for an ensemble.
+        """
+        states , self.number_of_steps = self._integrate(concentrations , rate_of_change , jacobian , time , checkpoint_time)
+        return states
+
+    def _integrate(self , concentrations , rate_of_change , jacobian , time , checkpoint_time = []):
+        """
+        Same as `_run`, but returns `(states, number_of_steps)` and only reads the integration
+        settings, so concurrent calls on one instance do not interfere.
+        """
+        cursor = _CheckpointCursor(checkpoint_time)
+        checkpoints = cursor.states
+        number_of_steps = 0
+        for t , step_size , new_conentratinos , rates in self._steps(concentrations , rate_of_change , jacobian , time):
+            cursor.advance(t , step_size , concentrations , new_conentratinos , rates)
+            concentrations = new_conentratinos
+            number_of_steps += 1
+        checkpoints.append(concentrations)
+        return np.stack(checkpoints , axis=-2) , number_of_steps
+
+    def _steps(self , concentrations , rate_of_change , jacobian , time):
+        """
+        Dispatch to the step generator of `self.method`.
+
+        Yields:
+            tuple: `(t, step_size, concentrations, rates)` after every accepted step, where
+                `rates` is `(start_rate, end_rate)` for the adaptive methods and None for Euler.
+        """
+        if self.method == "rk45":
+            return self._steps_rk45(concentrations , rate_of_change , time)
+        elif self.method == "trbdf2":
+            return self._steps_trbdf2(concentrations , rate_of_change , jacobian , time)
+        return self._steps_euler(concentrations , rate_of_change , time)
+
+    def _steps_euler(self , concentrations , rate_of_change , time):
+        """
+        Advance the concentrations with fixed-step explicit Euler.
+
+        Yields:
+            tuple: `(t, step_size, concentrations, None)` after every step, where `t` is the
+            time at the end of the step. Negative concentrations are clamped to zero. The
+            trailing None tells checkpoint capture to interpolate linearly.
+        """
+        t = 0
+        for i in range(int(time/self.accuracy+1)):
+            new_conentratinos = np.add(concentrations, rate_of_change(concentrations) * self.accuracy)
+            new_conentratinos[new_conentratinos < 0] = 0
+            t += self.accuracy
+            yield t , self.accuracy , new_conentratinos , None
+            concentrations = new_conentratinos
+
+    def _steps_rk45(self , concentrations , rate_of_change , time):
+        """
+        Advance the concentrations with the adaptive Dormand–Prince 5(4) pair.
+
+        The local error estimate of the embedded 4th-order solution is compared against
+        `atol + rtol * |c|` and the step size is adapted so that only accepted steps are
+        yielded. The last step is shortened to land exactly on `time`.
+
+        Yields:
+            tuple: `(t, step_size, concentrations, (start_rate, end_rate))` after every accepted step.
+        """
+        t = 0.0
+        h = min(self.accuracy , time) if time > 0 else 0.0
+        k = np.empty((7 ,) + np.shape(concentrations))
+        k[0] = rate_of_change(concentrations)
+        _check_finite(concentrations , t)
+        _check_finite(k[0] , t)
+        while t < time:
+            h = min(h , time - t)
+            for stage in range(1 , 6):
+                k[stage] = rate_of_change(concentrations + h * np.tensordot(_DOPRI_A[stage] , k[:stage] , axes=1))
+            new_conentratinos = concentrations + h * np.tensordot(_DOPRI_B , k[:6] , axes=1)
+            k[6] = rate_of_change(new_conentratinos)
+            scale = self.atol + self.rtol * np.maximum(np.abs(concentrations) , np.abs(new_conentratinos))
+            error = _error_norm(h * np.tensordot(_DOPRI_E , k , axes=1) / scale)
+            _check_finite(error , t)
+            if error <= 1:
+                t = time if time - t - h <= 1e-12 * time else t + h
+                negative = new_conentratinos < 0
+                if negative.any():
+                    new_conentratinos[negative] = 0
+                    k[6] = rate_of_change(new_conentratinos)
+                yield t , h , new_conentratinos , (k[0].copy() , k[6].copy())
+                concentrations = new_conentratinos
+                k[0] = k[6]
+                factor = 5.0 if error == 0 else min(5.0 , 0.9 * error ** -0.2)
+            else:
+                factor = max(0.2 , 0.9 * error ** -0.2)
+            h *= factor
+            if t < time:
+                _check_step_size(h , t)
+
+    def _steps_trbdf2(self , concentrations , rate_of_change , jacobian , time):
+        """
+        Advance the concentrations with the adaptive implicit TR-BDF2 scheme.
+
+        Each step solves a trapezoidal stage to `t + gamma*h` followed by a BDF2 stage
+        to `t + h`. Both implicit stages share the iteration matrix `I - d*h*J`, which is
+        factorized once and reused by the modified Newton iterations of every step until
+        the step size changes. The Jacobian is frozen as well and is only re-evaluated
+        when Newton fails to converge, so smooth stretches of a stiff run cost one
+        right-hand-side evaluation per Newton iteration and no linear algebra setup.
+
+        Yields:
+            tuple: `(t, step_size, concentrations, (start_rate, end_rate))` after every accepted step.
+        """
+        gamma , d , w = _TRBDF2_GAMMA , _TRBDF2_D , _TRBDF2_W
+        identity = np.eye(np.shape(concentrations)[-1])
+        concentrations = np.asarray(concentrations , dtype=float)
+        t = 0.0
+        h = min(self.accuracy , time) if time > 0 else 0.0
+        f0 = rate_of_change(concentrations)
+        J = jacobian(concentrations)
+        for values in (concentrations , f0 , J):
+            _check_finite(values , t)
+        jacobian_is_current = True
+        solve = None
+        factorized_step = None
+
+        def newton(z , rhs):
+            previous_norm = np.inf
+            for i in range(8):
+                residual = z - d * h * rate_of_change(z) - rhs
+                _check_finite(residual , t)
+                dz = solve(residual)
+                z = z - dz
+                norm = _error_norm(dz / (self.atol + self.rtol * np.abs(z)))
+                if norm < 1e-2:
+                    return z , rate_of_change(z)
+                if norm > 0.9 * previous_norm:
+                    break
+                previous_norm = norm
+            return None , None
+
+        while t < time:
+            h = min(h , time - t)
+            if solve is None or h != factorized_step:
+                solve = _factorized_solver(identity - d * h * J)
+                factorized_step = h
+            z1 , f1 = newton(concentrations + gamma * h * f0 , concentrations + d * h * f0)
+            if z1 is not None:
+                z2 , f2 = newton(z1 + (1 - gamma) * h * f1 , (1 - w) * concentrations + w * z1)
+            if z1 is None or z2 is None:
+                if not jacobian_is_current:
+                    J = jacobian(concentrations)
+                    _check_finite(J , t)
+                    jacobian_is_current = True
+                else:
+                    _check_step_size(h * 0.25 , t)
+                    h *= 0.25
+                solve = None
+                continue
+            estimate = _TRBDF2_ERROR * 2 * h * (f0 / gamma - f1 / (gamma * (1 - gamma)) + f2 / (1 - gamma))
+            estimate = solve(estimate)
+            scale = self.atol + self.rtol * np.maximum(np.abs(concentrations) , np.abs(z2))
+            error = _error_norm(estimate / scale)
+            _check_finite(error , t)
+            if error <= 1:
+                t = time if time - t - h <= 1e-12 * time else t + h
+                negative = z2 < 0
+                if negative.any():
+                    z2[negative] = 0
+                    f2 = rate_of_change(z2)
+                yield t , h , z2 , (f0 , f2)
+                concentrations = z2
+                f0 = f2
+                jacobian_is_current = False
+                factor = 5.0 if error == 0 else min(5.0 , 0.9 * error ** (-1 / 3))
+                if 1.0 <= factor <= 1.2:
+                    # Keep the step so the factorized iteration matrix stays valid.
+                    factor = 1.0
+            else:
+                factor = max(0.2 , 0.9 * error ** (-1 / 3))
+            h *= factor
+            if t < time:
+                _check_step_size(h , t)
+
+    def iter_calculate(self , time , chunk_steps = 1000):
+        """
+        Integrate the fitted environment and stream the trajectory in fixed-size chunks.
+
+        Unlike `calculate`, nothing is accumulated across chunks: each block is yielded
+        as soon as it is full, so memory stays flat for arbitrarily long horizons and the
+        consumer can stop the run early by simply breaking out of the loop.
+
+        Args:
+            time (float): Total simulation time in the same units as `self.accuracy`.
+            chunk_steps (int, optional): Number of states per yielded chunk. The last
+                chunk may be shorter. Default is 1000.
+
+        Yields:
+            tuple[numpy.ndarray, numpy.ndarray]: `(t_chunk, concentrations_chunk)` with shapes
+                `(n,)` and `(n, n_compounds)`. The first chunk starts with the initial state
+                at `t = 0`; every following row is one accepted step.
+
+        Raises:
+            NameError: If the model has not been fitted to an environment (i.e., `fit` not called).
+            ValueError: If `chunk_steps` is not a positive integer.
+
+        Example:
+            >>> kc = KineticalCalculator(accuracy=0.01, method="rk45")
+            >>> kc.fit(env)
+            >>> for t_chunk, concentrations_chunk in kc.iter_calculate(time=1e4, chunk_steps=500):
+            ...     if concentrations_chunk[-1, 0] < 1e-3:
+            ...         break
+        """
+        if not self.fitted :
+            raise NameError("You should fit the model to an enviromt object before calculation")
+        if not (isinstance(chunk_steps , numbers.Integral) and chunk_steps >= 1):
+            raise ValueError("`chunk_steps` should be a positive integer.")
+        concentrations = self.enviroment.concentrations_array
+        rate_of_change , jacobian = self._rate_functions()
+        self.number_of_steps = 0
+        t_chunk = np.empty(chunk_steps)
+        concentrations_chunk = np.empty((chunk_steps , len(concentrations)))
+        t_chunk[0] , concentrations_chunk[0] = 0.0 , concentrations
+        size = 1
+        for t , step_size , new_conentratinos , rates in self._steps(concentrations , rate_of_change , jacobian , time):
+            self.number_of_steps += 1
+            if size == chunk_steps:
+                yield t_chunk , concentrations_chunk
+                t_chunk = np.empty(chunk_steps)
+                concentrations_chunk = np.empty((chunk_steps , len(concentrations)))
+                size = 0
+            t_chunk[size] , concentrations_chunk[size] = t , new_conentratinos
+            size += 1
+        yield t_chunk[:size] , concentrations_chunk[:size]
+
+    async def acalculate(self , time , checkpoint_time = [] , record_stride = 1 , output = None , append = False , steady_state_tol = None , steady_state_window = None , yield_every = 1000):
+        """
+        Asynchronous `calculate` (without plotting) that yields to the event loop every `yield_every` steps.
+
+        The integration runs on the event loop thread, but hands control back every
+        `yield_every` steps, so other tasks are served during long runs. Cancelling the
+        awaiting task raises `asyncio.CancelledError` at the next pause and stops the run;
+        an `output` file is then closed with the states computed so far.
+
+        Args:
+            time, checkpoint_time, record_stride, output, append, steady_state_tol, steady_state_window:
+                As in `calculate`.
+            yield_every (int, optional): Number of steps between pauses. Default is 1000.
+
+        Returns:
+            list: Same as `calculate`.
+
+        Raises:
+            NameError: If the model has not been fitted to an environment (i.e., `fit` not called).
+            ValueError: If `record_stride` or `yield_every` is not a positive integer.
+            asyncio.CancelledError: If the awaiting task is cancelled.
+
+        Notes:
+            With `backend="numba"` this still runs the NumPy loop, since a compiled run
+            cannot pause. Use `aiter_calculate` to follow the progress of a run.
+
+        Example:
+            >>> kc = KineticalCalculator(accuracy=1e-4)
+            >>> kc.fit(env)
+            >>> results = await kc.acalculate(time=100, checkpoint_time=[10, 50])
+        """
+        import asyncio
+        if not self.fitted :
+            raise NameError("You should fit the model to an enviromt object before calculation")
+        if not (isinstance(record_stride , numbers.Integral) and record_stride >= 1):
+            raise ValueError("`record_stride` should be a positive integer.")
+        if not (isinstance(yield_every , numbers.Integral) and yield_every >= 1):
+            raise ValueError("`yield_every` should be a positive integer.")
+        if steady_state_window is None:
+            steady_state_window = 10 * self.accuracy
+        concentrations , cursor , trajectory_file , start_time = self._prepare_run(checkpoint_time , record_stride , output , append)
+        run = self._iterate_steps(concentrations , time , cursor , False , record_stride , trajectory_file , start_time , steady_state_tol , steady_state_window , yield_every)
+        try:
+            while True:
+                try:
+                    next(run)
+                except StopIteration as stop:
+                    concentrations = stop.value
+                    break
+                await asyncio.sleep(0)
+        finally:
+            run.close()
+        cursor.states.append(concentrations)
+        return cursor.states
+
+    async def aiter_calculate(self , time , chunk_steps = 1000):
+        """
+        Asynchronous `iter_calculate`: stream the trajectory in chunks, yielding to the event loop after each one.
+
+        The chunks double as progress reports (`t_chunk[-1] / time` is the completed
+        fraction). Breaking out of the `async for` or cancelling the consuming task stops the run.
+
+        Args:
+            time, chunk_steps: As in `iter_calculate`.
+
+        Yields:
+            tuple[numpy.ndarray, numpy.ndarray]: `(t_chunk, concentrations_chunk)` as in `iter_calculate`.
+
+        Example:
+            >>> async for t_chunk, concentrations_chunk in kc.aiter_calculate(time=100, chunk_steps=5000):
+            ...     print(f"{t_chunk[-1] / 100:.0%}")
+        """
+        import asyncio
+        chunks = self.iter_calculate(time , chunk_steps)
+        try:
+            for chunk in chunks:
+                yield chunk
+                await asyncio.sleep(0)
+        finally:
+            chunks.close()
+
+    def calculate_ensemble(self , time , initial_concentrations = None , rate_constants = None , checkpoint_time = []):
+        """
+        Integrate an ensemble of initial conditions and/or rate-constant sets in one vectorized run.
+
+        All members advance together, so every step is a single batched evaluation of
+        the rate law instead of one Python-level step per member. Adaptive methods
+        share the step size across members, chosen so that the least accurate member
+        still meets `rtol` / `atol`.
+
+        Args:
+            time (float): Total simulation time in the same units as `self.accuracy`.
+            initial_concentrations (array-like, optional): Initial concentrations of shape
+                `(n_members, n_compounds)`, ordered like `enviroment.compounds`. Defaults to the
+                environment's concentrations for every member.
+            rate_constants (array-like, optional): Rate constants of shape
+                `(n_members, n_reactions, 2)` holding `[kf, kb]` per reaction. Defaults to the
+                environment's rate constants for every member.
+            checkpoint_time (list[float], optional): Times at which to record concentrations,
+                interpolated at the exact requested times.
+
+        Returns:
+            numpy.ndarray: Array of shape `(n_members, n_checkpoints, n_compounds)`. Along the
+                second axis are the recorded checkpoints in time order, followed by the final state.
+
+        Raises:
+            NameError: If the model has not been fitted to an environment (i.e., `fit` not called).
+            ValueError: If neither `initial_concentrations` nor `rate_constants` is given,
+                or their shapes don't match the environment or each other.
+
+        Example:
+            >>> kc = KineticalCalculator(accuracy=0.01, method="rk45")
+            >>> kc.fit(env)
+            >>> samples = np.random.lognormal(size=(1000, len(env), 2))
+            >>> results = kc.calculate_ensemble(time=10, rate_constants=samples)
+            >>> results.shape
+            (1000, 1, 2)
+        """
+        if not self.fitted :
+            raise NameError("You should fit the model to an enviromt object before calculation")
+        if initial_concentrations is None and rate_constants is None:
+            raise ValueError("Provide `initial_concentrations` and/or `rate_constants` for the ensemble members.")
+        number_of_compounds = len(self.enviroment.compounds)
+        if rate_constants is not None:
+            rate_constants = np.asarray(rate_constants , dtype=float)
+            if rate_constants.ndim != 3 or rate_constants.shape[1:] != (len(self.enviroment) , 2):
+                raise ValueError(f"`rate_constants` should have shape (n_members, {len(self.enviroment)}, 2)")
+        if initial_concentrations is None:
+            initial_concentrations = np.tile(self.enviroment.concentrations_array , (len(rate_constants) , 1))
+        concentrations = np.array(initial_concentrations , dtype=float)
+        if concentrations.ndim != 2 or concentrations.shape[1] != number_of_compounds:
+            raise ValueError(f"`initial_concentrations` should have shape (n_members, {number_of_compounds})")
+        if rate_constants is not None and len(rate_constants) != len(concentrations):
+            raise ValueError("`initial_concentrations` and `rate_constants` should have the same number of members")
+
+        rate_of_change , jacobian = self._rate_functions(rate_constants)
+        return self._run(concentrations , rate_of_change , jacobian , time , checkpoint_time)
+
+    def fit_calculate(self, enviroment, time, checkpoint_time=[], plot=False, directory="./plot.png", colors=None, record_stride=1, output=None, append=False, steady_state_tol=None, steady_state_window=None):
         """
         Fit the calculator to an environment and calculate reaction kinetics in one call.
         
@@ -227,6 +1327,20 @@ class KineticalCalculator:
             List of colors for plotting, one per compound.
             Each color can be a string (e.g., 'red', 'blue') or RGB tuple (e.g., (0.5, 0.3, 0.8)).
             If None, random colors are generated. Must have length equal to number of compounds.
+        record_stride : int, optional
+            When plotting or writing `output`, record every `record_stride`-th step
+            of the trajectory. Default is 1.
+        output : str or os.PathLike, optional
+            Path of a `.npy` file the trajectory is streamed to through a memory map.
+            Default is None.
+        append : bool, optional
+            Extend an existing `output` trajectory, resuming from its last state.
+            Default is False.
+        steady_state_tol : float, optional
+            Stop early once `max |dc/dt|` stays at or below this value for
+            `steady_state_window` time units. Default is None.
+        steady_state_window : float, optional
+            Duration the steady-state criterion has to hold. Default is `10 * accuracy`.
         
         Returns
         -------
@@ -262,15 +1376,60 @@ class KineticalCalculator:
         >>> results = kc.fit_calculate(env, time=10, checkpoint_time=[1, 5, 10], plot="interactive")
         """
         self.fit(enviroment)
-        return self.calculate(time, checkpoint_time, plot, directory, colors)
+        return self.calculate(time, checkpoint_time, plot, directory, colors, record_stride, output, append, steady_state_tol, steady_state_window)
+
+    def calculate_in_background(self , time = None , checkpoint_time = [] , frame_stride = 100 , queue_size = 1000):
+        """
+        Start integrating the fitted environment in a worker thread and return its handle.
+
+        The run advances at full speed, independent of any GUI. Every `frame_stride`-th
+        state is pushed to the bounded queue `frames` as a `(t, concentrations)` frame for
+        a monitor to consume. If the consumer falls behind, the oldest frames are dropped
+        rather than slowing the run down. Pausing, resuming and stopping go through events
+        on the returned `BackgroundIntegration`.
+
+        Args:
+            time (float, optional): Total simulation time. None (default) runs until `stop` is called.
+            checkpoint_time (list[float], optional): Times at which to record concentrations,
+                interpolated like in `calculate`.
+            frame_stride (int, optional): Number of steps between published frames. Default is 100.
+            queue_size (int, optional): Capacity of the frame queue. Default is 1000.
+
+        Returns:
+            BackgroundIntegration: Handle of the running integration.
+
+        Raises:
+            NameError: If the model has not been fitted to an environment (i.e., `fit` not called).
+            ValueError: If `frame_stride` or `queue_size` is not a positive integer.
+
+        Example:
+            >>> run = kc.calculate_in_background(time=1e3, frame_stride=1000)
+            >>> run.pause(); run.resume()
+            >>> results = run.result()
+        """
+        if not self.fitted :
+            raise NameError("You must fit the model to an Enviroment before calculation.")
+        if not (isinstance(frame_stride , numbers.Integral) and frame_stride >= 1):
+            raise ValueError("`frame_stride` should be a positive integer.")
+        if not (isinstance(queue_size , numbers.Integral) and queue_size >= 1):
+            raise ValueError("`queue_size` should be a positive integer.")
+        return BackgroundIntegration(self , time , checkpoint_time , frame_stride , queue_size)
 
-    def calculate_responsively(self  , checkpoint_time = [] ,animation_update_interval = 0.1 , colors = None):
+    def calculate_responsively(self  , checkpoint_time = [] ,animation_update_interval = 0.1 , colors = None , time = None , frame_stride = 100 , queue_size = 1000 , window = None , buffer_size = 10_000):
         """
         Simulate and visualize reaction kinetics dynamically using an interactive animation.
 
-        This method continuously updates compound concentrations over time while
-        optionally displaying a live animation using `matplotlib.animation.FuncAnimation`.
-        It is especially useful for observing reaction progress in real-time.
+        The integration runs in a worker thread (see `calculate_in_background`) at full
+        speed, while a blitted `matplotlib.animation.FuncAnimation` on the main thread
+        drains the frames it publishes. Each compound is a single line backed by a
+        fixed-size ring buffer of the latest `buffer_size` frames, and only the lines
+        are redrawn on each update (the axes are redrawn only when their range jumps).
+        Simulation speed is therefore independent of the frame rate, and the cost of
+        a frame stays constant however long the monitor runs.
+
+        Controls (keyboard, with the plot window focused):
+            * space - pause / resume the simulation
+            * q or closing the window - stop the simulation and return
 
         Args:
             checkpoint_time (list[float], optional): Specific times at which to record concentrations.
@@ -278,122 +1437,390 @@ class KineticalCalculator:
             colors (list, optional): List of colors for plotting, one per compound.
                 Each color can be a string (e.g., 'red', 'blue') or RGB tuple (e.g., (0.5, 0.3, 0.8)).
                 If None, random colors are generated. Must have length equal to number of compounds.
-            plot (bool, optional): Whether to visualize the reaction dynamically.
-                - If True, a live plot will be shown and user can interact with it:
-                    * 'stop'  - pause the animation
-                    * 'resume' - resume the animation
-                    * 'exit'  - close the plot and stop the simulation
-                - If False, no plot is generated.
+            time (float, optional): Total simulation time. None (default) runs until stopped.
+            frame_stride (int, optional): Number of steps between plotted points. Default is 100.
+            queue_size (int, optional): Capacity of the frame queue between the worker and the plot.
+                Default is 1000.
+            window (float, optional): Show only the last `window` time units, scrolling along with
+                the run. Default is None (show everything kept in the buffer).
+            buffer_size (int, optional): Number of frames kept for the plot. Default is 10000.
 
         Returns:
-            list[list]: A list of checkpoint data of the form `[time, concentrations]`.
-                - Each entry is a snapshot of concentrations at the corresponding time.
-                - The last entry corresponds to the final concentrations at the end of the simulation.
+            list: The concentrations at the checkpoints reached, in time order, followed by the
+                concentrations when the simulation ended.
 
         Raises:
             NameError: If the model has not been fitted to an environment (i.e., `fit` not called).
 
         Notes:
             - Negative concentrations are clamped to zero during simulation.
-            - The method relies on an internal `calculate_concentration_change` function
-            to compute instantaneous changes in concentrations per reaction step.
-            - This approach differs from `calculate()` by providing a live, responsive animation
-            rather than a static plot or final checkpoint data.
+            - The integration uses `self.method`, like `calculate`.
             - Checkpoints specified in `checkpoint_time` are captured even during animation.
 
         Example:
             >>> kc = KineticalCalculator(accuracy=0.01)
             >>> kc.fit(env)
-            >>> results = kc.calculate_responsively(checkpoint_time=[1,5,10], plot=True)
+            >>> results = kc.calculate_responsively(checkpoint_time=[1,5,10])
         """
-        plot = True
         if not self.fitted :
             raise NameError("You must fit the model to an Enviroment before calculation.")
-        if plot :
-             matplotlib.use("TkAgg", force=True)
+        if not (isinstance(buffer_size , numbers.Integral) and buffer_size >= 1):
+            raise ValueError("`buffer_size` should be a positive integer.")
+        if window is not None and not window > 0:
+            raise ValueError("`window` should be a positive time span.")
+        import matplotlib
+        matplotlib.use("TkAgg", force=True)
         import matplotlib.pyplot as plt
         from matplotlib.animation import FuncAnimation
 
-        plt.figure()
+        num_compounds = len(self.enviroment.compounds)
         plot_colors = []
-        checkpoints = []
-        if plot:
-            num_compounds = len(self.enviroment.compounds)
-            
-            # Validate colors if provided
-            if colors is not None:
-                if len(colors) != num_compounds:
-                    raise ValueError(f"Number of colors ({len(colors)}) must equal number of compounds ({num_compounds})")
-                plot_colors = colors
-            else:
-                # Generate random colors if not provided
-                for i in self.enviroment.compounds:
-                    plot_colors.append(((random.randint(0, 95)/100) , (random.randint(0, 95)/100) , (random.randint(0, 95)/100)))
-            
-            plt.xlabel("time")
-            plt.ylabel("concentration")
-                
-        
-        concentrations = self.enviroment.concentrations_array
-        rate_dependencies = self.enviroment.rate_dependency_array
-        stoichiometric_coefficient = self.enviroment.stoichiometric_coefficient_array
-        rate_constants = self.enviroment.rate_constants_array
-        time_interval = self.accuracy
-        eps = 1e-300
-        def calculate_rf():
-            log_c = np.log(concentrations + eps)
-            log_prod = rate_dependencies[:, 0, :] @ log_c
-            rf = np.exp(log_prod) * rate_constants[:, 0] * time_interval
-            return rf
-        def calculate_rb():
-            log_c = np.log(concentrations + eps)
-            log_prod = rate_dependencies[:, 1, :] @ log_c
-            rb = np.exp(log_prod) * rate_constants[:, 1] * time_interval
-            return rb
-        def calculate_concentration_change():
-            rate = -(calculate_rf() - calculate_rb())
-            concentration_change = stoichiometric_coefficient.T @ rate
-            return concentration_change.reshape(-1)
-        
-        time = count()
+        # Validate colors if provided
+        if colors is not None:
+            if len(colors) != num_compounds:
+                raise ValueError(f"Number of colors ({len(colors)}) must equal number of compounds ({num_compounds})")
+            plot_colors = colors
+        else:
+            # Generate random colors if not provided
+            for i in self.enviroment.compounds:
+                plot_colors.append(((random.randint(0, 95)/100) , (random.randint(0, 95)/100) , (random.randint(0, 95)/100)))
+
+        figure = plt.figure()
+        axes = plt.gca()
+        plt.xlabel("time")
+        plt.ylabel("concentration")
+        lines = [axes.plot([] , [] , color = plot_colors[k] , label = self.enviroment.compounds[k].unicode_formula , animated = True)[0]
+                 for k in range(num_compounds)]
+        plt.legend()
+        axes.set_xlim(0 , window if window is not None else (time if time is not None else 1.0))
+        axes.set_ylim(0 , max(float(np.max(self.enviroment.concentrations_array , initial=0.0)) * 1.1 , 1e-12))
+
+        run = self.calculate_in_background(time , checkpoint_time , frame_stride , queue_size)
+        history = _RingBuffer(buffer_size , num_compounds)
         def animate(i):
-            """Animation update loop for real-time kinetics visualization."""
+            """Move the frames published since the last update into the ring buffer and redraw the lines."""
+            while True:
+                try:
+                    history.append(*run.frames.get_nowait())
+                except queue.Empty:
+                    break
+            if not len(history):
+                return lines
+            times , states = history.ordered()
+            t_last = times[-1]
+            if window is not None:
+                start = np.searchsorted(times , t_last - window)
+                times , states = times[start:] , states[start:]
+            for k , line in enumerate(lines):
+                line.set_data(times , states[:, k])
+            # Limits move in jumps (doubling, or a quarter window ahead), so the full redraw
+            # that refreshes ticks and the blitting background is rare.
+            rescaled = False
+            low , high = axes.get_xlim()
+            if t_last > high:
+                axes.set_xlim((t_last - 0.75 * window , t_last + 0.25 * window) if window is not None else (low , 2 * t_last))
+                rescaled = True
+            y_limits = _expanded_limits(*axes.get_ylim() , float(states.min()) , float(states.max()))
+            if y_limits is not None:
+                axes.set_ylim(y_limits)
+                rescaled = True
+            if rescaled:
+                figure.canvas.draw_idle()
+            return lines
 
-            nonlocal concentrations
-            t = self.accuracy * next(time)
-            
-            new_conentratinos = np.add(concentrations, calculate_concentration_change())
-            new_conentratinos[new_conentratinos < 0] = 0
-        
-            for k in range(len(self.concentrations)):
-                plt.plot([t , t-self.accuracy],[new_conentratinos[k] , concentrations[k]] , color = plot_colors[k])
-                
-            for checkpoint_t in checkpoint_time:
-                
-                if t <= checkpoint_t < t + self.accuracy:
-                    checkpoints.append(new_conentratinos.copy())
-            concentrations = new_conentratinos
+        def on_key(event):
+            if event.key == " ":
+                run.resume() if run.paused else run.pause()
+            elif event.key == "q":
+                run.stop()
 
-        ani = FuncAnimation(plt.gcf() , animate , interval = animation_update_interval , cache_frame_data=False)        
-        if plot :
-            for k in range(len(self.concentrations)):
-                plt.plot([0 , 0],[0 , 0] , color = plot_colors[k], label = self.enviroment.compounds[k].unicode_formula)
+        figure.canvas.mpl_connect("key_press_event" , on_key)
+        figure.canvas.mpl_connect("close_event" , lambda event: run.stop())
+        ani = FuncAnimation(figure , animate , interval = animation_update_interval * 1000 , blit = True , cache_frame_data=False)
+        try:
+            plt.show()
+        finally:
+            run.stop()
+            plt.close(figure)
+        return run.result()
 
-            plt.legend()
-            plt.show(block = False)
-            print("Type 'exit' to close / 'stop' to pause / 'resume' to continue:")
-            while True:
-                cmd = input().strip().lower()
-                if cmd == "exit":
-                    ani.pause()
-                    plt.close()
+class BackgroundIntegration:
+    """
+    Handle of a kinetic integration running in a worker thread (see `KineticalCalculator.calculate_in_background`).
+
+    Pause, resume and stop requests are `threading.Event`s that the worker checks
+    after every step. Frames are handed to the consumer through a bounded queue.
+    When it is full, the oldest frame is dropped, so a slow monitor never throttles
+    the run.
+
+    Attributes:
+        frames (queue.Queue): `(t, concentrations)` frames, one every `frame_stride` steps, plus
+            the initial and the final state.
+        number_of_steps (int): Steps taken so far.
+    """
+    # Without a total time, the run proceeds in segments of this many initial steps.
+    _SEGMENT_STEPS = 10_000
+
+    def __init__(self , calculator , time = None , checkpoint_time = [] , frame_stride = 100 , queue_size = 1000):
+        self.frames = queue.Queue(maxsize = queue_size)
+        self.number_of_steps = 0
+        self._calculator = calculator
+        self._time = time
+        self._cursor = _CheckpointCursor(checkpoint_time)
+        self._frame_stride = frame_stride
+        self._concentrations = calculator.enviroment.concentrations_array
+        self._rate_functions = calculator._rate_functions()
+        self._running = threading.Event()
+        self._running.set()
+        self._stop = threading.Event()
+        self._result = None
+        self._error = None
+        self._thread = threading.Thread(target = self._run , name = "ChemCompute-integrator" , daemon = True)
+        self._thread.start()
+
+    @property
+    def paused(self):
+        """bool: Whether the run is paused."""
+        return not self._running.is_set()
+
+    @property
+    def done(self):
+        """bool: Whether the run has finished (or was stopped)."""
+        return not self._thread.is_alive()
+
+    def pause(self):
+        """Pause the run after the current step."""
+        self._running.clear()
+
+    def resume(self):
+        """Resume a paused run."""
+        self._running.set()
+
+    def stop(self):
+        """Stop the run after the current step (also when paused)."""
+        self._stop.set()
+        self._running.set()
+
+    def join(self , timeout = None):
+        """Wait for the run to finish; returns whether it has."""
+        self._thread.join(timeout)
+        return self.done
+
+    def result(self , timeout = None):
+        """
+        Wait for the run to finish and return its checkpoints.
+
+        Returns:
+            list: The concentrations at the checkpoints reached, in time order, followed by the
+                final concentrations.
+
+        Raises:
+            TimeoutError: If the run has not finished within `timeout` seconds.
+            Exception: Whatever the integration raised in the worker thread.
+        """
+        if not self.join(timeout):
+            raise TimeoutError("The background integration is still running.")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def _publish(self , t , concentrations):
+        frame = (t , concentrations.copy())
+        try:
+            self.frames.put_nowait(frame)
+        except queue.Full:
+            try:
+                self.frames.get_nowait()
+            except queue.Empty:
+                pass
+            self.frames.put_nowait(frame)
+
+    def _run(self):
+        calculator = self._calculator
+        rate_of_change , jacobian = self._rate_functions
+        concentrations = self._concentrations
+        offset = 0.0
+        try:
+            self._publish(offset , concentrations)
+            while not self._stop.is_set():
+                segment = self._time if self._time is not None else self._SEGMENT_STEPS * calculator.accuracy
+                t = 0.0
+                for t , step_size , new_conentratinos , rates in calculator._steps(concentrations , rate_of_change , jacobian , segment):
+                    self._cursor.advance(offset + t , step_size , concentrations , new_conentratinos , rates)
+                    concentrations = new_conentratinos
+                    self.number_of_steps += 1
+                    if self.number_of_steps % self._frame_stride == 0:
+                        self._publish(offset + t , concentrations)
+                    if not self._running.is_set():
+                        self._running.wait()
+                    if self._stop.is_set():
+                        break
+                offset += t
+                if self._time is not None:
                     break
-                elif cmd == "stop":
-                    ani.pause()
-                elif cmd == "resume":
-                    ani.resume()
-                else:
-                    print("invalid_input")       
-                    
-        checkpoints.append(concentrations)  
-        return checkpoints
\ No newline at end of file
+            self._publish(offset , concentrations)
+            self._result = self._cursor.states + [concentrations]
+        except Exception as error:
+            self._error = error
+
+class KineticModel:
+    """
+    Immutable, prepared kinetic model of an environment.
+
+    `KineticalCalculator.fit` builds one and stores it as `model`. It holds a snapshot
+    of the network (rate laws, stoichiometry, rate constants, activation energies,
+    initial concentrations and temperature) and the integration settings, so later
+    changes to the environment do not affect it, and it cannot be modified itself.
+    `solve` keeps no state between calls, so one model can serve many threads at
+    once without locks or deep copies. The NumPy kernels release the GIL inside
+    their array operations, and with `backend="numba"` a whole Euler run is
+    compiled code that runs without the GIL.
+
+    Args:
+        enviroment (Enviroment): The reaction environment to prepare.
+        accuracy, method, rtol, atol, sparse, backend: As in `KineticalCalculator`.
+
+    Attributes:
+        compounds (tuple[str]): Unicode formulas of the compounds, in the order of the
+            concentration vectors.
+        concentrations (numpy.ndarray): Read-only initial concentrations.
+        rate_constants (numpy.ndarray): Read-only `[kf, kb]` rows at temperature `T`.
+        T (float): Temperature of the snapshot.
+        rate_of_change (function): dc/dt with the snapshot's rate constants (see
+            `KineticalCalculator.rate_of_change`).
+
+    Example:
+        >>> kc = KineticalCalculator(accuracy=0.01)
+        >>> kc.fit(env)
+        >>> model = kc.model
+        >>> final = model.solve(10.0, initial_state={"A": 2.0}, params={"T": 310})[-1]
+    """
+    def __init__(self , enviroment , accuracy = 1e-3 , method = "euler" , rtol = 1e-6 , atol = 1e-9 , sparse = None , backend = "numpy"):
+        if not isinstance(enviroment , Enviroment):
+            raise ValueError("The input should be an instance of Enviroment class")
+        self._prepare(enviroment , KineticalCalculator(accuracy , method , rtol , atol , sparse , backend))
+
+    @classmethod
+    def _from_integrator(cls , enviroment , integrator):
+        """Prepare a model around an unfitted `KineticalCalculator` whose settings are already validated."""
+        model = object.__new__(cls)
+        model._prepare(enviroment , integrator)
+        return model
+
+    def _prepare(self , enviroment , integrator):
+        sparse = enviroment._prefers_sparse() if integrator.sparse is None else integrator.sparse
+        network = _Network.from_enviroment(enviroment , sparse)
+        state = {
+            "compounds": tuple(enviroment.compounds_unicode_formula) ,
+            "concentrations": _read_only(enviroment.concentrations_array) ,
+            "rate_constants": enviroment.compiled.rate_constants ,
+            "T": enviroment.T ,
+            "_activation_energies": _read_only([[reaction.activation_energy_forward , reaction.activation_energy_backward]
+                                                for reaction in enviroment.reactions]).reshape(-1 , 2) ,
+            "_compound_index": _compound_index(enviroment.compounds) ,
+            "_integrator": integrator ,
+            "_network": network ,
+            "_numba_network": None ,
+        }
+        if integrator.backend == "numba":
+            from . import _numba_kernels
+            rate_dependencies , stoichiometric_coefficient = network._dense()
+            state["_numba_network"] = (_numba_kernels.csr_triple(rate_dependencies[:, 0, :]) ,
+                                       _numba_kernels.csr_triple(rate_dependencies[:, 1, :]) ,
+                                       _numba_kernels.csr_triple(stoichiometric_coefficient))
+        self.__dict__.update(state)
+        self.__dict__["rate_of_change"] = self._default_rate_of_change()
+
+    def __setattr__(self , name , value):
+        raise AttributeError(f"{type(self).__name__} is immutable; fit a new model instead.")
+
+    def __getstate__(self):
+        # The generated kernel can't be pickled; it is rebuilt on unpickling.
+        state = self.__dict__.copy()
+        del state["rate_of_change"]
+        return state
+
+    def __setstate__(self , state):
+        self.__dict__.update(state)
+        self.__dict__["rate_of_change"] = self._default_rate_of_change()
+
+    def _default_rate_of_change(self):
+        if not self._network.sparse and self._network.shape[0] <= _COMPILED_MAX_REACTIONS:
+            return _compile_rate_of_change(*self._network._dense() , self.rate_constants)
+        return self._network.rate_functions(self.rate_constants)[0]
+
+    def parameters(self , initial_state = None , params = None):
+        """
+        Resolve an initial state and parameter overrides into concentration and rate-constant arrays.
+
+        Args:
+            initial_state (array-like | dict, optional): Initial concentrations, a full vector (or an
+                `(n_members, n_compounds)` batch), or `{compound: value}` keyed by formula, unicode
+                formula or index. Defaults to the snapshot's concentrations.
+            params (dict, optional): Overrides for one run:
+                - "T": Temperature; rate constants are rescaled from `T` with the activation
+                  energies (Arrhenius), like setting `Reaction.T`.
+                - "kf" / "kb": Forward / backward rate constants, a full sequence or
+                  `{reaction_index: value}`. They override the temperature-scaled values.
+
+        Returns:
+            tuple: `(concentrations, rate_constants)` as new, writable arrays.
+
+        Raises:
+            ValueError: If `params` has unknown keys, or an override refers to an unknown
+                compound or reaction or has the wrong length.
+        """
+        params = {} if params is None else params
+        unknown = set(params) - {"T" , "kf" , "kb"}
+        if unknown:
+            raise ValueError(f"Unknown parameters {sorted(unknown)}; expected some of ['T', 'kf', 'kb'].")
+        concentrations = self.concentrations.copy()
+        if initial_state is not None and not isinstance(initial_state , dict) and np.ndim(initial_state) == 2:
+            concentrations = np.array(initial_state , dtype=float)
+            if concentrations.shape[1] != len(self.compounds):
+                raise ValueError(f"`initial_state` should have shape (n_members, {len(self.compounds)})")
+        else:
+            for index , value in _indexed_items(initial_state if initial_state is not None else {} , len(concentrations) , self._compound_index , "initial_state"):
+                concentrations[index] = value
+        rate_constants = self.rate_constants.copy()
+        if "T" in params:
+            rate_constants *= np.exp((-self._activation_energies / 8.3145) * (1 / params["T"] - 1 / self.T))
+        for key , column in (("kf" , 0) , ("kb" , 1)):
+            for index , value in _indexed_items(params.get(key , {}) , len(rate_constants) , {} , key):
+                rate_constants[index , column] = value
+        return concentrations , rate_constants
+
+    def solve(self , time , initial_state = None , params = None , checkpoint_time = []):
+        """
+        Integrate the model without modifying it.
+
+        Args:
+            time (float): Total simulation time.
+            initial_state (array-like | dict, optional): See `parameters`. A batch
+                `(n_members, n_compounds)` is integrated as an ensemble.
+            params (dict, optional): See `parameters`.
+            checkpoint_time (list[float], optional): Times at which to record concentrations.
+
+        Returns:
+            numpy.ndarray: The checkpoints in time order followed by the final state,
+                `(n_checkpoints + 1, n_compounds)`, with a leading member axis for a batch.
+
+        Raises:
+            ValueError: See `parameters`.
+        """
+        concentrations , rate_constants = self.parameters(initial_state , params)
+        return self._solve(concentrations , rate_constants , time , checkpoint_time , rate_constants_changed = bool(params))
+
+    def _solve(self , concentrations , rate_constants , time , checkpoint_time = [] , rate_constants_changed = True):
+        integrator = self._integrator
+        if integrator.backend == "numba" and concentrations.ndim == 1:
+            from . import _numba_kernels
+            checkpoint_times = np.array(_CheckpointCursor(checkpoint_time).times , dtype=float)
+            final , checkpoints = _numba_kernels.euler(concentrations , rate_constants , *self._numba_network ,
+                                                       float(integrator.accuracy) , int(time/integrator.accuracy+1) , float(time) ,
+                                                       checkpoint_times , 0 , -1.0 , 0.0)[:2]
+            return np.concatenate([checkpoints , final[None]])
+        rate_of_change , jacobian = self._network.rate_functions(rate_constants)
+        if not rate_constants_changed:
+            rate_of_change = self.rate_of_change
+        return integrator._integrate(concentrations , rate_of_change , jacobian , time , checkpoint_time)[0]
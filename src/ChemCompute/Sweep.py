@@ -0,0 +1,97 @@
+from ._general import Enviroment
+from .Kinetic import KineticModel
+from itertools import product
+import math
+import os
+import numpy as np
+
+_OVERRIDE_KEYS = ["T" , "concentrations" , "kf" , "kb"]
+
+# Set in each worker process by `_initialize_worker`: the model, total time and checkpoint times
+_worker_run = None
+
+def _initialize_worker(model , time , checkpoint_time):
+    global _worker_run
+    _worker_run = (model , time , checkpoint_time)
+
+def _run_in_worker(task):
+    model , time , checkpoint_time = _worker_run
+    return model._solve(*task , time , checkpoint_time)
+
+
+def _expand_overrides(overrides):
+    """Turn a grid (dict of lists) into its cartesian product; pass a list of dicts through."""
+    if isinstance(overrides , dict):
+        keys = list(overrides)
+        return [dict(zip(keys , values)) for values in product(*(overrides[key] for key in keys))]
+    return [dict(override) for override in overrides]
+
+def _run_parameters(model , override):
+    """Resolve one override dict into `(concentrations, rate_constants)` arrays."""
+    unknown = set(override) - set(_OVERRIDE_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown override keys {sorted(unknown)}; expected some of {_OVERRIDE_KEYS}.")
+    params = {key: value for key , value in override.items() if key != "concentrations"}
+    return model.parameters(override.get("concentrations") , params)
+
+
+def sweep(enviroment , overrides , time , checkpoint_time = [] , workers = None , chunksize = None ,
+          accuracy = 1e-3 , method = "euler" , rtol = 1e-6 , atol = 1e-9 , sparse = None):
+    """
+    Run a kinetic simulation for every parameter override, fanned out over worker processes.
+
+    The environment is prepared once as a `KineticModel` (rate laws and stoichiometry),
+    which each worker receives a single time when it starts. Every task then only
+    carries its initial concentrations and rate constants. Tasks are sent in
+    chunks and the results come back in the order of `overrides`.
+
+    Args:
+        enviroment (Enviroment): Base environment; it is not modified.
+        overrides (list[dict] | dict[str, list]): One dict per run, or a grid mapping each key to a
+            list of values whose cartesian product is run (the last key varies fastest). Keys:
+                - "T": Temperature; rate constants are rescaled with the reactions' activation energies.
+                - "concentrations": Initial concentrations, a full sequence or `{compound: value}` keyed
+                  by formula, unicode formula or index.
+                - "kf" / "kb": Forward / backward rate constants, a full sequence or `{reaction_index: value}`.
+                  They override the temperature-scaled values.
+        time (float): Total simulation time of every run.
+        checkpoint_time (list[float], optional): Times at which to record concentrations.
+        workers (int, optional): Number of worker processes. Defaults to `os.cpu_count()`;
+            1 runs everything in the calling process.
+        chunksize (int, optional): Tasks per batch sent to a worker. Defaults to an even split
+            into about four batches per worker.
+        accuracy, method, rtol, atol, sparse: Passed to `KineticalCalculator`.
+
+    Returns:
+        numpy.ndarray: Array of shape `(n_runs, n_checkpoints + 1, n_compounds)`; along the second
+            axis are the checkpoints in time order, followed by the final state.
+
+    Raises:
+        ValueError: If `enviroment` is not an `Enviroment`, or an override has an unknown key,
+            compound or reaction, or a sequence of the wrong length.
+
+    Example:
+        >>> from ChemCompute.Sweep import sweep
+        >>> results = sweep(env, {"T": [290, 300, 310], "kf": [{0: 0.5}, {0: 1.0}]}, time=10.0, workers=8)
+        >>> results.shape
+        (6, 1, 2)
+    """
+    if not isinstance(enviroment , Enviroment):
+        raise ValueError("The input should be an instance of Enviroment class")
+    model = KineticModel(enviroment , accuracy , method , rtol , atol , sparse)
+    tasks = [_run_parameters(model , override) for override in _expand_overrides(overrides)]
+    checkpoint_time = list(checkpoint_time)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(tasks) <= 1:
+        results = [model._solve(*task , time , checkpoint_time) for task in tasks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        workers = min(workers , len(tasks))
+        if chunksize is None:
+            chunksize = max(1 , math.ceil(len(tasks) / (4 * workers)))
+        with ProcessPoolExecutor(max_workers=workers , initializer=_initialize_worker , initargs=(model , time , checkpoint_time)) as executor:
+            results = list(executor.map(_run_in_worker , tasks , chunksize=chunksize))
+    if not results:
+        return np.empty((0 , 0 , len(enviroment.compounds)))
+    return np.stack(results)
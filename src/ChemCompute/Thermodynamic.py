@@ -1,31 +1,209 @@
-from ._general import Enviroment
+from ._general import Enviroment, SparseMatrix, _compound_index, _indexed_items, _read_only, _resolve_backend
 import numpy as np
 
 
+def _phase_include_mask(compounds, T):
+    # Phase handling: solids and liquids are excluded from the equilibrium expression
+    return np.array([compound.phase(T) not in ("s", "l") for compound in compounds], dtype=bool)
+
+
+def _exponent_matrix(N, phase_include_mask):
+    # Mass-action exponents A (products +, reactants -) with the excluded columns zeroed
+    if isinstance(N, SparseMatrix):
+        return SparseMatrix(-N.data * phase_include_mask[N.indices], N.indices, N.indptr, N.shape)
+    A = -N.astype(float)
+    A[:, ~phase_include_mask] = 0.0
+    return A
+
+
+# The solvers below are pure: they take the mass-action system (N, S = N.T, A, c0, ln K)
+# and return the reaction extents x, without touching any calculator or environment.
+
+def _batch_gradient_descent(N, S, A, c0, lnK, max_iter, learning_rate, tol, backtrack_beta, min_concentration):
+    R = N.shape[0]
+
+    # Optimize extents x
+    x = np.zeros(R, dtype=float)
+
+    for _ in range(max_iter):
+        c = c0 + S @ x  # (C,)
+        # Ensure strictly positive for log; use floor at min_concentration for stability
+        c_safe = np.maximum(c, min_concentration)
+
+        lnQ = A @ np.log(c_safe) 
+        residual = lnQ - lnK
+
+        # Check residual convergence
+        if np.linalg.norm(residual, ord=2) < tol:
+            break
+
+        # Jacobian J = A @ diag(1/c) @ S  (R x R); grad = J.T @ residual = N @ diag(1/c) @ A.T @ residual
+        inv_c = 1.0 / c_safe
+        grad = N @ (inv_c * (A.T @ residual))  # (R,) without forming J
+
+        # Gradient convergence
+        if np.linalg.norm(grad, ord=2) < tol:
+            break
+
+        # Take step with backtracking to preserve non-negativity and reduce objective
+        step = learning_rate
+        f_curr = 0.5 * np.dot(residual, residual)
+        while True:
+            x_new = x - step * grad
+            c_new = c0 + S @ x_new
+            if np.all(c_new >= -1e-15):  # allow tiny numerical negative, will be floored for logs
+                c_new_safe = np.maximum(c_new, min_concentration)
+                lnQ_new = A @ np.log(c_new_safe)
+                r_new = lnQ_new - lnK
+                f_new = 0.5 * np.dot(r_new, r_new)
+                if f_new <= f_curr or step < 1e-12:
+                    x = x_new
+                    break
+            step *= backtrack_beta
+    return x
+
+
+def _stochastic_gradient_descent(N, S, A, c0, lnK, max_iter, learning_rate, tol, backtrack_beta, min_concentration,
+                                 permutation=None):
+    # Reaction orders come from the global NumPy generator unless a permutation function is given
+    # (resolved here, not as a default value, so importing this module doesn't load numpy.random)
+    permutation = np.random.permutation if permutation is None else permutation
+    R = N.shape[0]
+
+    x = np.zeros(R, dtype=float)
+
+    for _ in range(max_iter):
+        order = permutation(R)
+        any_update = False
+        for i in order:
+            c = c0 + S @ x
+            c_safe = np.maximum(c, min_concentration)
+            inv_c = 1.0 / c_safe
+
+            a_i = A[i]
+            lnQ_i = a_i @ np.log(c_safe)
+            r_i = lnQ_i - lnK[i]
+            if abs(r_i) < tol:
+                continue
+
+            # J_i = a_i @ diag(1/c) @ S = N @ (a_i / c)  -> shape (R,)
+            J_i = N @ (a_i * inv_c)
+            grad_i = J_i * r_i
+
+            step = learning_rate
+            f_curr = 0.5 * (r_i * r_i)
+
+            while True:
+                x_new = x - step * grad_i
+                c_new = c0 + S @ x_new
+                if np.all(c_new >= -1e-15):
+                    c_new_safe = np.maximum(c_new, min_concentration)
+                    lnQ_i_new = a_i @ np.log(c_new_safe)
+                    r_i_new = lnQ_i_new - lnK[i]
+                    f_new = 0.5 * (r_i_new * r_i_new)
+                    if f_new <= f_curr or step < 1e-12:
+                        x = x_new
+                        any_update = True
+                        break
+                step *= backtrack_beta
+
+        # Full residual check for convergence
+        c_full = c0 + S @ x
+        c_full_safe = np.maximum(c_full, min_concentration)
+        full_residual = (A @ np.log(c_full_safe)) - lnK
+        if np.linalg.norm(full_residual, ord=2) < tol:
+            break
+        if not any_update:
+            break
+    return x
+
+
+def _newton(N, S, A, c0, lnK, max_iter, learning_rate, tol, backtrack_beta, min_concentration):
+    R = N.shape[0]
+
+    # Newton needs the full (R x R) Jacobian, so S is expanded once
+    S_dense = S.toarray() if isinstance(S, SparseMatrix) else S
+
+    x = np.zeros(R, dtype=float)
+
+    for _ in range(max_iter):
+        c = c0 + S @ x
+        c_safe = np.maximum(c, min_concentration)
+        lnQ = A @ np.log(c_safe)
+        r = lnQ - lnK
+        if np.linalg.norm(r, ord=2) < tol:
+            break
+
+        inv_c = 1.0 / c_safe
+        J = A @ (inv_c[:, None] * S_dense)
+
+        # Solve J * dx = r, then x <- x - alpha * dx
+        try:
+            dx, *_ = np.linalg.lstsq(J, r, rcond=None)
+        except Exception:
+            dx = np.linalg.pinv(J) @ r
+
+        step = learning_rate
+        f_curr = 0.5 * np.dot(r, r)
+        while True:
+            x_new = x - step * dx
+            c_new = c0 + S @ x_new
+            if np.all(c_new >= -1e-15):
+                c_new_safe = np.maximum(c_new, min_concentration)
+                lnQ_new = A @ np.log(c_new_safe)
+                r_new = lnQ_new - lnK
+                f_new = 0.5 * np.dot(r_new, r_new)
+                if f_new <= f_curr or step < 1e-12:
+                    x = x_new
+                    break
+            step *= backtrack_beta
+    return x
+
+
+def _numba_solver(name):
+    def solver(N, S, A, c0, lnK, max_iter, learning_rate, tol, backtrack_beta, min_concentration):
+        from . import _numba_kernels
+        # The compiled loops work on the dense arrays
+        N = N.toarray() if isinstance(N, SparseMatrix) else np.asarray(N, dtype=float)
+        A = A.toarray() if isinstance(A, SparseMatrix) else A
+        return getattr(_numba_kernels, name)(np.ascontiguousarray(N), np.ascontiguousarray(A), c0, lnK, int(max_iter),
+                                             float(learning_rate), float(tol), float(backtrack_beta), float(min_concentration))
+    return solver
+
+
+_SOLVERS = {"bgd": _batch_gradient_descent, "sgd": _stochastic_gradient_descent, "newton": _newton}
+_NUMBA_SOLVERS = {"bgd": _numba_solver("batch_gradient_descent"),
+                  "sgd": _numba_solver("stochastic_gradient_descent"),
+                  "newton": _numba_solver("newton")}
+
+
 class EquilibriumCalculator:
-    def __init__(self, method_of_calculation: str = "bgd"):
+    def __init__(self, method_of_calculation: str = "bgd", sparse: bool = None, backend: str = "numpy"):
         self.method_of_calculation = method_of_calculation
+        # None picks the sparse (CSR) network representation automatically for large networks
+        self.sparse = sparse
+        # "numba" runs the whole bgd/sgd/newton iteration as compiled code (falls back to NumPy if missing)
+        self.backend = _resolve_backend(backend)
         self.fitted = False
     def _generate_concentration_equations(self):
         # Start with a copy of the current concentrations as strings
         concentration_eq = [str(value) for value in self.env.concentrations]
 
-        # For each reaction, adjust each compound's expression by its stoichiometric change
+        # For each reaction, adjust each compound's expression by its stoichiometric change:
+        # reactants count positive, products negative (the first entry of a compound per side)
+        compound_index = self.env.compound_index
         for r_index, reaction in enumerate(self.env.reactions, start=1):
-            for idx, compound in enumerate(self.env.compounds):
-                coeff = 0
-                # Check reactants (positive coefficient)
-                for reactant in reaction.reactants:
-                    if reactant["compound"] == compound:
-                        coeff += reactant["stoichiometric_coefficient"]
-                        break
-                # Check products (negative coefficient)
-                for product in reaction.products:
-                    if product["compound"] == compound:
-                        coeff -= product["stoichiometric_coefficient"]
-                        break
-                if coeff != 0:
-                    concentration_eq[idx] += f" + ({coeff}x{r_index})"
+            coefficients = {}
+            for sign, side in ((1, reaction.reactants), (-1, reaction.products)):
+                seen = set()
+                for species in side:
+                    idx = compound_index[species["compound"]]
+                    if idx not in seen:
+                        seen.add(idx)
+                        coefficients[idx] = coefficients.get(idx, 0) + sign * species["stoichiometric_coefficient"]
+            for idx in sorted(coefficients):
+                if coefficients[idx] != 0:
+                    concentration_eq[idx] += f" + ({coefficients[idx]}x{r_index})"
         return concentration_eq
 
     def fit(self, env: Enviroment):
@@ -61,6 +239,9 @@ class EquilibriumCalculator:
           how concentrations depend on reaction extents (x1, x2, ...)
         - The environment is stored as self.env for use in subsequent calculations
         - Calling fit() again will overwrite the previous environment and equations
+        - An immutable snapshot of the environment is stored as self.model
+          (an EquilibriumModel); its solve() keeps no state and can be shared
+          by concurrent threads
         
         Examples
         --------
@@ -76,6 +257,7 @@ class EquilibriumCalculator:
         else:
             raise ValueError("The input should be an instance of Enviroment class")
         self.concentration_equation = self._generate_concentration_equations()
+        self.model = EquilibriumModel(env, self.method_of_calculation, self.sparse, self.backend)
         self.fitted = True
     def calculate(self,
                   max_iter: int = 5000,
@@ -136,6 +318,9 @@ class EquilibriumCalculator:
           concentrations and objective function improvement
         - Convergence is checked based on both residual norms and gradient norms
         - The solution extents are stored in self.x_solution after calculation
+        - With backend="numba" the iterations run as compiled code over the dense
+          network arrays; "sgd" then draws its reaction order from numba's own
+          random generator, which np.random.seed does not affect
         
         Examples
         --------
@@ -145,6 +330,8 @@ class EquilibriumCalculator:
         """
         if self.fitted == False:
             raise ValueError("Environment not fitted")
+        if self.backend == "numba" and self.method_of_calculation in ("bgd", "sgd", "newton"):
+            return self._calculate_by_numba(max_iter, learning_rate, tol, backtrack_beta, min_concentration)
         if self.method_of_calculation == "bgd":
             return self._calculate_by_batch_gradient_descent(max_iter, learning_rate, tol, backtrack_beta, min_concentration)
         elif self.method_of_calculation == "sgd":
@@ -153,6 +340,66 @@ class EquilibriumCalculator:
             return self._calculate_by_newton(max_iter, learning_rate, tol, backtrack_beta, min_concentration)
         return None
 
+    async def acalculate(self,
+                         max_iter: int = 5000,
+                         learning_rate: float = 0.1,
+                         tol: float = 1e-8,
+                         backtrack_beta: float = 0.5,
+                         min_concentration: float = 1e-12,
+                         executor=None):
+        """
+        Asynchronous calculate(): run the solver in an executor so the event loop stays free.
+
+        The mass-action system is read from the environment on the calling thread;
+        only the (pure) iteration runs in `executor`. Results are stored on the
+        calculator after the solver finishes, so a cancelled call leaves
+        `x_solution` untouched.
+
+        Parameters
+        ----------
+        max_iter, learning_rate, tol, backtrack_beta, min_concentration
+            As in calculate().
+        executor : concurrent.futures.Executor, optional
+            Executor to run the solver in. Default is the event loop's default
+            thread pool. With backend="numba" the compiled solver releases the GIL.
+
+        Returns
+        -------
+        list[float] or None
+            Same as calculate().
+
+        Raises
+        ------
+        ValueError
+            If the environment has not been fitted using the fit() method.
+        asyncio.CancelledError
+            If the awaiting task is cancelled. The await returns immediately; the
+            solver already running in the executor finishes in the background
+            (within `max_iter` iterations) and its result is discarded.
+
+        Examples
+        --------
+        >>> calculator = EquilibriumCalculator(method_of_calculation="newton")
+        >>> calculator.fit(env)
+        >>> equilibrium_concentrations = await calculator.acalculate(tol=1e-10)
+        """
+        import asyncio
+        if self.fitted == False:
+            raise ValueError("Environment not fitted")
+        solver = self._solver()
+        if solver is None:
+            return None
+        N, S, A, c0, lnK = self._mass_action_system()
+        x = await asyncio.get_running_loop().run_in_executor(
+            executor, solver, N, S, A, c0, lnK, max_iter, learning_rate, tol, backtrack_beta, min_concentration)
+        return self._store_solution(x, c0, S)
+
+    def _solver(self):
+        # Extent solver for the configured method and backend, or None for an unknown method
+        if self.backend == "numba" and self.method_of_calculation in _NUMBA_SOLVERS:
+            return _NUMBA_SOLVERS[self.method_of_calculation]
+        return _SOLVERS.get(self.method_of_calculation)
+
     def fit_calculate(self,
                       env: Enviroment,
                       max_iter: int = 5000,
@@ -227,79 +474,28 @@ class EquilibriumCalculator:
         self.fit(env)
         return self.calculate(max_iter, learning_rate, tol, backtrack_beta, min_concentration)
 
-    def _calculate_by_batch_gradient_descent(self,
-                                            max_iter: int = 5000,
-                                            learning_rate: float = 0.1,
-                                            tol: float = 1e-8,
-                                            backtrack_beta: float = 0.5,
-                                            min_concentration: float = 1e-12):
-        
-        N = self.env.stoichiometric_coefficient_array  
-        S = N.T 
-        R = N.shape[0]
-        C = N.shape[1]
-
-        # Initial concentrations vector
-        c0 = np.array(self.env.concentrations, dtype=float) 
-
-        # Build mass-action exponent matrix A: products +, reactants -
-        A = -N.astype(float)
-
-        # Phase handling: exclude s/l from equilibrium expression by zeroing their columns in A
-        phase_include_mask = np.ones(C, dtype=bool)
-        for j, compound in enumerate(self.env.compounds):
-            ph = compound.phase(self.env.T)
-            if ph in ("s", "l"):
-                phase_include_mask[j] = False
-        for j in range(C):
-            if not phase_include_mask[j]:
-                A[:, j] = 0.0
+    def _mass_action_system(self):
+        # Stoichiometry N (R x C), S = N.T, mass-action exponents A (products +, reactants -)
+        # with s/l phases excluded, initial concentrations c0 and ln K.
+        sparse = self.env._prefers_sparse() if self.sparse is None else self.sparse
+        if sparse:
+            N = self.env.compiled.sparse_stoichiometric_coefficient_array
+        else:
+            N = self.env.compiled.stoichiometric_coefficient_array
+        c0 = np.array(self.env.concentrations, dtype=float)
+        A = _exponent_matrix(N, _phase_include_mask(self.env.compounds, self.env.T))
 
         # Equilibrium constants vector
-        K_vec = np.array([max(rxn.K, 1e-300) for rxn in self.env.reactions], dtype=float)
+        K_vec = np.maximum(self.env.compiled.K, 1e-300)
         lnK = np.log(K_vec)
+        return N, N.T, A, c0, lnK
 
-        # Optimize extents x
-        x = np.zeros(R, dtype=float)
-
-        for _ in range(max_iter):
-            c = c0 + S @ x  # (C,)
-            # Ensure strictly positive for log; use floor at min_concentration for stability
-            c_safe = np.maximum(c, min_concentration)
-
-            lnQ = A @ np.log(c_safe) 
-            residual = lnQ - lnK
-
-            # Check residual convergence
-            if np.linalg.norm(residual, ord=2) < tol:
-                break
-
-            # Jacobian J = A @ diag(1/c) @ S  (R x R)
-            inv_c = 1.0 / c_safe
-            J = A @ (inv_c[:, None] * S)  # broadcasting builds A @ diag(inv_c) @ S
-            grad = J.T @ residual  # (R,)
-
-            # Gradient convergence
-            if np.linalg.norm(grad, ord=2) < tol:
-                break
-
-            # Take step with backtracking to preserve non-negativity and reduce objective
-            step = learning_rate
-            f_curr = 0.5 * np.dot(residual, residual)
-            while True:
-                x_new = x - step * grad
-                c_new = c0 + S @ x_new
-                if np.all(c_new >= -1e-15):  # allow tiny numerical negative, will be floored for logs
-                    c_new_safe = np.maximum(c_new, min_concentration)
-                    lnQ_new = A @ np.log(c_new_safe)
-                    r_new = lnQ_new - lnK
-                    f_new = 0.5 * np.dot(r_new, r_new)
-                    if f_new <= f_curr or step < 1e-12:
-                        x = x_new
-                        break
-                step *= backtrack_beta
+    def _solve(self, solver, max_iter, learning_rate, tol, backtrack_beta, min_concentration):
+        N, S, A, c0, lnK = self._mass_action_system()
+        x = solver(N, S, A, c0, lnK, max_iter, learning_rate, tol, backtrack_beta, min_concentration)
+        return self._store_solution(x, c0, S)
 
-        # Final concentrations
+    def _store_solution(self, x, c0, S):
         c_final = c0 + S @ x
         c_final = np.maximum(c_final, 0.0)
 
@@ -309,86 +505,29 @@ class EquilibriumCalculator:
         # Return as list aligned with env.compounds
         return c_final.tolist()
 
+    def _calculate_by_numba(self,
+                            max_iter: int = 5000,
+                            learning_rate: float = 0.1,
+                            tol: float = 1e-8,
+                            backtrack_beta: float = 0.5,
+                            min_concentration: float = 1e-12):
+        return self._solve(_NUMBA_SOLVERS[self.method_of_calculation], max_iter, learning_rate, tol, backtrack_beta, min_concentration)
+
+    def _calculate_by_batch_gradient_descent(self,
+                                            max_iter: int = 5000,
+                                            learning_rate: float = 0.1,
+                                            tol: float = 1e-8,
+                                            backtrack_beta: float = 0.5,
+                                            min_concentration: float = 1e-12):
+        return self._solve(_batch_gradient_descent, max_iter, learning_rate, tol, backtrack_beta, min_concentration)
+
     def _calculate_by_stochastic_gradient_descent(self,
                                                   max_iter: int = 5000,
                                                   learning_rate: float = 0.1,
                                                   tol: float = 1e-8,
                                                   backtrack_beta: float = 0.5,
                                                   min_concentration: float = 1e-12):
-        # Stoichiometry and mappings
-        N = self.env.stoichiometric_coefficient_array
-        S = N.T
-        R = N.shape[0]
-        C = N.shape[1]
-
-        c0 = np.array(self.env.concentrations, dtype=float)
-
-        # Mass-action exponents, exclude s/l phases
-        A = -N.astype(float)
-        phase_include_mask = np.ones(C, dtype=bool)
-        for j, compound in enumerate(self.env.compounds):
-            ph = compound.phase(self.env.T)
-            if ph in ("s", "l"):
-                phase_include_mask[j] = False
-        for j in range(C):
-            if not phase_include_mask[j]:
-                A[:, j] = 0.0
-
-        K_vec = np.array([max(rxn.K, 1e-300) for rxn in self.env.reactions], dtype=float)
-        lnK = np.log(K_vec)
-
-        x = np.zeros(R, dtype=float)
-
-        for _ in range(max_iter):
-            order = np.random.permutation(R)
-            any_update = False
-            for i in order:
-                c = c0 + S @ x
-                c_safe = np.maximum(c, min_concentration)
-                inv_c = 1.0 / c_safe
-
-                a_i = A[i, :]
-                lnQ_i = a_i @ np.log(c_safe)
-                r_i = lnQ_i - lnK[i]
-                if abs(r_i) < tol:
-                    continue
-
-                # J_i = a_i @ diag(1/c) @ S  -> shape (R,)
-                J_i = (a_i @ (inv_c[:, None] * S))
-                grad_i = J_i * r_i
-
-                step = learning_rate
-                f_curr = 0.5 * (r_i * r_i)
-
-                while True:
-                    x_new = x - step * grad_i
-                    c_new = c0 + S @ x_new
-                    if np.all(c_new >= -1e-15):
-                        c_new_safe = np.maximum(c_new, min_concentration)
-                        lnQ_i_new = a_i @ np.log(c_new_safe)
-                        r_i_new = lnQ_i_new - lnK[i]
-                        f_new = 0.5 * (r_i_new * r_i_new)
-                        if f_new <= f_curr or step < 1e-12:
-                            x = x_new
-                            any_update = True
-                            break
-                    step *= backtrack_beta
-
-            # Full residual check for convergence
-            c_full = c0 + S @ x
-            c_full_safe = np.maximum(c_full, min_concentration)
-            full_residual = (A @ np.log(c_full_safe)) - lnK
-            if np.linalg.norm(full_residual, ord=2) < tol:
-                break
-            if not any_update:
-                break
-
-        c_final = c0 + S @ x
-        c_final = np.maximum(c_final, 0.0)
-
-        self.x_solution = x
-        self.fitted = True
-        return c_final.tolist()
+        return self._solve(_stochastic_gradient_descent, max_iter, learning_rate, tol, backtrack_beta, min_concentration)
 
     def _calculate_by_newton(self,
                               max_iter: int = 200,
@@ -396,65 +535,125 @@ class EquilibriumCalculator:
                               tol: float = 1e-10,
                               backtrack_beta: float = 0.5,
                               min_concentration: float = 1e-12):
-        # Stoichiometry and mappings
-        N = self.env.stoichiometric_coefficient_array
-        S = N.T
-        R = N.shape[0]
-        C = N.shape[1]
-
-        c0 = np.array(self.env.concentrations, dtype=float)
-
-        # Mass-action exponents, exclude s/l phases
-        A = -N.astype(float)
-        phase_include_mask = np.ones(C, dtype=bool)
-        for j, compound in enumerate(self.env.compounds):
-            ph = compound.phase(self.env.T)
-            if ph in ("s", "l"):
-                phase_include_mask[j] = False
-        for j in range(C):
-            if not phase_include_mask[j]:
-                A[:, j] = 0.0
-
-        K_vec = np.array([max(rxn.K, 1e-300) for rxn in self.env.reactions], dtype=float)
-        lnK = np.log(K_vec)
-
-        x = np.zeros(R, dtype=float)
-
-        for _ in range(max_iter):
-            c = c0 + S @ x
-            c_safe = np.maximum(c, min_concentration)
-            lnQ = A @ np.log(c_safe)
-            r = lnQ - lnK
-            if np.linalg.norm(r, ord=2) < tol:
-                break
-
-            inv_c = 1.0 / c_safe
-            J = A @ (inv_c[:, None] * S)
+        return self._solve(_newton, max_iter, learning_rate, tol, backtrack_beta, min_concentration)
+
+
+class EquilibriumModel:
+    """
+    Immutable, prepared equilibrium model of an environment.
+
+    `EquilibriumCalculator.fit` builds one and stores it as `model`. It takes a
+    snapshot of the network (stoichiometry, equilibrium constants, reaction
+    enthalpies, initial concentrations and temperature), so later changes to the
+    environment do not affect it, and it cannot be modified itself. `solve` keeps
+    no state between calls, so one model can serve many threads at once without
+    locks or copies.
+
+    Parameters
+    ----------
+    env : Enviroment
+        The chemical environment to prepare.
+    method_of_calculation : str, optional
+        "bgd", "sgd" or "newton". Default is "bgd".
+    sparse : bool, optional
+        Use the sparse (CSR) network representation; None decides per environment.
+    backend : str, optional
+        "numpy" (default) or "numba".
+
+    Attributes
+    ----------
+    compounds : tuple[str]
+        Unicode formulas of the compounds, in the order of the concentration vectors.
+    concentrations : numpy.ndarray
+        Read-only initial concentrations.
+    K : numpy.ndarray
+        Read-only equilibrium constants at temperature `T`.
+    T : float
+        Temperature of the snapshot.
+    """
+    def __init__(self, env: Enviroment, method_of_calculation: str = "bgd", sparse: bool = None, backend: str = "numpy"):
+        if not isinstance(env, Enviroment):
+            raise ValueError("The input should be an instance of Enviroment class")
+        sparse = env._prefers_sparse() if sparse is None else sparse
+        state = {
+            "method_of_calculation": method_of_calculation,
+            "backend": _resolve_backend(backend),
+            "compounds": tuple(env.compounds_unicode_formula),
+            "concentrations": _read_only(env.concentrations),
+            "K": env.compiled.K,
+            "T": env.T,
+            "_enthalpies": _read_only([rxn.enthalpy for rxn in env.reactions]),
+            "_compounds": tuple(env.compounds),
+            "_N": env.compiled.sparse_stoichiometric_coefficient_array if sparse else env.compiled.stoichiometric_coefficient_array,
+            "_compound_index": _compound_index(env.compounds),
+        }
+        self.__dict__.update(state)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable; fit a new model instead.")
+
+    def solve(self,
+              initial_state=None,
+              params: dict = None,
+              max_iter: int = 5000,
+              learning_rate: float = 0.1,
+              tol: float = 1e-8,
+              backtrack_beta: float = 0.5,
+              min_concentration: float = 1e-12,
+              seed: int = None):
+        """
+        Calculate equilibrium concentrations without modifying the model.
 
-            # Solve J * dx = r, then x <- x - alpha * dx
-            try:
-                dx, *_ = np.linalg.lstsq(J, r, rcond=None)
-            except Exception:
-                dx = np.linalg.pinv(J) @ r
+        Parameters
+        ----------
+        initial_state : array-like or dict, optional
+            Initial concentrations, a full vector or `{compound: value}` keyed by formula,
+            unicode formula or index. Defaults to the snapshot's concentrations.
+        params : dict, optional
+            Parameter overrides for this call only:
+            - "T": Temperature; K follows van 't Hoff with the reaction enthalpies and the
+              phases (s/l compounds are excluded) are evaluated at T.
+            - "K": Equilibrium constants, a full sequence or `{reaction_index: value}`.
+              They override the temperature-scaled values.
+        max_iter, learning_rate, tol, backtrack_beta, min_concentration
+            As in `EquilibriumCalculator.calculate`.
+        seed : int, optional
+            Seed of the reaction order drawn by "sgd". Each call uses its own generator,
+            so concurrent calls do not share random state.
 
-            step = learning_rate
-            f_curr = 0.5 * np.dot(r, r)
-            while True:
-                x_new = x - step * dx
-                c_new = c0 + S @ x_new
-                if np.all(c_new >= -1e-15):
-                    c_new_safe = np.maximum(c_new, min_concentration)
-                    lnQ_new = A @ np.log(c_new_safe)
-                    r_new = lnQ_new - lnK
-                    f_new = 0.5 * np.dot(r_new, r_new)
-                    if f_new <= f_curr or step < 1e-12:
-                        x = x_new
-                        break
-                step *= backtrack_beta
+        Returns
+        -------
+        numpy.ndarray
+            Equilibrium concentrations, ordered like `compounds`.
 
-        c_final = c0 + S @ x
-        c_final = np.maximum(c_final, 0.0)
+        Raises
+        ------
+        ValueError
+            If `method_of_calculation` is unknown, or `params` / `initial_state` refer to
+            unknown keys, compounds or reactions.
+        """
+        if self.method_of_calculation not in _SOLVERS:
+            raise ValueError("`method_of_calculation` is not one of ['bgd', 'sgd', 'newton'].")
+        params = {} if params is None else params
+        unknown = set(params) - {"T", "K"}
+        if unknown:
+            raise ValueError(f"Unknown parameters {sorted(unknown)}; expected some of ['T', 'K'].")
+        c0 = self.concentrations.copy()
+        for index, value in _indexed_items(initial_state if initial_state is not None else {}, len(c0), self._compound_index, "initial_state"):
+            c0[index] = value
+        T = params.get("T", self.T)
+        K = self.K * np.exp((-self._enthalpies / 8.3145) * (1 / T - 1 / self.T))
+        for index, value in _indexed_items(params.get("K", {}), len(K), {}, "K"):
+            K[index] = value
+        N = self._N
+        A = _exponent_matrix(N, _phase_include_mask(self._compounds, T))
+        lnK = np.log(np.maximum(K, 1e-300))
+        arguments = (N, N.T, A, c0, lnK, max_iter, learning_rate, tol, backtrack_beta, min_concentration)
+        if self.backend == "numba":
+            x = _NUMBA_SOLVERS[self.method_of_calculation](*arguments)
+        elif self.method_of_calculation == "sgd":
+            x = _stochastic_gradient_descent(*arguments, permutation=np.random.default_rng(seed).permutation)
+        else:
+            x = _SOLVERS[self.method_of_calculation](*arguments)
+        return np.maximum(c0 + N.T @ x, 0.0)
 
-        self.x_solution = x
-        self.fitted = True
-        return c_final.tolist()
\ No newline at end of file
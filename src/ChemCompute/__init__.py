@@ -1,2 +1,28 @@
 from ._general import *
+from ._general import __all__ as _core_names
+from importlib import import_module as _import_module
 
+# The calculators live in submodules that are only imported on first access
+# (PEP 562), so `import ChemCompute` only pays for NumPy and the core classes.
+_LAZY_SUBMODULES = ("Kinetic" , "Thermodynamic" , "Sweep")
+_LAZY_ATTRIBUTES = {
+    "KineticalCalculator": "Kinetic" ,
+    "KineticModel": "Kinetic" ,
+    "EquilibriumCalculator": "Thermodynamic" ,
+    "EquilibriumModel": "Thermodynamic" ,
+    "sweep": "Sweep" ,
+}
+
+__all__ = list(_core_names) + list(_LAZY_ATTRIBUTES)
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        return _import_module(f".{name}" , __name__)
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(_import_module(f".{_LAZY_ATTRIBUTES[name]}" , __name__) , name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_SUBMODULES) | set(_LAZY_ATTRIBUTES))
@@ -1,6 +1,631 @@
 import re
 import math
+from functools import lru_cache
+import warnings
 import numpy as np
+
+__all__ = ["SparseMatrix" , "CompiledNetwork" , "Compound" , "CompoundRegistry" , "Reaction" , "Enviroment"]
+
+def _mass_action_jacobian(concentrations, rate_dependencies, stoichiometric_coefficient, rate_constants, eps=1e-300):
+    """
+    Evaluate the analytic Jacobian d(dc/dt)/dc of a mass-action network.
+
+    The derivative of `k * prod_i c_i^a_i` with respect to `c_j` is computed as
+    `k * a_j * c_j^(a_j - 1) * prod_{i != j} c_i^a_i`, so depleted species give exact
+    (finite) entries instead of the `rate / c_j` form that diverges at zero.
+
+    Args:
+        concentrations (numpy.ndarray): Concentrations of shape `(n_compounds,)` or a batch
+            of shape `(n_states, n_compounds)`.
+        rate_dependencies (numpy.ndarray): Rate orders of shape `(n_reactions, 2, n_compounds)`.
+        stoichiometric_coefficient (numpy.ndarray): Stoichiometric matrix of shape `(n_reactions, n_compounds)`.
+        rate_constants (numpy.ndarray): `[kf, kb]` rows of shape `(n_reactions, 2)`, or
+            `(n_states, n_reactions, 2)` with one set per state of the batch.
+        eps (float, optional): Offset that keeps the logarithm finite at zero concentration.
+
+    Returns:
+        numpy.ndarray: Jacobian of shape `(n_compounds, n_compounds)`, or
+        `(n_states, n_compounds, n_compounds)` for a batch.
+    """
+    c = np.maximum(np.asarray(concentrations, dtype=float), 0)
+    log_c = np.log(c + eps)
+    rate_derivative = np.zeros(c.shape[:-1] + stoichiometric_coefficient.shape)
+    for direction, sign in ((0, -1.0), (1, 1.0)):
+        orders = rate_dependencies[:, direction, :].astype(float)
+        log_prod = log_c @ orders.T
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            partial = (orders * np.exp(log_prod[..., :, None] - orders * log_c[..., None, :])
+                       * np.power(c[..., None, :], orders - 1))
+        partial = np.where(orders != 0, partial, 0)
+        rate_derivative = rate_derivative + sign * rate_constants[..., direction][..., None] * partial
+    return stoichiometric_coefficient.T @ rate_derivative
+
+def _sparse_mass_action_jacobian(concentrations, rate_dependencies, stoichiometric_coefficient, rate_constants, eps=1e-300):
+    """
+    Sparse counterpart of `_mass_action_jacobian` for a single concentration vector.
+
+    Only the non-zero rate orders are visited, so the cost scales with the number of
+    species entries of the network instead of `n_reactions * n_compounds`.
+
+    Args:
+        concentrations (numpy.ndarray): Concentration vector of shape `(n_compounds,)`.
+        rate_dependencies (list[SparseMatrix]): Forward and backward rate orders, each `(n_reactions, n_compounds)`.
+        stoichiometric_coefficient (SparseMatrix): Stoichiometric matrix of shape `(n_reactions, n_compounds)`.
+        rate_constants (numpy.ndarray): `[kf, kb]` rows of shape `(n_reactions, 2)`.
+        eps (float, optional): Offset that keeps the logarithm finite at zero concentration.
+
+    Returns:
+        scipy.sparse.csr_matrix: Jacobian of shape `(n_compounds, n_compounds)`.
+
+    Raises:
+        ImportError: If SciPy is not installed.
+    """
+    try:
+        from scipy import sparse
+    except ImportError:
+        raise ImportError("Sparse Jacobians require SciPy; install it or use sparse=False")
+    c = np.maximum(np.asarray(concentrations, dtype=float), 0)
+    log_c = np.log(c + eps)
+    rows, columns, values = [], [], []
+    for direction, sign in ((0, -1.0), (1, 1.0)):
+        orders = rate_dependencies[direction]
+        log_prod = orders @ log_c
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            partial = (orders.data * np.exp(log_prod[orders.rows] - orders.data * log_c[orders.indices])
+                       * np.power(c[orders.indices], orders.data - 1))
+        rows.append(orders.rows)
+        columns.append(orders.indices)
+        values.append(sign * rate_constants[orders.rows, direction] * partial)
+    rate_derivative = sparse.csr_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(columns))),
+                                        shape=stoichiometric_coefficient.shape)
+    transposed_stoichiometry = stoichiometric_coefficient.T
+    transposed_stoichiometry = sparse.csr_matrix((transposed_stoichiometry.data,
+                                                  transposed_stoichiometry.indices,
+                                                  transposed_stoichiometry.indptr),
+                                                 shape=transposed_stoichiometry.shape)
+    return (transposed_stoichiometry @ rate_derivative).tocsr()
+
+def _compile_rate_of_change(rate_dependencies, stoichiometric_coefficient, rate_constants):
+    """
+    Generate a straight-line Python function evaluating dc/dt of a mass-action network.
+
+    Rate constants, orders and stoichiometry are written into the source as literals,
+    so one call is a single fused pass: the clamped concentrations are unpacked once,
+    every net reaction rate `rb - rf` is a product of powers (integer orders become
+    repeated multiplications), and each compound's rate of change sums only the
+    reactions it takes part in. No logarithms, exponentials, matrix products or
+    intermediate arrays are involved, which makes it much cheaper than the NumPy
+    kernels for small and medium networks.
+
+    Args:
+        rate_dependencies (numpy.ndarray): Rate orders of shape `(n_reactions, 2, n_compounds)`.
+        stoichiometric_coefficient (numpy.ndarray): Stoichiometric matrix of shape `(n_reactions, n_compounds)`.
+        rate_constants (numpy.ndarray): `[kf, kb]` rows of shape `(n_reactions, 2)`.
+
+    Returns:
+        function: `rate_of_change(c)` taking a concentration vector `(n_compounds,)` or a batch
+        `(n_states, n_compounds)` and returning an array of the same shape. The generated
+        code is kept in its `source` attribute.
+    """
+    n_reactions, n_compounds = stoichiometric_coefficient.shape
+
+    def rate_law(orders):
+        factors = []
+        for j in np.flatnonzero(orders):
+            order = float(orders[j])
+            if order.is_integer() and 0 < order <= 4:
+                factors.extend([f"c{j}"] * int(order))
+            elif order > 0:
+                factors.append(f"c{j} ** {order!r}")
+            else:
+                # NumPy power, so a depleted species gives inf like the NumPy kernels instead of OverflowError
+                factors.append(f"_np.power(c{j} + 1e-300, {order!r})")
+        return " * ".join(factors) if factors else "1.0"
+
+    if n_compounds == 0:
+        # An empty environment has nothing to unpack; its rate of change is always zero.
+        lines = ["def rate_of_change(c):", "    return _np.zeros(_np.shape(c))"]
+        return _exec_rate_of_change(lines)
+    lines = ["def rate_of_change(c):",
+             "    c = _np.maximum(c, 0.0)",
+             "    " + "".join(f"c{j}, " for j in range(n_compounds)) + "= c.T if c.ndim > 1 else c.tolist()"]
+    active = []
+    for i in range(n_reactions):
+        terms = []
+        kf, kb = float(rate_constants[i][0]), float(rate_constants[i][1])
+        if kb != 0:
+            terms.append(f"{kb!r} * {rate_law(rate_dependencies[i][1])}")
+        if kf != 0:
+            terms.append(f"- {kf!r} * {rate_law(rate_dependencies[i][0])}")
+        if terms:
+            lines.append(f"    r{i} = " + " ".join(terms))
+            active.append(i)
+    derivatives = []
+    for j in range(n_compounds):
+        terms = []
+        for i in active:
+            coefficient = float(stoichiometric_coefficient[i][j])
+            if coefficient == 1:
+                terms.append(f"+ r{i}")
+            elif coefficient == -1:
+                terms.append(f"- r{i}")
+            elif coefficient != 0:
+                terms.append(f"+ {coefficient!r} * r{i}")
+        derivatives.append(" ".join(terms).lstrip("+ ") if terms else "0.0 * c0")
+    lines.append("    d = (" + "".join(f"{derivative}, " for derivative in derivatives) + ")")
+    lines.append("    return _np.array(d) if c.ndim == 1 else _np.stack(_np.broadcast_arrays(*d), axis=-1)")
+    return _exec_rate_of_change(lines)
+
+def _exec_rate_of_change(lines):
+    """Compile the generated source `lines` of `_compile_rate_of_change` into a function."""
+    source = "\n".join(lines) + "\n"
+    namespace = {"_np": np}
+    exec(compile(source, "<compiled rate_of_change>", "exec"), namespace)
+    rate_of_change = namespace["rate_of_change"]
+    rate_of_change.source = source
+    return rate_of_change
+
+# Networks with at most this many reactions are integrated with the generated
+# kernel of `_compile_rate_of_change`; larger ones are faster as NumPy matrix products.
+_COMPILED_MAX_REACTIONS = 64
+
+def _resolve_backend(backend):
+    """
+    Validate a calculator `backend` and return the one that will actually run.
+
+    `"numba"` needs the optional `numba` package; without it a `RuntimeWarning` is
+    issued and the NumPy backend is used instead.
+
+    Raises:
+        ValueError: If `backend` is not one of ["numpy", "numba"].
+    """
+    if not backend in ["numpy" , "numba"]:
+        raise ValueError("`backend` is not one of ['numpy', 'numba'].")
+    if backend == "numba":
+        try:
+            import numba
+        except ImportError:
+            warnings.warn("numba is not installed; falling back to the NumPy backend.", RuntimeWarning, stacklevel=3)
+            return "numpy"
+    return backend
+
+def _read_only(values):
+    """Return `values` as a float array that cannot be written to."""
+    array = np.array(values , dtype=float)
+    array.setflags(write=False)
+    return array
+
+def _indexed_items(values , length , names , key):
+    """
+    Yield `(index, value)` pairs from a full sequence or a `{index or name: value}` mapping.
+
+    `names` maps names (e.g. compound formulas) to indices; integer keys are used as is.
+
+    Raises:
+        ValueError: If a key is unknown or out of range, or a sequence is not `length` long.
+    """
+    if isinstance(values , dict):
+        for name , value in values.items():
+            index = names.get(name , name)
+            if not isinstance(index , (int , np.integer)) or not 0 <= index < length:
+                raise ValueError(f"`{key}` refers to unknown entry {name!r}.")
+            yield index , value
+    else:
+        if len(values) != length:
+            raise ValueError(f"`{key}` should have {length} values, got {len(values)}.")
+        yield from enumerate(values)
+
+def _per_reaction(value , length , key):
+    """
+    Broadcast a scalar to `length` floats, or check that a sequence has `length` values.
+
+    Raises:
+        ValueError: If a sequence is not `length` long.
+    """
+    if np.ndim(value) == 0:
+        return [value] * length
+    values = np.asarray(value , dtype=float).tolist()
+    if len(values) != length:
+        raise ValueError(f"`{key}` should have {length} values, got {len(values)}.")
+    return values
+
+def _compound_index(compounds):
+    """Map each compound's formula and unicode formula to its index (first occurrence wins)."""
+    index = {}
+    for position , compound in enumerate(compounds):
+        index.setdefault(compound.formula , position)
+        index.setdefault(compound.unicode_formula , position)
+    return index
+
+# Per-reaction parameters accepted by `Enviroment.from_strings`, in the order `Reaction` takes them
+_REACTION_PARAMETERS = ["K" , "enthalpy" , "entropy" , "kf" , "kb" , "activation_energy_forward" , "activation_energy_backward"]
+
+# Networks with at least this many (reaction, compound) cells and at most this
+# fraction of non-zero entries are integrated with the sparse kernels.
+_SPARSE_MIN_ENTRIES = 50_000
+_SPARSE_MAX_DENSITY = 0.05
+
+class SparseMatrix:
+    """
+    Minimal compressed-sparse-row (CSR) matrix used for large reaction networks.
+
+    Only the operations the calculators need are provided, and they mirror the
+    NumPy spelling so dense and sparse code paths read the same: `A @ x` for a
+    vector or a dense matrix, `A.T`, `A[i]` (a dense row) and `-A`. All products
+    run in O(nnz) with `numpy.bincount`, so SciPy is not required.
+
+    Attributes:
+        data (numpy.ndarray): Non-zero values, row by row.
+        indices (numpy.ndarray): Column index of every value in `data`.
+        indptr (numpy.ndarray): Row `i` occupies `data[indptr[i]:indptr[i + 1]]`.
+        rows (numpy.ndarray): Row index of every value in `data` (COO view of the same entries).
+        shape (tuple[int, int]): Matrix dimensions.
+    """
+    def __init__(self , data , indices , indptr , shape):
+        """
+        Initialize a CSR matrix from its three arrays.
+
+        Args:
+            data (array-like): Non-zero values, row by row.
+            indices (array-like): Column index of every value.
+            indptr (array-like): Row offsets of length `shape[0] + 1`.
+            shape (tuple[int, int]): Matrix dimensions.
+        """
+        self.data = np.asarray(data , dtype=float)
+        self.indices = np.asarray(indices , dtype=np.intp)
+        self.indptr = np.asarray(indptr , dtype=np.intp)
+        self.shape = (int(shape[0]) , int(shape[1]))
+        self.rows = np.repeat(np.arange(self.shape[0]) , np.diff(self.indptr))
+        self._transpose = None
+
+    @classmethod
+    def from_rows(cls , rows , n_columns):
+        """
+        Build a matrix from one `{column: value}` dictionary per row. Zero values are dropped.
+
+        Args:
+            rows (list[dict[int, float]]): Entries of each row.
+            n_columns (int): Number of columns.
+
+        Returns:
+            SparseMatrix: The assembled matrix.
+        """
+        data , indices , indptr = [] , [] , [0]
+        for row in rows:
+            for column in sorted(row):
+                if row[column] != 0:
+                    indices.append(column)
+                    data.append(row[column])
+            indptr.append(len(data))
+        return cls(data , indices , indptr , (len(rows) , n_columns))
+
+    @classmethod
+    def from_dense(cls , array):
+        """
+        Build a matrix from a dense 2D array.
+
+        Args:
+            array (array-like): Dense matrix.
+
+        Returns:
+            SparseMatrix: The matrix holding the non-zero entries of `array`.
+        """
+        array = np.asarray(array , dtype=float)
+        rows , columns = np.nonzero(array)
+        indptr = np.concatenate(([0] , np.cumsum(np.bincount(rows , minlength=array.shape[0]))))
+        return cls(array[rows , columns] , columns , indptr , array.shape)
+
+    @property
+    def nnz(self):
+        """int: Number of stored entries."""
+        return len(self.data)
+
+    @property
+    def T(self):
+        """SparseMatrix: The transposed matrix (built once and cached)."""
+        if self._transpose is None:
+            order = np.argsort(self.indices , kind="stable")
+            indptr = np.concatenate(([0] , np.cumsum(np.bincount(self.indices , minlength=self.shape[1]))))
+            self._transpose = SparseMatrix(self.data[order] , self.rows[order] , indptr , (self.shape[1] , self.shape[0]))
+            self._transpose._transpose = self
+        return self._transpose
+
+    def copy(self):
+        """
+        Return an independent, writable copy of the matrix.
+
+        Returns:
+            SparseMatrix: A matrix with the same entries and freshly allocated arrays.
+        """
+        return SparseMatrix(self.data.copy() , self.indices.copy() , self.indptr.copy() , self.shape)
+
+    def toarray(self):
+        """
+        Convert to a dense array.
+
+        Returns:
+            numpy.ndarray: Dense matrix of shape `self.shape`.
+        """
+        array = np.zeros(self.shape)
+        np.add.at(array , (self.rows , self.indices) , self.data)
+        return array
+
+    def __getitem__(self , index):
+        """Return row `index` as a dense 1D array, like `ndarray[index]`."""
+        row = np.zeros(self.shape[1])
+        start , end = self.indptr[index] , self.indptr[index + 1]
+        row[self.indices[start:end]] = self.data[start:end]
+        return row
+
+    def __neg__(self):
+        """Return the matrix with every entry negated."""
+        return SparseMatrix(-self.data , self.indices , self.indptr , self.shape)
+
+    def __matmul__(self , other):
+        """
+        Multiply by a dense vector or matrix.
+
+        Args:
+            other (numpy.ndarray): Array of shape `(n_columns,)` or `(n_columns, k)`.
+
+        Returns:
+            numpy.ndarray: Product of shape `(n_rows,)` or `(n_rows, k)`.
+        """
+        other = np.asarray(other)
+        if other.ndim == 1:
+            return np.bincount(self.rows , weights=self.data * other[self.indices] , minlength=self.shape[0])
+        output = np.zeros((self.shape[0] ,) + other.shape[1:])
+        np.add.at(output , self.rows , self.data[: , None] * other[self.indices])
+        return output
+
+    def __repr__(self):
+        return f"SparseMatrix(shape={self.shape}, nnz={self.nnz})"
+
+class CompiledNetwork:
+    """
+    Immutable snapshot of the reaction network of an `Enviroment`.
+
+    `Enviroment.compiled` builds it once and the environment's array properties read
+    from it, so the compound positions are resolved through a dictionary a single
+    time instead of a list search per species entry. The dense and sparse matrices
+    are assembled from the same per-reaction rows the first time they are requested.
+    Every array is read-only.
+
+    Attributes:
+        compound_index (dict[Compound, int]): Position of each compound in `Enviroment.compounds`.
+        reaction_by_index (tuple): `(reactant_indices, product_indices)` of each reaction.
+        shape (tuple[int, int]): `(n_reactions, n_compounds)`.
+        nnz (int): Number of species entries over all reactions.
+        kf (numpy.ndarray): Forward rate constants.
+        kb (numpy.ndarray): Backward rate constants.
+        K (numpy.ndarray): Equilibrium constants.
+    """
+    def __init__(self , reactions , compounds):
+        """
+        Compile the network of `reactions` over `compounds`.
+
+        Args:
+            reactions (list[Reaction]): Reactions of the environment.
+            compounds (list[Compound]): Compounds of the environment, in column order.
+        """
+        self._compile(reactions , compounds , ((), (), (), ()))
+
+    def _compile(self , reactions , compounds , compiled):
+        # `compiled` holds the reaction indices and the three row tuples of the leading
+        # reactions that are already compiled; only the remaining reactions are read.
+        compound_index = {}
+        for index , compound in enumerate(compounds):
+            compound_index.setdefault(compound , index)
+        reaction_by_index , stoichiometry , forward , backward = (list(part) for part in compiled)
+        for rxn in reactions[len(reaction_by_index):]:
+            reactants_index = tuple(compound_index[reactant["compound"]] for reactant in rxn.reactants)
+            products_index = tuple(compound_index[product["compound"]] for product in rxn.products)
+            row = {}
+            for index , reactant in zip(reactants_index , rxn.reactants):
+                row[index] = row.get(index , 0) + reactant["stoichiometric_coefficient"]
+            for index , product in zip(products_index , rxn.products):
+                row[index] = row.get(index , 0) - product["stoichiometric_coefficient"]
+            reaction_by_index.append((reactants_index , products_index))
+            stoichiometry.append(row)
+            forward.append({index : reactant["rate_dependency"] for index , reactant in zip(reactants_index , rxn.reactants)})
+            backward.append({index : product["rate_dependency"] for index , product in zip(products_index , rxn.products)})
+        self.__dict__.update({
+            "compound_index": compound_index ,
+            "reaction_by_index": tuple(reaction_by_index) ,
+            "shape": (len(reaction_by_index) , len(compounds)) ,
+            "nnz": sum(len(reactants) + len(products) for reactants , products in reaction_by_index) ,
+            "_rows": (tuple(stoichiometry) , tuple(forward) , tuple(backward)) ,
+            # The compiled reactions themselves, so edits to `Enviroment.reactions` are detected by identity
+            "_reactions": tuple(reactions) ,
+            "_matrices": {} ,
+        })
+        self._set_constants(reactions)
+
+    def __setattr__(self , name , value):
+        raise AttributeError(f"{type(self).__name__} is immutable; it is rebuilt when the environment changes.")
+
+    def compiled_from(self , reactions):
+        """
+        Check whether the snapshot was compiled from `reactions`, or from a leading part of them.
+
+        Args:
+            reactions (list[Reaction]): Reactions of the environment.
+
+        Returns:
+            bool: True if the compiled reactions are, object for object, the first reactions of
+            `reactions`; appended reactions can then be compiled with `with_reactions`.
+        """
+        compiled = self._reactions
+        return len(compiled) <= len(reactions) and all(old is new for old , new in zip(compiled , reactions))
+
+    def with_reactions(self , reactions , compounds):
+        """
+        Return the snapshot extended by reactions appended after the compiled ones.
+
+        Only the new reactions are compiled; the rows of the existing ones are reused.
+        Matrices are reassembled on first use, since their shape changes.
+
+        Args:
+            reactions (list[Reaction]): The compiled reactions followed by the new ones.
+            compounds (list[Compound]): All compounds, the compiled ones first.
+
+        Returns:
+            CompiledNetwork: Snapshot of the extended network.
+        """
+        network = object.__new__(CompiledNetwork)
+        network._compile(reactions , compounds , (self.reaction_by_index ,) + self._rows)
+        return network
+
+    def _set_constants(self , reactions):
+        constants = [(rxn.kf , rxn.kb , rxn.K) for rxn in reactions]
+        kf , kb , K = (_read_only(values) for values in zip(*constants)) if constants else (_read_only([]) ,) * 3
+        rate_constants = np.column_stack((kf , kb)) if constants else np.empty((0 , 2))
+        rate_constants.setflags(write=False)
+        self.__dict__.update({"kf": kf , "kb": kb , "K": K , "rate_constants": rate_constants , "_constants": constants})
+
+    def with_constants(self , reactions):
+        """
+        Return the snapshot with the rate and equilibrium constants of `reactions`.
+
+        The network structure (and every matrix already built) is shared; if the
+        constants haven't changed, `self` is returned.
+
+        Args:
+            reactions (list[Reaction]): The same reactions the snapshot was compiled from.
+
+        Returns:
+            CompiledNetwork: A snapshot with up-to-date `kf`, `kb` and `K`.
+        """
+        if [(rxn.kf , rxn.kb , rxn.K) for rxn in reactions] == self._constants:
+            return self
+        network = object.__new__(CompiledNetwork)
+        network.__dict__.update(self.__dict__)
+        network._set_constants(reactions)
+        return network
+
+    def _dense(self , rows):
+        dtype = np.asarray([value for row in rows for value in row.values()]).dtype if self.nnz else int
+        array = np.zeros((len(rows) , self.shape[1]) , dtype=dtype)
+        for reaction , row in enumerate(rows):
+            for index , value in row.items():
+                array[reaction , index] = value
+        return array
+
+    def _matrix(self , name , build):
+        if name not in self._matrices:
+            self._matrices[name] = build()
+        return self._matrices[name]
+
+    @property
+    def stoichiometric_coefficient_array(self):
+        """numpy.ndarray: Dense `(n_reactions, n_compounds)` stoichiometry (see `Enviroment.stoichiometric_coefficient_array`)."""
+        def build():
+            array = self._dense(self._rows[0])
+            array.setflags(write=False)
+            return array
+        return self._matrix("stoichiometry" , build)
+
+    @property
+    def rate_dependency_array(self):
+        """numpy.ndarray: Dense `(n_reactions, 2, n_compounds)` rate orders (see `Enviroment.rate_dependency_array`)."""
+        def build():
+            array = np.stack((self._dense(self._rows[1]) , self._dense(self._rows[2])) , axis=1)
+            array.setflags(write=False)
+            return array
+        return self._matrix("rate_dependency" , build)
+
+    def _sparse(self , rows):
+        matrix = SparseMatrix.from_rows(rows , self.shape[1])
+        for array in (matrix.data , matrix.indices , matrix.indptr , matrix.rows):
+            array.setflags(write=False)
+        return matrix
+
+    @property
+    def sparse_stoichiometric_coefficient_array(self):
+        """SparseMatrix: CSR version of `stoichiometric_coefficient_array`."""
+        return self._matrix("sparse_stoichiometry" , lambda: self._sparse(self._rows[0]))
+
+    @property
+    def sparse_rate_dependency_array(self):
+        """list[SparseMatrix]: CSR `[forward, backward]` rate orders."""
+        return list(self._matrix("sparse_rate_dependency" , lambda: (self._sparse(self._rows[1]) , self._sparse(self._rows[2]))))
+
+    def __repr__(self):
+        return f"CompiledNetwork(shape={self.shape}, nnz={self.nnz})"
+
+_SUPERSCRIPT_CHARACTERS = ["\u2070" ,"\u00b9" ,"\u00b2" ,"\u00b3" ,"\u2074"
+                           ,"\u2075" ,"\u2076" ,"\u2077" ,"\u2078" ,"\u2079"
+                           ,"\u207a" , "\u207b"]
+_SUBSCRIPT_CHARACTERS = ["\u2080" , "\u2081", "\u2082", "\u2083", "\u2084"
+                         , "\u2085", "\u2086", "\u2087", "\u2088", "\u2089" ]
+
+# Number of distinct reaction strings (and formulas) whose parse results are kept
+_PARSE_CACHE_SIZE = 4096
+
+def _unicode_digits(text , characters):
+    return "".join(characters[int(char)] if char.isdigit() else char for char in text)
+
+@lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _unicode_formula(formula):
+    """Convert a formula to Unicode: digits become subscripts, and a +/- charge and its digits superscripts."""
+    if "+" in formula or "-" in formula:
+        sign = "+" if "+" in formula else "-"
+        splitted_formula = formula.split(sign)
+        charge = _SUPERSCRIPT_CHARACTERS[10 if sign == "+" else 11]
+        return (_unicode_digits(splitted_formula[0] , _SUBSCRIPT_CHARACTERS) + charge +
+                _unicode_digits(splitted_formula[1] , _SUPERSCRIPT_CHARACTERS))
+    return _unicode_digits(formula , _SUBSCRIPT_CHARACTERS)
+
+# One species of the simple syntax: [coefficient]name[.phase][rate order], e.g. "2A.g-1"
+_SIMPLE_SPECIES = re.compile(r'(?P<coefficient>\d+(?:\.\d+)?)?(?P<name>[A-Za-z]+(?:\.[A-Za-z]+)?)(?P<order>-?\d+(?:\.\d+)?)?')
+# One species of the complex syntax: [coefficient_]name[_rate order][.s|.g|.l], e.g. "2_Fe(CN)6-3_1"
+_COMPLEX_SPECIES = re.compile(r'(?:(?P<coefficient>\d+(?:\.\d+)?)_)?(?P<name>[A-Za-z0-9+.\-()]+)'
+                              r'(?:_(?P<order>-?\d+(?:\.\d+)?))?(?P<phase>\.[sgl])?')
+# Separator between the species of one side, and the species pattern, of each syntax
+_SYNTAXES = {"simple" : ("+" , _SIMPLE_SPECIES) , "complex" : ("&" , _COMPLEX_SPECIES)}
+
+@lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _parse_reaction(reaction_str , syntax):
+    """
+    Tokenize a reaction string in one pass over its species.
+
+    Whitespace is ignored. Results are cached on `(reaction_str, syntax)`; they are
+    made of tuples only, so callers can share them.
+
+    Args:
+        reaction_str (str): Reaction formula, e.g. "A + 2B > C".
+        syntax (str): "simple" or "complex".
+
+    Returns:
+        tuple: `(reactants, products)`, each a tuple of
+            `(stoichiometric_coefficient, species_name, rate_dependency)`.
+
+    Raises:
+        ValueError: If a species doesn't match the syntax.
+    """
+    separator , pattern = _SYNTAXES[syntax]
+    sides = []
+    for component in "".join(reaction_str.split()).split(">"):
+        species = []
+        for section in component.split(separator):
+            match = pattern.fullmatch(section)
+            if match is None:
+                raise ValueError("You can't make a reaction from string with this expression")
+            coefficient , name , order = match.group("coefficient" , "name" , "order")
+            if syntax == "complex" and match["phase"]:
+                name += match["phase"]
+            species.append((float(coefficient) if coefficient else 1 , name , float(order) if order else 1))
+        sides.append(tuple(species))
+    return sides[0] , (sides[1] if len(sides) > 1 else ())
+
+_PHASES = ["g" , "l" , "s" , "aq"]
+
+def _checked_phase_point(phase_point):
+    """Return `phase_point` if its phase is one of s / l / g / aq, else raise ValueError."""
+    if phase_point["phase"] not in _PHASES:
+        raise ValueError("The acceptable inputs for phase are s / l / g / aq")
+    return phase_point
+
 class Compound: 
     """
     Represents a chemical compound with formula, physical properties, and optional superscript/subscript formatting.
@@ -29,61 +654,12 @@ class Compound:
         Raises:
             ValueError: If a phase in `phase_point_list` is not one of {"s", "l", "g", "aq"}.
         """
-        superscript_characters=["\u2070" ,"\u00b9" ,"\u00b2" ,"\u00b3" ,"\u2074" 
-                                ,"\u2075" ,"\u2076" ,"\u2077" ,"\u2078" ,"\u2079" 
-                                ,"\u207a" , "\u207b"]
-        subscript_characters = ["\u2080" , "\u2081", "\u2082", "\u2083", "\u2084"
-                                , "\u2085", "\u2086", "\u2087", "\u2088", "\u2089" ]
-        phases = ["g" , "l" , "s" , "aq"]
-
         self.formula = formula
-        if scription:
-            def formula_to_unicode_formula(formula):
-                """Convert a normal formula string to Unicode format with subscripts/superscripts."""
-                unicode_formula = ""
-                if "+" in formula :
-                    splitted_formula = formula.split("+")
-                    for char in splitted_formula[0]:
-                        if char.isdigit():
-                            unicode_formula += subscript_characters[int(char)]
-                        else:
-                            unicode_formula += char
-                    unicode_formula += superscript_characters[10]
-                    for char in splitted_formula[1]:
-                        if char.isdigit():
-                            unicode_formula += superscript_characters[int(char)]
-                        else:
-                            unicode_formula += char
-                elif "-" in formula :
-                    splitted_formula = formula.split("-")
-                    for char in splitted_formula[0]:
-                        if char.isdigit():
-                            unicode_formula += subscript_characters[int(char)]
-                        else:
-                            unicode_formula += char
-                    unicode_formula += superscript_characters[11]
-                    for char in splitted_formula[1]:
-                        if char.isdigit():
-                            unicode_formula += superscript_characters[int(char)]
-                        else:
-                            unicode_formula += char
-                else:
-                    for char in formula:
-                        if char.isdigit():
-                            unicode_formula += subscript_characters[int(char)]
-                        else:
-                            unicode_formula += char
-                return unicode_formula
-            self.unicode_formula = formula_to_unicode_formula(formula)
-        else:
-            self.unicode_formula = formula
+        self.unicode_formula = _unicode_formula(formula) if scription else formula
         self.phase_point_list = []
         if phase_point_list != None:
             for phase_point in phase_point_list : 
-                if phase_point["phase"] in phases:
-                    self.phase_point_list.append(phase_point)
-                else:
-                    raise ValueError("The acceptable inputs for phase are s / l / g / aq")
+                self.phase_point_list.append(_checked_phase_point(phase_point))
         self.mp = mp
         self.bp = bp
 
@@ -123,9 +699,93 @@ class Compound:
         """Return the Unicode representation of the compound."""
         return self.unicode_formula
     def __eq__(self, value):
-        """Compare compounds based on their Unicode formulas."""
+        """Compare compounds based on their Unicode formulas (interned compounds by identity)."""
+        if value is self:
+            return True
+        if not isinstance(value , Compound):
+            return NotImplemented
         return self.unicode_formula == value.unicode_formula 
+    def __hash__(self):
+        """Hash the Unicode formula, consistently with `__eq__`, so compounds can be dictionary keys."""
+        return hash(self.unicode_formula)
         
+class CompoundRegistry:
+    """
+    Opt-in registry that interns compounds, keeping one shared `Compound` per species.
+
+    Pass a registry to the string constructors (`Reaction.from_string_simple_syntax`,
+    `Reaction.from_string_complex_syntax`, `Enviroment.from_strings`, `Enviroment.from_table`)
+    and every occurrence of a species resolves to the same object. Equality checks then
+    succeed on identity, the formula strings and phase data are stored once, and phase
+    points from later occurrences are attached to the existing compound.
+
+    Compounds are keyed by their Unicode formula, the same key `Compound.__eq__` uses.
+
+    Example:
+        >>> registry = CompoundRegistry()
+        >>> r1 = Reaction.from_string_simple_syntax("A + B > C", registry=registry)
+        >>> r2 = Reaction.from_string_simple_syntax("C > A.g", registry=registry)
+        >>> r1.products[0]["compound"] is r2.reactants[0]["compound"]
+        True
+        >>> len(registry)
+        3
+    """
+    def __init__(self):
+        self._compounds = {}
+
+    def get(self , formula , phase_point_list=None , mp=None , bp=None , scription=True):
+        """
+        Return the interned compound for `formula`, creating it on first use.
+
+        For a compound that already exists, phase points at temperatures it has no
+        phase for yet are appended, and `mp` / `bp` are set if they were missing. A
+        different phase at a temperature that already has one is rejected, and the
+        compound is then left unchanged.
+
+        Args:
+            formula, phase_point_list, mp, bp, scription: As in `Compound`.
+
+        Returns:
+            Compound: The shared compound.
+
+        Raises:
+            ValueError: If a phase in `phase_point_list` is not one of {"s", "l", "g", "aq"}, or
+                conflicts with the phase the interned compound already has at that temperature.
+        """
+        key = _unicode_formula(formula) if scription else formula
+        compound = self._compounds.get(key)
+        if compound is None:
+            return self._compounds.setdefault(key , Compound(formula , phase_point_list , mp , bp , scription))
+        if phase_point_list:
+            phases = {phase_point["temperature"] : phase_point["phase"] for phase_point in compound.phase_point_list}
+            new_phase_points = []
+            for phase_point in phase_point_list:
+                temperature , phase = phase_point["temperature"] , _checked_phase_point(phase_point)["phase"]
+                if temperature not in phases:
+                    phases[temperature] = phase
+                    new_phase_points.append(phase_point)
+                elif phases[temperature] != phase:
+                    raise ValueError(f"{key} is already registered as phase {phases[temperature]!r} at {temperature} K, not {phase!r}.")
+            compound.phase_point_list.extend(new_phase_points)
+        if compound.mp is None:
+            compound.mp = mp
+        if compound.bp is None:
+            compound.bp = bp
+        return compound
+
+    def __contains__(self , compound):
+        """Check whether a compound (or a formula) has been interned."""
+        key = compound.unicode_formula if isinstance(compound , Compound) else _unicode_formula(compound)
+        return key in self._compounds
+
+    def __iter__(self):
+        """Iterate over the interned compounds in the order they were created."""
+        return iter(list(self._compounds.values()))
+
+    def __len__(self):
+        """Get the number of interned compounds."""
+        return len(self._compounds)
+
 class Reaction:
     """
     Represents a reversible chemical reaction with kinetic and equilibrium parameters.
@@ -218,6 +878,48 @@ class Reaction:
             product.update({"type" : "product"})
             self.compounds.append(product)
             counter += 1
+    @staticmethod
+    def _species_compound(species , T , registry=None):
+        """
+        Create the `Compound` of a parsed species name, reading an optional .s/.l/.g/.aq phase suffix.
+
+        Args:
+            species (str): Species name as written in the reaction string.
+            T (float): Temperature at which the suffix phase applies.
+            registry (CompoundRegistry, optional): Registry to intern the compound in.
+
+        Returns:
+            Compound: The species' compound (the interned one if `registry` is given).
+        """
+        if species.endswith((".s" , ".g" , ".l")):
+            formula , phase_point_list = species[:-2] , [{"temperature" : T , "phase" : species[-1]}]
+        elif species.endswith(".aq"):
+            formula , phase_point_list = species[:-3] , [{"temperature" : T , "phase" : "aq"}]
+        else:
+            formula , phase_point_list = species , None
+        if registry is not None:
+            return registry.get(formula , phase_point_list)
+        return Compound(formula=formula , phase_point_list=phase_point_list)
+
+    @staticmethod
+    def _parse(reaction_str , syntax):
+        """
+        Split a reaction string into reactant and product entries.
+
+        Args:
+            reaction_str (str): Reaction formula.
+            syntax (str): "simple" or "complex".
+
+        Returns:
+            tuple[list[dict], list[dict]]: Fresh reactant and product dictionaries whose "compound"
+                is still the species name (see `_species_compound`).
+
+        Raises:
+            ValueError: If the reaction string format is invalid.
+        """
+        return tuple([{"stoichiometric_coefficient" : coefficient , "compound" : name , "rate_dependency" : order}
+                      for coefficient , name , order in side] for side in _parse_reaction(reaction_str , syntax))
+
     @classmethod
     def from_string_complex_syntax(cls, reaction_str: str,
                                    concentrations: list[float] = None,
@@ -228,7 +930,8 @@ class Reaction:
                                    kb: float = 1,
                                    activation_energy_forward: float = 0,
                                    activation_energy_backward: float = 0,
-                                   T: float = 298):
+                                   T: float = 298,
+                                   registry: CompoundRegistry = None):
                                    
         """
         Create a Reaction object from a string with complex syntax.
@@ -257,6 +960,8 @@ class Reaction:
             entropy (float, optional): Entropy of the reaction. Defaults to 0.
             activation_energy_forward (float, optional): Activation energy of the forward reaction. Defaults to 0.
             activation_energy_backward (float, optional): Activation energy of the backward reaction. Defaults to 0.
+            registry (CompoundRegistry, optional): If given, the compounds are interned in it and
+                shared with every other reaction built with the same registry.
 
         Returns:
             Reaction: Parsed Reaction instance.
@@ -265,81 +970,9 @@ class Reaction:
             ValueError: If the reaction string format is invalid.
         """
 
-        reformed_reaction = reaction_str.replace(" ","").split(">")
-        splited_to_component_reaction = [component.split("&") for component in reformed_reaction] 
-        inputed_reactants = []
-        inputed_products = []
-        component_counter = 0
-        for component in splited_to_component_reaction:
-            counter = 0
-            acceptable_pattern_for_section = re.compile(
-                r'^(\d+(?:\.\d+)?_[A-Za-z0-9+.\-()]+_-?\d+(?:\.\d+)?|' 
-                r'\d+(?:\.\d+)?_[A-Za-z0-9+.\-()]+|' 
-                r'[A-Za-z0-9+.\-()]+_-?\d+(?:\.\d+)?|' 
-                r'[A-Za-z0-9+.\-()]+)(\.s|\.g|\.l)?$'
-            )
-            for section in component:
-
-                if not bool(acceptable_pattern_for_section.match(section)):
-                     raise ValueError("You can't make a reaction from string with this expression")
-                
-                splitted_section = section.split("_")
-                lenght = len(splitted_section)
-                if lenght == 3:
-                    compound_info = {
-                    "stoichiometric_coefficient" : float(splitted_section[0]),
-                    "compound" : splitted_section[1],
-                    "rate_dependency" : float(splitted_section[2])
-                    }
-
-                elif lenght == 2:
-                    if re.match(r'^\d+(?:\.\d+)?_[A-Za-z0-9+.\-()]+$' , section) :
-                        compound_info = {
-                            "stoichiometric_coefficient" : float(splitted_section[0]),
-                            "compound" : splitted_section[1],
-                            "rate_dependency" : 1
-                        }
-
-                    elif re.match(r'^[A-Za-z0-9+.\-()]+_\d+(?:\.\d+)?$' , section) :
-                        compound_info = {
-                            "stoichiometric_coefficient" : 1,
-                            "compound" : splitted_section[0],
-                            "rate_dependency" : float(splitted_section[1])
-                        }
-
-                elif lenght == 1:
-                    compound_info = {
-                    "stoichiometric_coefficient" : 1,
-                    "compound" : splitted_section[0],
-                    "rate_dependency" : 1
-                    }
-                if component_counter == 0:
-                    inputed_reactants.append(compound_info)
-                elif component_counter == 1:
-                    inputed_products.append(compound_info)
-            component_counter +=1    
-        counter = 0
-        
-        for section in inputed_reactants :
-            reactant = section["compound"]
-            if re.match(r'^.*\.(s|g|l)$', reactant):  
-                inputed_reactants[counter]["compound"] = Compound(formula=reactant[0:len(reactant)-2] , phase_point_list=[{"temperature" : T , "phase" : reactant[len(reactant)-1]}])
-            elif re.match(r'^.*\.aq$', reactant):
-                inputed_reactants[counter]["compound"] = Compound(formula=reactant[0:len(reactant)-3] , phase_point_list=[{"temperature" : T , "phase" : "aq"}])
-            else:
-                inputed_reactants[counter]["compound"] = Compound(formula=reactant)
-            counter += 1
-        
-        counter = 0
-        for section in inputed_products :
-            product = section["compound"]
-            if re.match(r'^.*\.(s|g|l)$', product):  
-                inputed_products[counter]["compound"] = Compound(formula=product[0:len(product)-2] , phase_point_list=[{"temperature" : T , "phase" : product[len(product)-1]}])
-            elif re.match(r'^.*\.aq$', product):
-                inputed_products[counter]["compound"] = Compound(formula=product[0:len(product)-3] , phase_point_list=[{"temperature" : T , "phase" : "aq"}])
-            else:
-                inputed_products[counter]["compound"] = Compound(formula=product)
-            counter += 1  
+        inputed_reactants , inputed_products = cls._parse(reaction_str , "complex")
+        for section in inputed_reactants + inputed_products :
+            section["compound"] = cls._species_compound(section["compound"] , T , registry)
         if concentrations == None:
             concentrations = [0] * (len(inputed_reactants) + len(inputed_products))
         reactants_concentration = concentrations[:len(inputed_reactants)]
@@ -367,7 +1000,8 @@ class Reaction:
                                   kb: float = 1,
                                   activation_energy_forward: float = 0,
                                   activation_energy_backward: float = 0,
-                                  T: float = 298):
+                                  T: float = 298,
+                                  registry: CompoundRegistry = None):
                                   
                                   
         """
@@ -396,6 +1030,8 @@ class Reaction:
             entropy (float, optional): Entropy of the reaction. Defaults to 0.
             activation_energy_forward (float, optional): Activation energy of the forward reaction. Defaults to 0.
             activation_energy_backward (float, optional): Activation energy of the backward reaction. Defaults to 0.
+            registry (CompoundRegistry, optional): If given, the compounds are interned in it and
+                shared with every other reaction built with the same registry.
 
         Returns:
             Reaction: Parsed Reaction instance.
@@ -403,107 +1039,9 @@ class Reaction:
         Raises:
             ValueError: If the input reaction string does not match valid format.
         """
-        reformed_reaction = reaction_str.replace(" ","").split(">")
-        splited_to_component_reaction = [component.split("+") for component in reformed_reaction] 
-        component_counter = 0
-        inputed_reactants = []
-        inputed_products = []
-        for component in splited_to_component_reaction:
-            counter = 0
-            acceptable_pattern_for_section = re.compile(
-                r'^(?:'
-                r'\d+(?:\.\d+)?[A-Za-z]+(?:\.[A-Za-z]+)?-?\d+(?:\.\d+)?|'  
-                r'\d+(?:\.\d+)?[A-Za-z]+(?:\.[A-Za-z]+)?|'                 
-                r'[A-Za-z]+(?:\.[A-Za-z]+)?-?\d+(?:\.\d+)?|'               
-                r'[A-Za-z]+(?:\.[A-Za-z]+)?'                         
-                r')$'   
-            )
-            for section in component:
-                if not bool(acceptable_pattern_for_section.match(section)):
-                     raise ValueError("You can't make a reaction from string with this expression")
-                else:
-                    start_of_name_index = 0
-                    end_of_name_index = 0
-                    def is_number(str):
-                        try:
-                            float(str) 
-                            return True
-                        except ValueError:
-                            return False
-                    # number + name + number
-                    if re.match(r'^\d+(?:\.\d+)?[A-Za-z]+(?:\.[A-Za-z]+)?-?\d+(?:\.\d+)?$' , section) :
-                        for endpoint in range(len(section)) :
-                            if is_number(section[:endpoint]) and (not is_number(section[:endpoint + 1])) :
-                                start_of_name_index = endpoint 
-                                break
-                        for startpoint in range(start_of_name_index , len(section)):
-                            if is_number(section[startpoint:]) :
-                                end_of_name_index = startpoint 
-                                break
-                        compound_info = {
-                            "stoichiometric_coefficient" : float(section[:start_of_name_index]),
-                            "compound" : section[start_of_name_index:end_of_name_index],
-                            "rate_dependency" : float(section[end_of_name_index:])
-                            }
-                    # number + name
-                    elif re.match(r'^\d+(?:\.\d+)?[A-Za-z]+(?:\.[A-Za-z]+)?$' , section):
-                        end_of_name_index = len(section) 
-                        for endpoint in range(len(section)) :
-                            if is_number(section[:endpoint]) and (not is_number(section[:endpoint + 1])) :
-                                start_of_name_index = endpoint 
-                                break
-                        compound_info = {
-                            "stoichiometric_coefficient" : float(section[:start_of_name_index]),
-                            "compound" : section[start_of_name_index:end_of_name_index],
-                            "rate_dependency" : 1
-                            }
-                    # name + number
-                    elif re.match(r'^[A-Za-z]+(?:\.[A-Za-z]+)*-?\d+(?:\.\d+)?$' , section):
-                        start_of_name_index = 0
-                        for startpoint in range(len(section)):
-                            if is_number(section[startpoint:]) :
-                                end_of_name_index = startpoint 
-                                break
-                        compound_info = {
-                            "stoichiometric_coefficient" : 1,
-                            "compound" : section[start_of_name_index:end_of_name_index],
-                            "rate_dependency" : float(section[end_of_name_index:])
-                            }
-                    # name
-                    else :
-                        compound_info = {
-                            "stoichiometric_coefficient" : 1,
-                            "compound" : section,
-                            "rate_dependency" : 1
-                            }
-                        
-                if component_counter == 0:
-                    inputed_reactants.append(compound_info)
-                elif component_counter == 1:
-                    inputed_products.append(compound_info)
-            component_counter +=1  
-        counter = 0
-        
-        for section in inputed_reactants :
-            reactant = section["compound"]
-            if re.match(r'^.*\.(s|g|l)$', reactant):  
-                inputed_reactants[counter]["compound"] = Compound(formula=reactant[0:len(reactant)-2] , phase_point_list=[{"temperature" : T , "phase" : reactant[len(reactant)-1]}])
-            elif re.match(r'^.*\.aq$', reactant):
-                inputed_reactants[counter]["compound"] = Compound(formula=reactant[0:len(reactant)-3] , phase_point_list=[{"temperature" : T , "phase" : "aq"}])
-            else:
-                inputed_reactants[counter]["compound"] = Compound(formula=reactant)
-            counter += 1
-        counter = 0
-        for section in inputed_products :
-            product = section["compound"]
-            if re.match(r'^.*\.(s|g|l)$', product):  
-                inputed_products[counter]["compound"] = Compound(formula=product[0:len(product)-2] , phase_point_list=[{"temperature" : T , "phase" : product[len(product)-1]}])
-            elif re.match(r'^.*\.aq$', product):
-                inputed_products[counter]["compound"] = Compound(formula=product[0:len(product)-3] , phase_point_list=[{"temperature" : T , "phase" : "aq"}])
-            else:
-                inputed_products[counter]["compound"] = Compound(formula=product)
-            counter += 1  
-
+        inputed_reactants , inputed_products = cls._parse(reaction_str , "simple")
+        for section in inputed_reactants + inputed_products :
+            section["compound"] = cls._species_compound(section["compound"] , T , registry)
         if concentrations == None:
             concentrations = [0] * (len(inputed_reactants) + len(inputed_products))
         reactants_concentration = concentrations[:len(inputed_reactants)]
@@ -711,7 +1249,9 @@ class Enviroment():
             - "compound" (Compound): Compound object.
             - "concentration" (float): Current concentration value.
         compounds (list[Compound]): Unique list of all compounds appearing in any reaction.
+        compound_index (dict[Compound, int]): Position of each compound in `compounds`.
         T (float): System temperature in Kelvin.
+        compiled (CompiledNetwork): Cached index maps, matrices and rate constants of the network.
     """
     def _check_if_reaction(self , reaction):
         """
@@ -748,19 +1288,117 @@ class Enviroment():
                 reaction.T = T
                 self.reactions.append(reaction)
         self._T = T
-        self.compounds = []
-        self.compounds_concentration = []
-        for reaction in reactions:
-            for compound in reaction.compounds:
-                compounds = [i["compound"] for i in self.compounds_concentration]
-                if compound["compound"] in compounds:
-                    index_in_compounds_concentration = compounds.index(compound["compound"])
-                    index_in_reaction = reaction.compounds.index(compound)
-                    self.compounds_concentration[index_in_compounds_concentration]["concentration"] += reaction.compounds[index_in_reaction]["concentration"]
-                else:
-                    index_in_reaction = reaction.compounds.index(compound)
-                    self.compounds_concentration.append({"compound" : compound["compound"] , "concentration" :reaction.compounds[index_in_reaction]["concentration"]})
-                    self.compounds.append(compound["compound"])
+        self._compiled = None
+        self._collect_compounds()
+
+    @classmethod
+    def from_strings(cls , reactions , concentrations = None , K = 1 , kf = 1 , kb = 1 , enthalpy = 0 , entropy = 0 ,
+                     activation_energy_forward = 0 , activation_energy_backward = 0 , T = 298 , syntax = "simple" ,
+                     registry = None):
+        """
+        Build an environment from a list of reaction strings in one pass.
+
+        Each string is parsed with the simple or complex syntax of `Reaction`. Every species
+        name becomes a `Compound` only once, shared by all reactions that use it, and the
+        species table is filled in while the reactions are created, so no per-reaction
+        aggregation happens afterwards.
+
+        Args:
+            reactions (Iterable[str]): Reaction strings, e.g. `["A + B > C", "C > 2D"]`.
+            concentrations (dict | list[float], optional): Initial concentrations, either
+                `{compound: value}` keyed by formula, unicode formula or index, or one value
+                per compound in order of first appearance. Unlisted compounds start at 0, and a
+                shorter list is padded with zeros.
+            K, kf, kb, enthalpy, entropy, activation_energy_forward, activation_energy_backward
+                (float | array-like, optional): One value for every reaction, or one value per
+                reaction. Defaults are those of `Reaction`. As with `Reaction`, the constants are
+                given at 298 K.
+            T (float, optional): Temperature of the environment (K). Default is 298 K. The
+                network is built at 298 K, like `Reaction` objects with their default temperature,
+                and then set to `T` through the `T` property, so K, kf and kb are rescaled with the
+                enthalpy and activation energies exactly as for an environment built reaction by reaction.
+            syntax (str, optional): "simple" (as `Reaction.from_string_simple_syntax`) or
+                "complex" (as `Reaction.from_string_complex_syntax`). Default is "simple".
+            registry (CompoundRegistry, optional): If given, the compounds are interned in it, so
+                they are also shared with other environments built with the same registry.
+
+        Returns:
+            Enviroment: The assembled environment.
+
+        Raises:
+            ValueError: If a reaction string is invalid, `syntax` is unknown, a parameter sequence
+                doesn't have one value per reaction, or `concentrations` refers to an unknown compound.
+
+        Example:
+            >>> env = Enviroment.from_strings(["A + B > C", "C > 2D"], kf=[0.5, 0.2], kb=0.1,
+            ...                               concentrations={"A": 1.0, "B": 2.0})
+            >>> env.concentrations
+            [1.0, 2.0, 0, 0]
+        """
+        if syntax not in _SYNTAXES:
+            raise ValueError(f"Unknown syntax {syntax!r}; expected 'simple' or 'complex'.")
+        reactions = list(reactions)
+        parameters = [_per_reaction(value , len(reactions) , name) for name , value in
+                      zip(_REACTION_PARAMETERS , (K , enthalpy , entropy , kf , kb , activation_energy_forward , activation_energy_backward))]
+        enviroment = cls()
+        species = {}
+        for reaction_str , values in zip(reactions , zip(*parameters)):
+            reactants , products = Reaction._parse(reaction_str , syntax)
+            for section in reactants + products:
+                name = section["compound"]
+                if name not in species:
+                    species[name] = Reaction._species_compound(name , enviroment.T , registry)
+                section["compound"] = species[name]
+            reaction = Reaction(reactants , products , [0] * len(reactants) , [0] * len(products) , *values , enviroment.T)
+            enviroment.reactions.append(reaction)
+            enviroment._register_compounds(reaction)
+        if concentrations is not None:
+            values = enviroment.concentrations
+            if not isinstance(concentrations , dict):
+                concentrations = list(concentrations) + [0] * (len(values) - len(concentrations))
+            for index , value in _indexed_items(concentrations , len(values) , _compound_index(enviroment.compounds) , "concentrations"):
+                values[index] = value
+            enviroment.concentrations = values
+        enviroment.T = T
+        return enviroment
+
+    @classmethod
+    def from_table(cls , table , concentrations = None , T = 298 , syntax = "simple" , registry = None):
+        """
+        Build an environment from column arrays with one row per reaction.
+
+        Args:
+            table (Mapping[str, array-like]): Columns of equal length. "reaction" holds the
+                reaction strings; "K", "kf", "kb", "enthalpy", "entropy",
+                "activation_energy_forward" and "activation_energy_backward" are optional.
+                A dict of lists or NumPy arrays, or a `pandas.DataFrame`, all work.
+            concentrations (dict | list[float], optional): Initial concentrations, as in `from_strings`.
+            T (float, optional): Temperature of the environment (K). Default is 298 K.
+            syntax (str, optional): "simple" or "complex". Default is "simple".
+            registry (CompoundRegistry, optional): Registry to intern the compounds in, as in `from_strings`.
+
+        Returns:
+            Enviroment: The assembled environment.
+
+        Raises:
+            ValueError: If the "reaction" column is missing, a column is unknown or has the wrong
+                length, or any of the errors of `from_strings`.
+
+        Example:
+            >>> table = {"reaction": ["A > B", "B > C"], "kf": np.array([0.5, 0.2]), "kb": np.array([0.1, 0.0])}
+            >>> env = Enviroment.from_table(table, concentrations={"A": 1.0})
+        """
+        columns = {name : table[name] for name in table}
+        if "reaction" not in columns:
+            raise ValueError("The table should have a \"reaction\" column.")
+        unknown = set(columns) - set(_REACTION_PARAMETERS) - {"reaction"}
+        if unknown:
+            raise ValueError(f"Unknown columns {sorted(unknown)}; expected \"reaction\" and some of {_REACTION_PARAMETERS}.")
+        reactions = [str(reaction) for reaction in columns.pop("reaction")]
+        for name , column in columns.items():
+            if np.ndim(column) != 1:
+                raise ValueError(f"The `{name}` column should be one-dimensional.")
+        return cls.from_strings(reactions , concentrations , T=T , syntax=syntax , registry=registry , **columns)
     @property
     def T(self):
         """
@@ -804,20 +1442,35 @@ class Enviroment():
         if self._check_if_reaction(reaction):
             reaction.T = self.T
             self.reactions.append(reaction)
-            self.compounds = []
-            self.compounds_concentration = []
-            for reaction in self.reactions:
-                for compound in reaction.compounds:
-                    compounds = [i["compound"] for i in self.compounds_concentration]
-                    if compound["compound"] in compounds:
-                        index_in_compounds_concentration = compounds.index(compound["compound"])
-                        index_in_reaction = reaction.compounds.index(compound)
-                        self.compounds_concentration[index_in_compounds_concentration]["concentration"] += reaction.compounds[index_in_reaction]["concentration"]
-                    else:
-                        index_in_reaction = reaction.compounds.index(compound)
-                        self.compounds_concentration.append({"compound" : compound["compound"] , "concentration" :reaction.compounds[index_in_reaction]["concentration"]})
-                        self.compounds.append(compound["compound"])
+            self._register_compounds(reaction)
             return self
+    def _register_compounds(self , reaction):
+        """
+        Merge the compounds of `reaction` into `compounds`, `compounds_concentration` and `compound_index`.
+
+        Each compound is looked up in `compound_index`, so registering a reaction costs
+        O(1) per species. Concentrations of compounds already present are added up.
+
+        Args:
+            reaction (Reaction): Reaction whose compounds are registered.
+        """
+        for compound in reaction.compounds:
+            index = self.compound_index.get(compound["compound"])
+            if index is None:
+                self.compound_index[compound["compound"]] = len(self.compounds)
+                self.compounds_concentration.append({"compound" : compound["compound"] , "concentration" : compound["concentration"]})
+                self.compounds.append(compound["compound"])
+            else:
+                self.compounds_concentration[index]["concentration"] += compound["concentration"]
+
+    def _collect_compounds(self):
+        """Rebuild `compounds`, `compounds_concentration` and `compound_index` from all reactions."""
+        self.compounds = []
+        self.compounds_concentration = []
+        self.compound_index = {}
+        for reaction in self.reactions:
+            self._register_compounds(reaction)
+
     def __iter__(self):
         """
         Iterate through all reactions in the environment.
@@ -831,6 +1484,10 @@ class Enviroment():
         """
         Add a new reaction to the environment manually.
 
+        Only the new reaction's compounds are merged into the species table: new
+        compounds are appended and the concentrations it brings are added to the
+        current ones, so concentrations set earlier are kept.
+
         Args:
             reaction (Reaction): The reaction to add.
 
@@ -839,19 +1496,51 @@ class Enviroment():
         """
         if self._check_if_reaction(reaction):
             self.reactions.append(reaction)
-            self.compounds = []
-            self.compounds_concentration = []
-            for reaction in self.reactions:
-                for compound in reaction.compounds:
-                    compounds = [i["compound"] for i in self.compounds_concentration]
-                    if compound["compound"] in compounds:
-                        index_in_compounds_concentration = compounds.index(compound["compound"])
-                        index_in_reaction = reaction.compounds.index(compound)
-                        self.compounds_concentration[index_in_compounds_concentration]["concentration"] += reaction.compounds[index_in_reaction]["concentration"]
-                    else:
-                        index_in_reaction = reaction.compounds.index(compound)
-                        self.compounds_concentration.append({"compound" : compound["compound"] , "concentration" :reaction.compounds[index_in_reaction]["concentration"]})
-                        self.compounds.append(compound["compound"])
+            self._register_compounds(reaction)
+
+    def add_many(self , reactions):
+        """
+        Add several reactions at once, like calling `add` for each of them.
+
+        All reactions are validated first, so nothing is added if one of them is invalid.
+
+        Args:
+            reactions (Iterable[Reaction]): The reactions to add, in order.
+
+        Raises:
+            ValueError: If any item is not a valid Reaction object.
+        """
+        reactions = list(reactions)
+        for reaction in reactions:
+            self._check_if_reaction(reaction)
+        for reaction in reactions:
+            self.reactions.append(reaction)
+            self._register_compounds(reaction)
+    @property
+    def compiled(self):
+        """
+        Get the compiled snapshot of the reaction network.
+
+        The snapshot is built on first access and reused by `reaction_by_index`, the
+        stoichiometry and rate dependency arrays and `rate_constants_array`. Reactions
+        added since (`add`, `add_many` or `+=`) are compiled onto it on the next access.
+        If `reactions` was edited in any other way (a reaction removed, replaced or moved),
+        the network is compiled again from scratch.
+        The rate and equilibrium constants are re-read from the reactions on every
+        access, which is O(n_reactions), so a new temperature or a directly assigned
+        `kf`/`kb` is picked up without recompiling the network.
+
+        Returns:
+            CompiledNetwork: Immutable snapshot of the current network.
+        """
+        if self._compiled is None or not self._compiled.compiled_from(self.reactions):
+            self._compiled = CompiledNetwork(self.reactions , self.compounds)
+        elif self._compiled.shape[0] < len(self.reactions):
+            self._compiled = self._compiled.with_reactions(self.reactions , self.compounds)
+        else:
+            self._compiled = self._compiled.with_constants(self.reactions)
+        return self._compiled
+
     @property
     def reaction_by_index(self):
         """
@@ -860,18 +1549,7 @@ class Enviroment():
         Returns:
             list[list[list[int]]]: A list of [reactants_index, products_index] for each reaction.
         """
-        _reactions_by_index = []
-        for rxn in self.reactions :
-            reatants_index = []
-            for reactant in rxn.reactants:
-                index = self.compounds.index(reactant["compound"])
-                reatants_index.append(index)
-            products_index = []
-            for product in rxn.products:
-                index = self.compounds.index(product["compound"])
-                products_index.append(index)
-            _reactions_by_index.append([reatants_index , products_index])
-        return _reactions_by_index
+        return [[list(reactants_index) , list(products_index)] for reactants_index , products_index in self.compiled.reaction_by_index]
     
     @property
     def stoichiometric_coefficient_array(self):
@@ -886,7 +1564,9 @@ class Enviroment():
         - Products are assigned **negative** stoichiometric coefficients.
 
         This matrix is often used in rate law calculations, reaction network modeling,
-        and dynamic simulations of multi-reaction systems.
+        and dynamic simulations of multi-reaction systems. It is copied from the cached
+        `compiled` snapshot, so the returned array can be modified freely; read
+        `compiled.stoichiometric_coefficient_array` to skip the copy.
 
         Returns:
             numpy.ndarray: A 2D array of shape `(n_reactions, n_compounds)` where each
@@ -908,19 +1588,23 @@ class Enviroment():
                     [ 0,  0,  1, -1, -1]
                 ])
         """
-        _stoichiometric_coefficient_array = []
-        for rxn in self.reactions :
-            reaction_stoichiometric_coefficients = [0] * len(self.compounds) 
-            for reactant in rxn.reactants:
-                index = self.compounds.index(reactant["compound"])
-                reaction_stoichiometric_coefficients[index] += reactant["stoichiometric_coefficient"]
-            for product in rxn.products:
-                index = self.compounds.index(product["compound"])
-                reaction_stoichiometric_coefficients[index] += product["stoichiometric_coefficient"] * -1
-            _stoichiometric_coefficient_array.append(reaction_stoichiometric_coefficients)
-        output_array = np.array(_stoichiometric_coefficient_array)
-        return output_array
+        return self.compiled.stoichiometric_coefficient_array.copy()
     
+    @property
+    def sparse_stoichiometric_coefficient_array(self):
+        """
+        Sparse (CSR) version of `stoichiometric_coefficient_array`.
+
+        The matrix is assembled directly from the reactions, without building the
+        dense `(n_reactions, n_compounds)` array, and only stores the species each
+        reaction actually touches.
+
+        Returns:
+            SparseMatrix: Matrix of shape `(n_reactions, n_compounds)` with the same
+            sign convention as `stoichiometric_coefficient_array`.
+        """
+        return self.compiled.sparse_stoichiometric_coefficient_array.copy()
+
     @property
     def stoichiometric_coefficient_by_reaction(self):
         """
@@ -952,7 +1636,8 @@ class Enviroment():
         - The **backward rate constant (kb)** — associated with the reverse reaction direction.
 
         This structure is useful for numerical solvers and kinetic simulations where
-        reaction rates are computed using vectorized operations.
+        reaction rates are computed using vectorized operations. The returned array
+        is a copy of `compiled.rate_constants`.
 
         Returns:
             numpy.ndarray: A 2D array of shape `(n_reactions, 2)`, where each entry
@@ -971,11 +1656,7 @@ class Enviroment():
                     [0.5, 0.2]
                 ])
         """
-        _rate_constants = []
-        for rxn in self.reactions :
-            _rate_constants.append([rxn.kf , rxn.kb])
-        output_array = np.array(_rate_constants)
-        return output_array
+        return self.compiled.rate_constants.copy()
     @property
     def rate_constants(self):
         """
@@ -1005,6 +1686,7 @@ class Enviroment():
 
         Each vector’s length matches the total number of compounds in the environment.
         Compounds not participating in a given reaction have a dependency value of `0`.
+        Like `stoichiometric_coefficient_array`, it is a copy of the array cached in `compiled`.
 
         Returns:
             numpy.ndarray: A 3D array of shape `(n_reactions, 2, n_compounds)`, where:
@@ -1026,19 +1708,30 @@ class Enviroment():
                     ]
                 ])
         """
-        _rate_dependency_array = []
-        for rxn in self.reactions :
-            reactants_rate_dependency =  [0] * len(self.compounds)
-            for reactant in rxn.reactants:
-                index = self.compounds.index(reactant["compound"])
-                reactants_rate_dependency[index] = reactant["rate_dependency"]
-            products_rate_dependency= [0] * len(self.compounds)
-            for product in rxn.products:
-                index = self.compounds.index(product["compound"])
-                products_rate_dependency[index] = product["rate_dependency"]
-            _rate_dependency_array.append([reactants_rate_dependency , products_rate_dependency])
-        output_array = np.array(_rate_dependency_array)
-        return output_array
+        return self.compiled.rate_dependency_array.copy()
+    @property
+    def sparse_rate_dependency_array(self):
+        """
+        Sparse (CSR) version of `rate_dependency_array`.
+
+        Returns:
+            list[SparseMatrix]: `[forward, backward]`, each of shape `(n_reactions, n_compounds)`,
+            equal to `rate_dependency_array[:, 0, :]` and `rate_dependency_array[:, 1, :]`.
+        """
+        return [matrix.copy() for matrix in self.compiled.sparse_rate_dependency_array]
+
+    def _prefers_sparse(self):
+        """
+        Decide whether the sparse kernels are worth using for this network.
+
+        Returns:
+            bool: True for large networks whose species tables are mostly zeros.
+        """
+        entries = len(self.reactions) * len(self.compounds)
+        if entries < _SPARSE_MIN_ENTRIES:
+            return False
+        return self.compiled.nnz <= _SPARSE_MAX_DENSITY * entries
+
     @property
     def rate_dependency_by_reaction(self):
         """
@@ -1058,6 +1751,76 @@ class Enviroment():
                 products_index.append(product["rate_dependency"])
             _rate_dependency_by_reaction.append([reatants_index , products_index])
         return _rate_dependency_by_reaction
+    def jacobian(self , concentrations=None , sparse=False):
+        """
+        Evaluate the mass-action Jacobian d(dc/dt)/dc of the environment.
+
+        The Jacobian follows analytically from the power-law rates defined by
+        `rate_dependency_array`, `rate_constants_array` and
+        `stoichiometric_coefficient_array`, so no finite differencing is needed.
+        Entries stay finite for depleted species.
+
+        Args:
+            concentrations (array-like, optional): Concentrations ordered like `self.compounds`,
+                either a single vector of shape `(n_compounds,)` or a batch of shape
+                `(n_states, n_compounds)`. Defaults to the current concentrations.
+            sparse (bool, optional): If True, return `scipy.sparse.csr_matrix` objects
+                (a list of them for a batch). Requires SciPy. Default is False.
+
+        Returns:
+            numpy.ndarray | scipy.sparse.csr_matrix | list: Jacobian of shape
+            `(n_compounds, n_compounds)`, or `(n_states, n_compounds, n_compounds)` for a batch.
+            Entry `[i, j]` is the derivative of the rate of change of compound `i`
+            with respect to the concentration of compound `j`.
+
+        Raises:
+            ValueError: If the last dimension of `concentrations` doesn't match the compound count.
+            ImportError: If `sparse=True` and SciPy is not installed.
+
+        Example:
+            For a single reaction A ⇌ B with kf = 0.5 and kb = 0.25:
+                >>> env.jacobian([1.0, 0.0])
+                array([[-0.5 ,  0.25],
+                       [ 0.5 , -0.25]])
+        """
+        if concentrations is None:
+            concentrations = self.concentrations_array
+        concentrations = np.asarray(concentrations, dtype=float)
+        if concentrations.ndim not in (1, 2) or concentrations.shape[-1] != len(self.compounds):
+            raise ValueError("The concentrations should have the same length as the number of compounds")
+        if sparse:
+            compiled = self.compiled
+            arrays = (compiled.sparse_rate_dependency_array , compiled.sparse_stoichiometric_coefficient_array , compiled.rate_constants)
+            if concentrations.ndim == 1:
+                return _sparse_mass_action_jacobian(concentrations , *arrays)
+            return [_sparse_mass_action_jacobian(c , *arrays) for c in concentrations]
+        compiled = self.compiled
+        arrays = (compiled.rate_dependency_array , compiled.stoichiometric_coefficient_array , compiled.rate_constants)
+        return _mass_action_jacobian(concentrations , *arrays)
+
+    def compile_rate_of_change(self):
+        """
+        Generate a specialized function evaluating the rate of change dc/dt of the environment.
+
+        The current rate constants, rate orders and stoichiometry are baked into
+        straight-line Python source, so each call is one fused pass with no
+        logarithms, exponentials or matrix products. Compile again after changing
+        the environment.
+
+        Returns:
+            function: `rate_of_change(c)` taking concentrations ordered like `self.compounds`,
+            either `(n_compounds,)` or a batch `(n_states, n_compounds)`, and returning
+            dc/dt of the same shape. The generated code is available as `rate_of_change.source`.
+
+        Example:
+            For a single reaction A ⇌ B with kf = 0.5 and kb = 0.25:
+                >>> rate_of_change = env.compile_rate_of_change()
+                >>> rate_of_change(np.array([1.0, 0.0]))
+                array([-0.5,  0.5])
+        """
+        compiled = self.compiled
+        return _compile_rate_of_change(compiled.rate_dependency_array , compiled.stoichiometric_coefficient_array , compiled.rate_constants)
+
     @property
     def compounds_unicode_formula(self):
         """
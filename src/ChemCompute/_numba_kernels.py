@@ -0,0 +1,265 @@
+"""
+Numba-compiled inner loops behind `backend="numba"`.
+
+This module imports `numba` at the top, so it is only imported by calculators
+created with `backend="numba"` (see `_general._resolve_backend`). The kernels
+take the dense environment arrays, or their `(indptr, indices, data)` CSR triples,
+and mirror the NumPy implementations step for step. They release the GIL, so
+threads sharing one `KineticModel` or `EquilibriumModel` run them in parallel.
+"""
+import numpy as np
+from numba import njit
+
+
+def csr_triple(array):
+    """Return the `(indptr, indices, data)` CSR triple of a dense 2-D array."""
+    array = np.asarray(array , dtype=np.float64)
+    rows , columns = np.nonzero(array)
+    indptr = np.zeros(array.shape[0] + 1 , dtype=np.int64)
+    np.cumsum(np.bincount(rows , minlength=array.shape[0]) , out=indptr[1:])
+    return indptr , columns.astype(np.int64) , array[rows , columns]
+
+
+@njit(cache=True , nogil=True)
+def _power_product(c , indptr , indices , orders , r , eps):
+    p = 1.0
+    for e in range(indptr[r] , indptr[r + 1]):
+        x = c[indices[e]]
+        a = orders[e]
+        if a == 1.0:
+            p *= x
+        elif a == 2.0:
+            p *= x * x
+        elif a > 0.0:
+            p *= x ** a
+        else:
+            p *= (x + eps) ** a
+    return p
+
+
+@njit(cache=True , nogil=True)
+def rate_of_change(c , rate_constants , forward , backward , stoichiometry , out):
+    """Write dc/dt of the non-negative concentrations `c` into `out`."""
+    out[:] = 0.0
+    for r in range(rate_constants.shape[0]):
+        net = (rate_constants[r , 1] * _power_product(c , backward[0] , backward[1] , backward[2] , r , 1e-300)
+               - rate_constants[r , 0] * _power_product(c , forward[0] , forward[1] , forward[2] , r , 1e-300))
+        for e in range(stoichiometry[0][r] , stoichiometry[0][r + 1]):
+            out[stoichiometry[1][e]] += stoichiometry[2][e] * net
+
+
+@njit(cache=True , nogil=True)
+def euler(concentrations , rate_constants , forward , backward , stoichiometry , step_size , n_steps , time ,
+          checkpoint_times , record_stride , steady_state_tol , steady_state_window):
+    """
+    Fixed-step explicit Euler run with checkpoint capture, optional trajectory
+    recording (`record_stride > 0`) and optional steady-state stop (`steady_state_tol >= 0`).
+
+    Returns `(final, checkpoints, n_steps_taken, steady_state_time, record_times, record_states)`;
+    `steady_state_time` is NaN when no steady state was detected.
+    """
+    n_compounds = len(concentrations)
+    c = np.maximum(concentrations , 0.0)
+    new = np.empty(n_compounds)
+    rate = np.empty(n_compounds)
+    checkpoints = np.empty((len(checkpoint_times) , n_compounds))
+    position = 0
+    n_records = n_steps // record_stride + 2 if record_stride > 0 else 0
+    record_times = np.empty(n_records)
+    record_states = np.empty((n_records , n_compounds))
+    size = 0
+    since_record = 0
+    pending = False
+    if record_stride > 0:
+        record_times[0] = 0.0
+        record_states[0] = c
+        size = 1
+    t = 0.0
+    steady_since = np.nan
+    steady_state_time = np.nan
+    steps = 0
+    for _ in range(n_steps):
+        rate_of_change(c , rate_constants , forward , backward , stoichiometry , rate)
+        largest_change = 0.0
+        for j in range(n_compounds):
+            value = c[j] + rate[j] * step_size
+            new[j] = value if value > 0.0 else 0.0
+            change = abs(new[j] - c[j])
+            if change > largest_change:
+                largest_change = change
+        t += step_size
+        while position < len(checkpoint_times) and checkpoint_times[position] <= t:
+            theta = 1.0 - (t - checkpoint_times[position]) / step_size if step_size > 0 else 1.0
+            theta = min(max(theta , 0.0) , 1.0)
+            checkpoints[position] = c + theta * (new - c)
+            position += 1
+        if record_stride > 0:
+            since_record += 1
+            if since_record >= record_stride:
+                record_times[size] = t
+                record_states[size] = new
+                size += 1
+                since_record = 0
+                pending = False
+            else:
+                pending = True
+        if steady_state_tol >= 0.0:
+            if largest_change <= steady_state_tol * step_size:
+                if np.isnan(steady_since):
+                    steady_since = t - step_size
+            else:
+                steady_since = np.nan
+        c , new = new , c
+        steps += 1
+        if not np.isnan(steady_since) and t - steady_since >= steady_state_window:
+            steady_state_time = steady_since
+            while position < len(checkpoint_times) and checkpoint_times[position] <= time:
+                checkpoints[position] = c
+                position += 1
+            break
+    if pending:
+        record_times[size] = t
+        record_states[size] = c
+        size += 1
+    return c , checkpoints[:position] , steps , steady_state_time , record_times[:size] , record_states[:size]
+
+
+@njit(cache=True , nogil=True)
+def _extent_concentrations(c0 , N , x , out):
+    out[:] = c0
+    for r in range(N.shape[0]):
+        for j in range(N.shape[1]):
+            out[j] += N[r , j] * x[r]
+
+
+@njit(cache=True , nogil=True)
+def _log_residual(A , c , lnK , min_concentration , out):
+    for r in range(A.shape[0]):
+        total = 0.0
+        for j in range(A.shape[1]):
+            if A[r , j] != 0.0:
+                total += A[r , j] * np.log(max(c[j] , min_concentration))
+        out[r] = total - lnK[r]
+
+
+@njit(cache=True , nogil=True)
+def _feasible(c):
+    for j in range(len(c)):
+        if c[j] < -1e-15:
+            return False
+    return True
+
+
+@njit(cache=True , nogil=True)
+def _backtrack(x , direction , f_curr , c0 , N , A , lnK , learning_rate , backtrack_beta , min_concentration ,
+               c_new , r_new , reaction):
+    """Shrink the step along `-direction` until the concentrations stay non-negative and the
+    objective (the full residual, or only `reaction` when it is >= 0) does not increase."""
+    step = learning_rate
+    while True:
+        x_new = x - step * direction
+        _extent_concentrations(c0 , N , x_new , c_new)
+        if _feasible(c_new):
+            _log_residual(A , c_new , lnK , min_concentration , r_new)
+            if reaction >= 0:
+                f_new = 0.5 * r_new[reaction] * r_new[reaction]
+            else:
+                f_new = 0.5 * np.sum(r_new * r_new)
+            if f_new <= f_curr or step < 1e-12:
+                return x_new
+        step *= backtrack_beta
+
+
+@njit(cache=True , nogil=True)
+def batch_gradient_descent(N , A , c0 , lnK , max_iter , learning_rate , tol , backtrack_beta , min_concentration):
+    """Return the reaction extents found by batch gradient descent."""
+    R , C = N.shape
+    x = np.zeros(R)
+    c = np.empty(C)
+    residual = np.empty(R)
+    c_new = np.empty(C)
+    r_new = np.empty(R)
+    for _ in range(max_iter):
+        _extent_concentrations(c0 , N , x , c)
+        _log_residual(A , c , lnK , min_concentration , residual)
+        if np.sqrt(np.sum(residual * residual)) < tol:
+            break
+        weighted = np.zeros(C)
+        for r in range(R):
+            for j in range(C):
+                weighted[j] += A[r , j] * residual[r]
+        for j in range(C):
+            weighted[j] /= max(c[j] , min_concentration)
+        grad = np.zeros(R)
+        for r in range(R):
+            for j in range(C):
+                grad[r] += N[r , j] * weighted[j]
+        if np.sqrt(np.sum(grad * grad)) < tol:
+            break
+        f_curr = 0.5 * np.sum(residual * residual)
+        x = _backtrack(x , grad , f_curr , c0 , N , A , lnK , learning_rate , backtrack_beta , min_concentration ,
+                       c_new , r_new , -1)
+    return x
+
+
+@njit(cache=True , nogil=True)
+def stochastic_gradient_descent(N , A , c0 , lnK , max_iter , learning_rate , tol , backtrack_beta , min_concentration):
+    """Return the reaction extents found by stochastic (per-reaction) gradient descent."""
+    R , C = N.shape
+    x = np.zeros(R)
+    c = np.empty(C)
+    residual = np.empty(R)
+    c_new = np.empty(C)
+    r_new = np.empty(R)
+    for _ in range(max_iter):
+        any_update = False
+        for i in np.random.permutation(R):
+            _extent_concentrations(c0 , N , x , c)
+            _log_residual(A , c , lnK , min_concentration , residual)
+            r_i = residual[i]
+            if abs(r_i) < tol:
+                continue
+            grad_i = np.zeros(R)
+            for r in range(R):
+                for j in range(C):
+                    grad_i[r] += N[r , j] * A[i , j] / max(c[j] , min_concentration)
+            grad_i *= r_i
+            x = _backtrack(x , grad_i , 0.5 * r_i * r_i , c0 , N , A , lnK , learning_rate , backtrack_beta ,
+                           min_concentration , c_new , r_new , i)
+            any_update = True
+        _extent_concentrations(c0 , N , x , c)
+        _log_residual(A , c , lnK , min_concentration , residual)
+        if np.sqrt(np.sum(residual * residual)) < tol:
+            break
+        if not any_update:
+            break
+    return x
+
+
+@njit(cache=True , nogil=True)
+def newton(N , A , c0 , lnK , max_iter , learning_rate , tol , backtrack_beta , min_concentration):
+    """Return the reaction extents found by damped Newton iterations."""
+    R , C = N.shape
+    x = np.zeros(R)
+    c = np.empty(C)
+    residual = np.empty(R)
+    c_new = np.empty(C)
+    r_new = np.empty(R)
+    J = np.empty((R , R))
+    for _ in range(max_iter):
+        _extent_concentrations(c0 , N , x , c)
+        _log_residual(A , c , lnK , min_concentration , residual)
+        if np.sqrt(np.sum(residual * residual)) < tol:
+            break
+        for r in range(R):
+            for s in range(R):
+                total = 0.0
+                for j in range(C):
+                    if A[r , j] != 0.0 and N[s , j] != 0.0:
+                        total += A[r , j] * N[s , j] / max(c[j] , min_concentration)
+                J[r , s] = total
+        dx = np.linalg.lstsq(J , residual , rcond=2.220446049250313e-16 * R)[0]
+        f_curr = 0.5 * np.sum(residual * residual)
+        x = _backtrack(x , dx , f_curr , c0 , N , A , lnK , learning_rate , backtrack_beta , min_concentration ,
+                       c_new , r_new , -1)
+    return x
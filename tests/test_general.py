@@ -1,6 +1,6 @@
 import pytest
 import numpy as np
-from src.ChemCompute import Compound,Reaction,Enviroment
+from src.ChemCompute import Compound,CompoundRegistry,Reaction,Enviroment,SparseMatrix
 
 
 # -------------------------
@@ -96,6 +96,49 @@ def test_eq_compares_unicode_formulas():
     assert not (c1 == c3)
 
 
+def test_hash_consistent_with_eq():
+    """Equal compounds hash alike, so they can be used as dictionary keys and set members."""
+    c1 = Compound("H2O")
+    c2 = Compound("H2O")
+    assert hash(c1) == hash(c2)
+    assert {c1: 0}[c2] == 0
+    assert len({c1, c2, Compound("CO2")}) == 2
+    assert c1 != "H₂O"
+
+
+# ---------- Compound Registry ---------- #
+
+def test_registry_interns_compounds_by_formula():
+    """The registry returns one shared compound per formula and merges phase data into it."""
+    registry = CompoundRegistry()
+    water = registry.get("H2O", [{"phase": "l", "temperature": 298}])
+    same = registry.get("H2O", [{"phase": "l", "temperature": 298}, {"phase": "g", "temperature": 400}], bp=373)
+    assert same is water and len(registry) == 1
+    assert water.phase(298) == "l" and water.phase(400) == "g"
+    assert water.bp == 373
+    assert "H2O" in registry and Compound("H2O") in registry and "CO2" not in registry
+    assert list(registry) == [water]
+    with pytest.raises(ValueError):
+        registry.get("H2O", [{"phase": "x", "temperature": 500}])
+    with pytest.raises(ValueError, match="already registered"):
+        registry.get("H2O", [{"phase": "s", "temperature": 250}, {"phase": "g", "temperature": 298}])
+    assert water.phase_point_list == [{"phase": "l", "temperature": 298}, {"phase": "g", "temperature": 400}]
+
+
+def test_registry_shares_compounds_between_reactions():
+    """Reactions and environments built with a registry share their compound objects."""
+    registry = CompoundRegistry()
+    r1 = Reaction.from_string_simple_syntax("A + B.aq > C", registry=registry)
+    r2 = Reaction.from_string_complex_syntax("C & B > 2_A.g", registry=registry)
+    assert r1.products[0]["compound"] is r2.reactants[0]["compound"]
+    assert r2.products[0]["compound"] is r1.reactants[0]["compound"]
+    assert r1.reactants[0]["compound"].phase(298) == "g"
+    env = Enviroment.from_strings(["A > C", "C > D"], registry=registry)
+    assert env.compounds[0] is r1.reactants[0]["compound"]
+    assert len(registry) == 4
+    assert Reaction.from_string_simple_syntax("A > C").reactants[0]["compound"] is not env.compounds[0]
+
+
 # ---------- Edge Cases ---------- #
 
 def test_phase_point_list_and_mp_bp_combination():
@@ -169,6 +212,28 @@ def test_invalid_complex_syntax_raises():
         Reaction.from_string_complex_syntax("2H2 & > H2O")
 
 
+def test_parse_results_are_cached_and_immutable():
+    """Parsing the same string twice reuses one immutable token tuple; reactions still get fresh dicts."""
+    from src.ChemCompute._general import _parse_reaction
+    tokens = _parse_reaction("2A + B.g > C-1", "simple")
+    assert tokens == (((2.0, "A", 1), (1, "B.g", 1)), ((1, "C", -1.0),))
+    assert _parse_reaction("2A + B.g > C-1", "simple") is tokens
+    r1 = Reaction.from_string_simple_syntax("2A + B.g > C-1")
+    r2 = Reaction.from_string_simple_syntax("2A + B.g > C-1")
+    assert r1.reactants[0] is not r2.reactants[0]
+    assert r1.reactants[0]["compound"] == r2.reactants[0]["compound"]
+
+
+def test_parsing_ignores_whitespace_and_reads_complex_suffixes():
+    """Tabs and newlines are ignored; complex sections accept a negative order and a trailing phase."""
+    reaction = Reaction.from_string_simple_syntax("A\t+ 2B >\tC\n")
+    assert [c["compound"].formula for c in reaction.compounds] == ["A", "B", "C"]
+    reaction = Reaction.from_string_complex_syntax("H2_-1 & O2_2.l > 2_H2O", T=300)
+    assert reaction.reactants[0]["rate_dependency"] == -1.0
+    assert reaction.reactants[1]["rate_dependency"] == 2.0
+    assert reaction.reactants[1]["compound"].phase(300) == "l"
+
+
 def test_str_and_repr_output():
     """Check readable formatting."""
     reaction = Reaction.from_string_simple_syntax("A.g + B.g > C.g")
@@ -283,6 +348,120 @@ def test_add_reaction_with_iadd_operator(basic_env):
     assert D in basic_env.compounds
 
 
+def test_compound_index_tracks_compounds(basic_env):
+    """compound_index maps every compound to its position, including compounds added later."""
+    assert basic_env.compound_index == {compound: index for index, compound in enumerate(basic_env.compounds)}
+    assert basic_env.compound_index[Compound("B")] == 1
+    basic_env += Reaction.from_string_simple_syntax("C + D > E", [1.0, 0.5, 0.0])
+    assert basic_env.compound_index[Compound("D")] == 3 and basic_env.compound_index[Compound("E")] == 4
+    assert basic_env.concentrations == [1.0, 1.0, 1.0, 0.5, 0.0]
+
+
+def test_add_keeps_existing_concentrations(basic_env):
+    """Adding a reaction merges its species into the table instead of rebuilding it."""
+    basic_env.concentrations = [0.3, 0.4, 0.5]
+    basic_env.add(Reaction.from_string_simple_syntax("C > D", [0.25, 0.75]))
+    assert basic_env.concentrations == [0.3, 0.4, 0.75, 0.75]
+    assert basic_env.compound_index[Compound("D")] == 3
+
+
+def test_add_many_matches_constructor():
+    """add_many builds the same species table and matrices as passing the reactions to the constructor."""
+    reactions = [("A + B > C", [1.0, 2.0, 0.0]), ("C > D", [0.5, 0.0]), ("2D > A", [1.0, 0.25])]
+    env = Enviroment(Reaction.from_string_simple_syntax(*reactions[0]))
+    compiled = env.compiled
+    env.add_many(Reaction.from_string_simple_syntax(*args) for args in reactions[1:])
+    expected = Enviroment(*(Reaction.from_string_simple_syntax(*args) for args in reactions))
+
+    assert len(env) == 3
+    assert env.compounds == expected.compounds
+    assert env.concentrations == expected.concentrations
+    assert env.compiled.reaction_by_index[0] is compiled.reaction_by_index[0]
+    assert np.array_equal(env.stoichiometric_coefficient_array, expected.stoichiometric_coefficient_array)
+    assert np.array_equal(env.rate_dependency_array, expected.rate_dependency_array)
+    assert np.array_equal(env.rate_constants_array, expected.rate_constants_array)
+
+
+def test_add_many_validates_before_adding(basic_env):
+    """Nothing is added when one of the items isn't a Reaction."""
+    with pytest.raises(ValueError):
+        basic_env.add_many([Reaction.from_string_simple_syntax("C > D"), "not_a_reaction"])
+    assert len(basic_env) == 1
+    assert len(basic_env.compounds) == 3
+
+
+def test_from_strings_matches_individual_reactions():
+    """from_strings builds the same network as constructing each reaction and setting the environment to T."""
+    lines = ["A + 2B > C", "C > D.g", "2D.g > A-2"]
+    env = Enviroment.from_strings(lines, kf=[0.5, 0.2, 0.1], kb=0.05, K=np.array([2.0, 3.0, 4.0]),
+                                  enthalpy=-10000, activation_energy_forward=40000,
+                                  concentrations={"A": 1.0, "B": 2.0}, T=310)
+    expected = Enviroment(*(Reaction.from_string_simple_syntax(line, kf=kf, kb=0.05, K=K, enthalpy=-10000,
+                                                               activation_energy_forward=40000)
+                            for line, kf, K in zip(lines, [0.5, 0.2, 0.1], [2.0, 3.0, 4.0])))
+    expected.T = 310
+
+    assert env.compounds == expected.compounds
+    assert env.concentrations == [1.0, 2.0, 0, 0]
+    assert np.array_equal(env.stoichiometric_coefficient_array, expected.stoichiometric_coefficient_array)
+    assert np.array_equal(env.rate_dependency_array, expected.rate_dependency_array)
+    assert env.T == 310 and [rxn.T for rxn in env.reactions] == [310] * 3
+    assert np.allclose(env.rate_constants_array, expected.rate_constants_array)
+    assert np.allclose(env.compiled.K, expected.compiled.K) and env.compiled.K[0] != 2.0
+    assert [c.phase_point_list for c in env.compounds] == [c.phase_point_list for c in expected.compounds]
+    assert env.reactions[1].products[0]["compound"] is env.reactions[2].reactants[0]["compound"]
+    assert env.compounds[3].phase(298) == "g"
+
+
+def test_from_strings_rescales_constants_to_temperature_like_the_constructor():
+    """Constants are given at 298 K and moved to `T` with the activation energies and enthalpy."""
+    env = Enviroment.from_strings(["A > B"], kf=1.0, activation_energy_forward=50000, enthalpy=-20000, T=350)
+    expected = Enviroment(Reaction.from_string_simple_syntax("A > B", kf=1.0, activation_energy_forward=50000,
+                                                             enthalpy=-20000), T=350)
+    assert env.reactions[0].T == 350
+    assert np.allclose(env.rate_constants_array, expected.rate_constants_array)
+    assert env.rate_constants[0][0] == pytest.approx(20.05, rel=1e-3)
+    assert env.compiled.K == pytest.approx(expected.compiled.K)
+
+
+def test_from_strings_pads_short_concentration_lists():
+    """Compounds missing from a short concentration list start at 0; a long list is rejected."""
+    env = Enviroment.from_strings(["A + B > C"], concentrations=[1.0, 2.0])
+    assert env.concentrations == [1.0, 2.0, 0]
+    with pytest.raises(ValueError):
+        Enviroment.from_strings(["A > B"], concentrations=[1.0, 2.0, 3.0])
+
+
+def test_from_strings_complex_syntax_and_errors():
+    """The complex syntax is supported; malformed input raises ValueError."""
+    env = Enviroment.from_strings(["Fe+3 & e-1 > Fe+2", "2_H2_2 & O2 > 2_H2O"], syntax="complex",
+                                  concentrations=[1.0, 0.5, 0.0, 2.0, 1.0, 0.0])
+    assert len(env) == 2 and len(env.compounds) == 6
+    assert env.rate_dependency_array[1, 0].tolist() == [0, 0, 0, 2, 1, 0]
+    with pytest.raises(ValueError):
+        Enviroment.from_strings(["A > B", "A + + B > C"])
+    with pytest.raises(ValueError):
+        Enviroment.from_strings(["A > B"], syntax="smiles")
+    with pytest.raises(ValueError):
+        Enviroment.from_strings(["A > B", "B > C"], kf=[1.0])
+    with pytest.raises(ValueError):
+        Enviroment.from_strings(["A > B"], concentrations={"Z": 1.0})
+
+
+def test_from_table_columns():
+    """from_table reads one reaction per row from column arrays."""
+    table = {"reaction": ["A > B", "B > C"], "kf": np.array([0.5, 0.2]), "kb": [0.1, 0.0]}
+    env = Enviroment.from_table(table, concentrations={"A": 1.0})
+    assert env.rate_constants_array.tolist() == [[0.5, 0.1], [0.2, 0.0]]
+    assert env.concentrations == [1.0, 0, 0]
+    with pytest.raises(ValueError):
+        Enviroment.from_table({"kf": [1.0]})
+    with pytest.raises(ValueError):
+        Enviroment.from_table({"reaction": ["A > B"], "pressure": [1.0]})
+    with pytest.raises(ValueError):
+        Enviroment.from_table({"reaction": ["A > B"], "kf": [[1.0]]})
+
+
 def test_len_and_iter(basic_env):
     """Check __len__ and __iter__."""
     count = 0
@@ -348,6 +527,175 @@ def test_unicode_formula_property(basic_env):
     assert all(isinstance(u, str) for u in uforms)
 
 
+def test_jacobian_default_uses_current_concentrations(basic_env):
+    """Check the analytic Jacobian of A + 2B ⇌ C at the current state."""
+    # rf = 0.5 [A][B]^2, rb = 0.1 [C]; at [1, 1, 0]
+    expected = np.array([
+        [-0.5, -1.0, 0.1],
+        [-1.0, -2.0, 0.2],
+        [0.5, 1.0, -0.1],
+    ])
+    assert np.allclose(basic_env.jacobian(), expected)
+
+
+def test_jacobian_batch_matches_single_evaluations(basic_env):
+    """A batch of states returns one Jacobian per row."""
+    states = np.array([[1.0, 1.0, 0.0], [0.3, 0.0, 0.7], [0.0, 0.0, 0.0]])
+    batch = basic_env.jacobian(states)
+    assert batch.shape == (3, 3, 3)
+    for state, J in zip(states, batch):
+        assert np.allclose(J, basic_env.jacobian(state))
+    assert np.all(np.isfinite(batch))
+
+
+def test_jacobian_sparse_matches_dense(basic_env):
+    """Sparse output has the same entries as the dense Jacobian."""
+    pytest.importorskip("scipy")
+    state = [0.4, 0.6, 0.2]
+    J_sparse = basic_env.jacobian(state, sparse=True)
+    assert np.allclose(J_sparse.toarray(), basic_env.jacobian(state))
+    batch = basic_env.jacobian([state, state], sparse=True)
+    assert len(batch) == 2
+
+
+def test_jacobian_wrong_length_raises(basic_env):
+    """Concentrations with the wrong number of compounds are rejected."""
+    with pytest.raises(ValueError):
+        basic_env.jacobian([1.0, 2.0])
+
+
+def test_sparse_arrays_match_dense(basic_env):
+    """The CSR network matrices hold the same entries as the dense arrays."""
+    stoichiometry = basic_env.sparse_stoichiometric_coefficient_array
+    assert stoichiometry.shape == (1, 3)
+    assert stoichiometry.nnz == 3
+    assert np.allclose(stoichiometry.toarray(), basic_env.stoichiometric_coefficient_array)
+    forward, backward = basic_env.sparse_rate_dependency_array
+    assert np.allclose(forward.toarray(), basic_env.rate_dependency_array[:, 0, :])
+    assert np.allclose(backward.toarray(), basic_env.rate_dependency_array[:, 1, :])
+
+
+def test_sparse_matrix_products_match_dense():
+    """SparseMatrix products, transpose and row access follow NumPy semantics."""
+    dense = np.array([[1.0, 0.0, -2.0], [0.0, 0.0, 0.0], [0.0, 3.0, 0.5]])
+    matrix = SparseMatrix.from_dense(dense)
+    x = np.array([0.3, -1.2, 2.0])
+    assert matrix.nnz == 4
+    assert np.allclose(matrix @ x, dense @ x)
+    assert np.allclose(matrix.T @ x, dense.T @ x)
+    assert np.allclose(matrix @ np.eye(3), dense)
+    assert np.allclose(matrix[2], dense[2])
+    assert np.allclose((-matrix).toarray(), -dense)
+
+
+def test_prefers_sparse_only_for_large_sparse_networks(basic_env):
+    """Small networks stay dense; large chains with few species per reaction go sparse."""
+    assert basic_env._prefers_sparse() == False
+    chain = [Reaction.from_string_simple_syntax(f"{a} > {b}")
+             for a, b in zip(_letter_names(301), _letter_names(301)[1:])]
+    assert Enviroment(*chain)._prefers_sparse() == True
+
+
+def test_compile_rate_of_change_matches_mass_action(basic_env):
+    """The generated kernel evaluates dc/dt of A + 2B ⇌ C."""
+    rate_of_change = basic_env.compile_rate_of_change()
+    state = np.array([0.4, 0.6, 0.2])
+    net = 0.1 * 0.2 - 0.5 * 0.4 * 0.6 ** 2
+    assert np.allclose(rate_of_change(state), [net, 2 * net, -net])
+    assert "0.5 * c0 * c1 * c1" in rate_of_change.source
+
+
+def test_compile_rate_of_change_batch_and_clamping(basic_env):
+    """Batches are evaluated row by row and negative concentrations count as zero."""
+    rate_of_change = basic_env.compile_rate_of_change()
+    states = np.array([[0.4, 0.6, 0.2], [1.0, -1.0, 0.5], [0.0, 0.0, 0.0]])
+    batch = rate_of_change(states)
+    assert batch.shape == states.shape
+    for state, row in zip(states, batch):
+        assert np.allclose(row, rate_of_change(state))
+    assert np.allclose(batch[1], rate_of_change(np.array([1.0, 0.0, 0.5])))
+
+
+def test_compiled_network_is_cached_and_read_only(basic_env):
+    """The snapshot is built once; its arrays are shared between accesses and can't be written."""
+    compiled = basic_env.compiled
+    assert basic_env.compiled is compiled
+    assert compiled.compound_index == {Compound("A"): 0, Compound("B"): 1, Compound("C"): 2}
+    assert compiled.reaction_by_index == (((0, 1), (2,)),)
+    assert compiled.shape == (1, 3) and compiled.nnz == 3
+    assert compiled.stoichiometric_coefficient_array is compiled.stoichiometric_coefficient_array
+    with pytest.raises(ValueError):
+        compiled.stoichiometric_coefficient_array[0, 0] = 5
+    with pytest.raises(ValueError):
+        compiled.rate_constants[0, 0] = 5
+    with pytest.raises(AttributeError):
+        compiled.kf = np.zeros(1)
+
+
+def test_compiled_network_follows_direct_edits_of_reactions():
+    """Removing, replacing or reordering entries of `reactions` recompiles the whole network."""
+    lines = ["A > B", "B > C", "C > D"]
+    env = Enviroment(*(Reaction.from_string_simple_syntax(line, kf=kf) for line, kf in zip(lines, [0.1, 0.2, 0.3])))
+    assert env.compiled.shape == (3, 4)
+
+    env.reactions.pop()
+    assert env.compiled.shape == (2, 4) and env.rate_constants_array.shape == (2, 2)
+    assert env.stoichiometric_coefficient_array.tolist() == [[1, -1, 0, 0], [0, 1, -1, 0]]
+
+    env.reactions.reverse()
+    assert env.compiled.kf.tolist() == [0.2, 0.1]
+    assert env.stoichiometric_coefficient_array.tolist() == [[0, 1, -1, 0], [1, -1, 0, 0]]
+
+    env.reactions[0] = Reaction.from_string_simple_syntax("D > A", kf=0.4)
+    assert env.compiled.kf.tolist() == [0.4, 0.1]
+    assert env.stoichiometric_coefficient_array.tolist() == [[-1, 0, 0, 1], [1, -1, 0, 0]]
+    assert env.compile_rate_of_change()(np.array([0.0, 0.0, 0.0, 1.0])).tolist() == pytest.approx([0.4, 0.0, 0.0, -0.4])
+
+
+def test_enviroment_array_properties_return_writable_copies(basic_env):
+    """The public array properties can still be modified in place without touching the snapshot."""
+    stoichiometry = basic_env.stoichiometric_coefficient_array
+    stoichiometry[0, 0] = 5
+    rate_constants = basic_env.rate_constants_array
+    rate_constants[0, 0] = 5
+    basic_env.rate_dependency_array[0, 0, 0] = 5
+    basic_env.sparse_stoichiometric_coefficient_array.data[0] = 5
+    assert basic_env.compiled.stoichiometric_coefficient_array[0, 0] == 1
+    assert basic_env.stoichiometric_coefficient_array.tolist() == [[1, 2, -1]]
+    assert basic_env.rate_constants_array[0, 0] == basic_env.reactions[0].kf
+    assert basic_env.rate_dependency_array[0, 0, 0] == 1
+    assert basic_env.sparse_stoichiometric_coefficient_array.toarray().tolist() == [[1, 2, -1]]
+
+
+def test_compiled_network_invalidation(basic_env):
+    """Adding reactions recompiles; new rate constants keep the structure; concentrations don't matter."""
+    compiled = basic_env.compiled
+    stoichiometry = compiled.stoichiometric_coefficient_array
+    basic_env.concentrations = [2.0, 2.0, 2.0]
+    assert basic_env.compiled is compiled
+
+    basic_env.reactions[0].kf = 0.8
+    updated = basic_env.compiled
+    assert updated is not compiled and compiled.kf.tolist() == [0.5]
+    assert updated.kf.tolist() == [0.8] and basic_env.rate_constants_array.tolist() == [[0.8, 0.1]]
+    assert updated.stoichiometric_coefficient_array is stoichiometry
+
+    basic_env.T = 350
+    assert basic_env.compiled.K.tolist() == [basic_env.reactions[0].K]
+
+    basic_env += Reaction.from_string_simple_syntax("C > D")
+    assert basic_env.compiled.shape == (2, 4)
+    assert basic_env.stoichiometric_coefficient_array.tolist() == [[1, 2, -1, 0], [0, 0, 1, -1]]
+    basic_env.add(Reaction.from_string_simple_syntax("D > E"))
+    assert basic_env.reaction_by_index == [[[0, 1], [2]], [[2], [3]], [[3], [4]]]
+
+
+def _letter_names(n):
+    """Generate n distinct alphabetic species names (simple syntax allows letters only)."""
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    return [letters[i // 26 // 26 % 26] + letters[i // 26 % 26] + letters[i % 26] for i in range(n)]
+
+
 # -------------------------
 # Thermodynamic Features Tests
 # -------------------------
@@ -0,0 +1,70 @@
+import subprocess
+import sys
+
+import pytest
+
+import ChemCompute
+
+
+# -------------------------
+# Package Import Tests
+# -------------------------
+
+# Modules that only specific code paths need; importing the engine must not load them.
+_HEAVY_MODULES = ["matplotlib", "asyncio", "scipy", "numba", "concurrent.futures"]
+
+
+def _run(code):
+    """Run `code` in a fresh interpreter and return its stdout."""
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def test_engine_import_skips_optional_modules():
+    """Test that importing the calculators loads none of the plotting/async/optional modules."""
+    loaded = _run(
+        "import sys\n"
+        "import ChemCompute.Kinetic, ChemCompute.Thermodynamic, ChemCompute.Sweep\n"
+        f"print(','.join(m for m in {_HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    assert loaded == ""
+
+
+def test_import_time_budget():
+    """Benchmark: importing the engine on top of NumPy stays well below matplotlib's own import cost."""
+    elapsed = float(_run(
+        "import time, numpy\n"
+        "start = time.perf_counter()\n"
+        "import ChemCompute.Kinetic, ChemCompute.Thermodynamic, ChemCompute.Sweep\n"
+        "print(time.perf_counter() - start)"
+    ))
+    assert elapsed < 0.25
+
+
+def test_lazy_package_attributes():
+    """Test that the calculators are reachable from the package and load on first access."""
+    loaded = _run(
+        "import sys, ChemCompute\n"
+        "before = 'ChemCompute.Kinetic' in sys.modules\n"
+        "ChemCompute.KineticalCalculator\n"
+        "print(before, 'ChemCompute.Kinetic' in sys.modules, 'ChemCompute.Thermodynamic' in sys.modules)"
+    )
+    assert loaded == "False True False"
+
+    from ChemCompute import EquilibriumCalculator, KineticalCalculator, KineticModel, sweep
+    from ChemCompute.Kinetic import KineticalCalculator as kinetical_calculator
+    assert KineticalCalculator is kinetical_calculator
+    assert ChemCompute.Thermodynamic.EquilibriumCalculator is EquilibriumCalculator
+    assert callable(sweep) and KineticModel.__name__ == "KineticModel"
+    assert {"KineticalCalculator", "EquilibriumCalculator", "Kinetic"} <= set(dir(ChemCompute))
+    with pytest.raises(AttributeError):
+        ChemCompute.NotAClass
+
+
+def test_package_namespace_exports_only_public_names():
+    """Test that the star import of the core module doesn't leak its own imports."""
+    namespace = {}
+    exec("from ChemCompute import *", namespace)
+    assert {"Compound", "CompoundRegistry", "Reaction", "Enviroment", "SparseMatrix", "KineticalCalculator"} <= set(namespace)
+    assert not {"re", "math", "np", "warnings", "lru_cache", "import_module"} & set(namespace)
+    assert not {"re", "math", "np", "warnings", "lru_cache", "import_module"} & set(dir(ChemCompute))
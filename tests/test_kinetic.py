@@ -1,10 +1,12 @@
+import threading
+
 import pytest
 import numpy as np
 from unittest.mock import patch, MagicMock
 
 # Import from ChemCompute package
-from ChemCompute import Enviroment, Compound, Reaction
-from ChemCompute.Kinetic import KineticalCalculator
+from ChemCompute import Enviroment, Compound, Reaction, SparseMatrix
+from ChemCompute.Kinetic import KineticalCalculator, KineticModel, _NpyAppender, _RateLaw, _RingBuffer, _TrajectoryBuffer, _expanded_limits, _factorized_solver, _mass_action_jacobian, _rate_laws, _rate_of_change
 
 
 # -------------------------
@@ -34,6 +36,20 @@ def test_kinetical_calculator_init_small_accuracy():
     assert kc.fitted == False
 
 
+def test_kinetical_calculator_init_rk45():
+    """Test initialization with the adaptive Runge-Kutta method."""
+    kc = KineticalCalculator(accuracy=0.01, method="rk45", rtol=1e-8, atol=1e-10)
+    assert kc.method == "rk45"
+    assert kc.rtol == 1e-8
+    assert kc.atol == 1e-10
+
+
+def test_kinetical_calculator_init_invalid_method():
+    """Test that an unknown integration method raises ValueError."""
+    with pytest.raises(ValueError, match="`method` is not one of"):
+        KineticalCalculator(method="midpoint")
+
+
 # ---------- Fixture for test environment ---------- #
 
 @pytest.fixture
@@ -268,6 +284,246 @@ def test_calculate_different_accuracy_levels(simple_environment):
     # Note: This is not always true due to checkpoint timing, but both should be valid
 
 
+def test_calculate_rk45_matches_analytic_solution(simple_environment):
+    """Test that rk45 reproduces the analytic solution of A ⇌ B."""
+    kc = KineticalCalculator(accuracy=1e-3, method="rk45", rtol=1e-8, atol=1e-12)
+    kc.fit(simple_environment)
+    results = kc.calculate(time=5.0, plot=False)
+
+    # A(t) = A_eq + (A0 - A_eq) * exp(-(kf + kb) t) with A_eq = kb / (kf + kb)
+    expected_A = 1 / 3 + (2 / 3) * np.exp(-0.75 * 5.0)
+    assert np.isclose(results[-1][0], expected_A, rtol=1e-6)
+    assert np.isclose(results[-1][0] + results[-1][1], 1.0)
+
+
+def test_calculate_rk45_takes_fewer_steps_than_euler(simple_environment):
+    """Test that adaptive stepping needs far fewer steps on a long horizon."""
+    euler = KineticalCalculator(accuracy=1e-3)
+    rk45 = KineticalCalculator(accuracy=1e-3, method="rk45")
+    euler.fit(simple_environment)
+    rk45.fit(simple_environment)
+
+    results_euler = euler.calculate(time=50.0, plot=False)
+    results_rk45 = rk45.calculate(time=50.0, plot=False)
+
+    assert rk45.number_of_steps * 100 < euler.number_of_steps
+    assert np.allclose(results_rk45[-1], results_euler[-1], atol=1e-4)
+
+
+def test_calculate_rk45_zero_time(simple_environment):
+    """Test that rk45 with zero time returns the initial state."""
+    kc = KineticalCalculator(method="rk45")
+    kc.fit(simple_environment)
+    results = kc.calculate(time=0.0, plot=False)
+    assert np.allclose(results[-1], simple_environment.concentrations_array)
+
+
+@pytest.fixture
+def stiff_environment():
+    """Create Robertson's stiff network: A > B (slow), 2B > B + C (fast), B + C > A + C."""
+    rxn1 = Reaction.from_string_simple_syntax("A > B", concentrations=[1.0, 0.0], kf=0.04, kb=0)
+    rxn2 = Reaction.from_string_simple_syntax("2B2 > B + C", concentrations=[0.0, 0.0, 0.0], kf=3e7, kb=0)
+    rxn3 = Reaction.from_string_simple_syntax("B + C > A + C", concentrations=[0.0, 0.0, 0.0, 0.0], kf=1e4, kb=0)
+    return Enviroment(rxn1, rxn2, rxn3, T=298)
+
+
+def test_mass_action_jacobian_matches_finite_differences(stiff_environment):
+    """Test the analytic Jacobian against central finite differences."""
+    args = (stiff_environment.rate_dependency_array,
+            stiff_environment.stoichiometric_coefficient_array,
+            stiff_environment.rate_constants_array)
+    c = np.array([0.7, 2e-5, 0.3])
+    J = _mass_action_jacobian(c, *args)
+    rate_args = (_rate_laws(args[0]),) + args[1:]
+    numerical = np.zeros((3, 3))
+    for j in range(3):
+        dc = np.zeros(3)
+        dc[j] = 1e-7 * max(c[j], 1e-6)
+        numerical[:, j] = (_rate_of_change(c + dc, *rate_args) - _rate_of_change(c - dc, *rate_args)) / (2 * dc[j])
+    assert np.allclose(J, numerical, rtol=1e-5, atol=1e-8)
+
+
+def test_mass_action_jacobian_finite_at_zero_concentration(stiff_environment):
+    """Test that depleted species give finite Jacobian entries."""
+    J = _mass_action_jacobian(np.array([1.0, 0.0, 0.0]),
+                              stiff_environment.rate_dependency_array,
+                              stiff_environment.stoichiometric_coefficient_array,
+                              stiff_environment.rate_constants_array)
+    assert np.all(np.isfinite(J))
+    # d(dA/dt)/dA = -kf of the first reaction
+    assert np.isclose(J[0, 0], -0.04)
+
+
+def _blow_up_environments():
+    """A rate that overflows at once, and a finite-time blow-up (dA/dt = 2A^2) that starts finite."""
+    return [Enviroment(Reaction.from_string_simple_syntax("2A2 > B", concentrations=[1e200, 0], kf=1e200, kb=0)),
+            Enviroment(Reaction.from_string_simple_syntax("2A2 > 3A", concentrations=[1.0, 1.0], kf=1, kb=0))]
+
+
+def _raised_within(function, timeout=20):
+    """Run `function` in a daemon thread and return the exception it raised before `timeout`."""
+    outcome = []
+
+    def target():
+        try:
+            function()
+        except Exception as error:
+            outcome.append(error)
+        else:
+            outcome.append(None)
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert outcome, f"the run was still going after {timeout} s"
+    return outcome[0]
+
+
+@pytest.mark.parametrize("method", ["rk45", "trbdf2"])
+@pytest.mark.parametrize("case", [0, 1])
+def test_adaptive_methods_stop_on_blow_up(method, case):
+    """Test that a diverging run raises instead of shrinking the step size forever."""
+    enviroment = _blow_up_environments()[case]
+    kc = KineticalCalculator(method=method)
+    kc.fit(enviroment)
+
+    def run():
+        with np.errstate(all="ignore"):
+            kc.calculate(time=2.0)
+
+    assert isinstance(_raised_within(run), FloatingPointError)
+
+
+def test_calculate_trbdf2_stiff_robertson(stiff_environment):
+    """Test that the stiff solver integrates Robertson's problem in few steps."""
+    kc = KineticalCalculator(accuracy=1e-6, method="trbdf2", rtol=1e-6, atol=1e-10)
+    kc.fit(stiff_environment)
+    results = kc.calculate(time=40.0, plot=False)
+
+    # Reference solution at t = 40
+    assert np.allclose(results[-1], [0.7158271, 9.185535e-6, 0.2841637], rtol=1e-4)
+    assert kc.number_of_steps < 1000
+
+
+def test_calculate_trbdf2_matches_rk45_on_nonstiff(simple_environment):
+    """Test that the stiff solver agrees with rk45 on a non-stiff network."""
+    stiff = KineticalCalculator(method="trbdf2", rtol=1e-8, atol=1e-12)
+    explicit = KineticalCalculator(method="rk45", rtol=1e-8, atol=1e-12)
+    results_stiff = stiff.fit_calculate(simple_environment, time=5.0)
+    results_explicit = explicit.fit_calculate(simple_environment, time=5.0)
+    assert np.allclose(results_stiff[-1], results_explicit[-1], atol=1e-6)
+
+
+@pytest.mark.parametrize("scipy_available", [True, False])
+def test_factorized_solver_matches_direct_solve(scipy_available):
+    """Test that the reusable TR-BDF2 factorization solves like np.linalg.solve, with or without SciPy."""
+    matrix = np.array([[4.0, 1.0, 0.0], [1.0, 3.0, 1.0], [0.0, 1.0, 2.0]])
+    rhs = np.array([[1.0, 2.0, 3.0], [0.5, -1.0, 4.0]])
+    modules = {} if scipy_available else {"scipy.linalg": None}
+    with patch.dict("sys.modules", modules):
+        solve = _factorized_solver(matrix)
+        assert np.allclose(solve(rhs[0]), np.linalg.solve(matrix, rhs[0]))
+        assert np.allclose(solve(rhs), np.linalg.solve(matrix, rhs.T).T)
+
+
+@pytest.mark.parametrize("method", ["euler", "rk45", "trbdf2"])
+def test_calculate_sparse_matches_dense(multi_reaction_environment, method):
+    """Test that the sparse network kernels give the dense results."""
+    dense = KineticalCalculator(accuracy=0.01, method=method, sparse=False)
+    sparse = KineticalCalculator(accuracy=0.01, method=method, sparse=True)
+    results_dense = dense.fit_calculate(multi_reaction_environment, time=2.0, checkpoint_time=[0.5])
+    results_sparse = sparse.fit_calculate(multi_reaction_environment, time=2.0, checkpoint_time=[0.5])
+    assert len(results_dense) == len(results_sparse)
+    for checkpoint_dense, checkpoint_sparse in zip(results_dense, results_sparse):
+        assert np.allclose(checkpoint_dense, checkpoint_sparse, atol=1e-10)
+
+
+def test_calculate_checkpoints_interpolated_at_exact_times(simple_environment):
+    """Test that rk45 checkpoints hit the analytic solution at the requested times."""
+    kc = KineticalCalculator(accuracy=1e-3, method="rk45", rtol=1e-9, atol=1e-12)
+    kc.fit(simple_environment)
+    checkpoint_times = [0.37, 1.0, 2.5, 4.99]
+    results = kc.calculate(time=5.0, checkpoint_time=checkpoint_times, plot=False)
+
+    assert len(results) == len(checkpoint_times) + 1
+    for checkpoint_t, checkpoint in zip(checkpoint_times, results):
+        expected_A = 1 / 3 + (2 / 3) * np.exp(-0.75 * checkpoint_t)
+        assert np.isclose(checkpoint[0], expected_A, rtol=1e-6)
+
+
+def test_calculate_euler_checkpoint_interpolates_linearly(simple_environment):
+    """Test that an Euler checkpoint between two steps lies on the Euler polygon."""
+    kc = KineticalCalculator(accuracy=0.1)
+    kc.fit(simple_environment)
+    on_grid = kc.calculate(time=0.2, checkpoint_time=[0.1, 0.2], plot=False)
+    between = kc.calculate(time=0.2, checkpoint_time=[0.15], plot=False)
+    assert np.allclose(between[0], (on_grid[0] + on_grid[1]) / 2)
+
+
+def test_calculate_checkpoints_sorted_and_many(simple_environment):
+    """Test that many unsorted checkpoints are captured once each, in time order."""
+    kc = KineticalCalculator(accuracy=1e-2, method="rk45")
+    kc.fit(simple_environment)
+    checkpoint_times = list(np.linspace(0, 10, 20001))[::-1]
+    results = kc.calculate(time=10.0, checkpoint_time=checkpoint_times, plot=False)
+
+    assert len(results) == 20001 + 1
+    assert np.allclose(results[0], simple_environment.concentrations_array)
+    A = np.array([checkpoint[0] for checkpoint in results[:-1]])
+    assert np.all(np.diff(A) <= 1e-12)
+
+
+# ---------- Ensemble Method Tests ---------- #
+
+def test_calculate_ensemble_not_fitted():
+    """Test that calculate_ensemble raises NameError when not fitted."""
+    kc = KineticalCalculator()
+    with pytest.raises(NameError):
+        kc.calculate_ensemble(time=1.0, initial_concentrations=[[1.0, 0.0]])
+
+
+def test_calculate_ensemble_matches_individual_runs(simple_environment):
+    """Test that each ensemble member equals a separate Euler run."""
+    initial = np.array([[1.0, 0.0], [0.2, 0.8], [0.5, 0.5]])
+    kc = KineticalCalculator(accuracy=0.01)
+    kc.fit(simple_environment)
+    results = kc.calculate_ensemble(time=1.0, initial_concentrations=initial, checkpoint_time=[0.5])
+
+    assert results.shape == (3, 2, 2)
+    for member, state in enumerate(initial):
+        simple_environment.concentrations = state.tolist()
+        single = KineticalCalculator(accuracy=0.01).fit_calculate(simple_environment, time=1.0, checkpoint_time=[0.5])
+        assert np.allclose(results[member], single, atol=1e-12)
+
+
+@pytest.mark.parametrize("method", ["euler", "rk45", "trbdf2"])
+def test_calculate_ensemble_with_rate_constants(simple_environment, method):
+    """Test per-member rate constants against the analytic solution."""
+    rate_constants = np.array([[[0.5, 0.25]], [[2.0, 1.0]], [[0.1, 0.3]]])
+    kc = KineticalCalculator(accuracy=1e-3, method=method)
+    kc.fit(simple_environment)
+    results = kc.calculate_ensemble(time=2.0, rate_constants=rate_constants)
+
+    assert results.shape == (3, 1, 2)
+    kf, kb = rate_constants[:, 0, 0], rate_constants[:, 0, 1]
+    expected_A = kb / (kf + kb) + (1 - kb / (kf + kb)) * np.exp(-(kf + kb) * 2.0)
+    assert np.allclose(results[:, -1, 0], expected_A, atol=2e-3)
+
+
+def test_calculate_ensemble_invalid_shapes(simple_environment):
+    """Test that inconsistent ensemble inputs raise ValueError."""
+    kc = KineticalCalculator()
+    kc.fit(simple_environment)
+    with pytest.raises(ValueError):
+        kc.calculate_ensemble(time=1.0)
+    with pytest.raises(ValueError):
+        kc.calculate_ensemble(time=1.0, initial_concentrations=[[1.0, 0.0, 0.0]])
+    with pytest.raises(ValueError):
+        kc.calculate_ensemble(time=1.0, rate_constants=np.ones((2, 3, 2)))
+    with pytest.raises(ValueError):
+        kc.calculate_ensemble(time=1.0, initial_concentrations=np.ones((2, 2)), rate_constants=np.ones((3, 1, 2)))
+
+
 # ---------- Fit Calculate Method Tests ---------- #
 
 def test_fit_calculate_valid(simple_environment):
@@ -364,6 +620,122 @@ def test_calculate_responsively_fitted(simple_environment):
     # interactive and animation-dependent nature
 
 
+def test_calculate_responsively_returns_after_window_closes(simple_environment):
+    """Test that closing the plot stops the background run and returns its checkpoints."""
+    kc = KineticalCalculator(accuracy=0.01)
+    kc.fit(simple_environment)
+    with patch('matplotlib.use'), patch('matplotlib.pyplot.show'), patch('matplotlib.animation.FuncAnimation') as animation:
+        results = kc.calculate_responsively(checkpoint_time=[0.0])
+    assert animation.called
+    assert len(results) >= 1
+    assert results[-1].shape == (2,)
+
+
+def test_calculate_responsively_bounded_live_view(simple_environment):
+    """Test that the live lines never hold more than the buffer and respect the sliding window."""
+    kc = KineticalCalculator(accuracy=0.001)
+    kc.fit(simple_environment)
+    with patch('matplotlib.use'), patch('matplotlib.pyplot.show'), patch('matplotlib.animation.FuncAnimation') as animation:
+        kc.calculate_responsively(time=5.0, frame_stride=1, queue_size=100_000, window=0.5, buffer_size=300)
+    assert animation.call_args.kwargs["blit"] is True
+    animate = animation.call_args.args[1]
+
+    lines = animate(0)
+    times = lines[0].get_xdata()
+    assert len(lines) == 2
+    assert 0 < len(times) <= 300
+    assert times[-1] - times[0] <= 0.5
+    assert lines[0].axes.get_xlim()[1] >= times[-1]
+
+
+def test_ring_buffer_keeps_latest_records():
+    """Test that the ring buffer overwrites the oldest records and reads back in time order."""
+    buffer = _RingBuffer(4, 2)
+    for t in range(3):
+        buffer.append(float(t), [t, -t])
+    times, states = buffer.ordered()
+    assert times.tolist() == [0.0, 1.0, 2.0]
+
+    for t in range(3, 10):
+        buffer.append(float(t), [t, -t])
+    times, states = buffer.ordered()
+    assert len(buffer) == 4
+    assert times.tolist() == [6.0, 7.0, 8.0, 9.0]
+    assert states[:, 1].tolist() == [-6.0, -7.0, -8.0, -9.0]
+
+
+def test_expanded_limits():
+    """Test that axis limits only change when the data leaves them."""
+    assert _expanded_limits(0.0, 1.0, 0.2, 0.9) is None
+    low, high = _expanded_limits(0.0, 1.0, 0.2, 2.0)
+    assert low == 0.0 and high > 2.0
+
+
+def test_calculate_in_background_matches_calculate(multi_reaction_environment):
+    """Test that a background run with a total time reproduces calculate()."""
+    kc = KineticalCalculator(accuracy=0.01)
+    kc.fit(multi_reaction_environment)
+    expected = kc.calculate(time=2.0, checkpoint_time=[0.5, 1.5])
+    run = kc.calculate_in_background(time=2.0, checkpoint_time=[0.5, 1.5], frame_stride=10)
+    results = run.result(timeout=30)
+
+    assert run.done
+    assert run.number_of_steps == kc.number_of_steps
+    assert all(np.array_equal(a, b) for a, b in zip(results, expected))
+
+
+def test_calculate_in_background_bounded_queue(simple_environment):
+    """Test that a slow consumer loses the oldest frames instead of blocking the run."""
+    kc = KineticalCalculator(accuracy=0.001)
+    kc.fit(simple_environment)
+    run = kc.calculate_in_background(time=2.0, frame_stride=1, queue_size=5)
+    final = run.result(timeout=30)[-1]
+
+    frames = []
+    while not run.frames.empty():
+        frames.append(run.frames.get_nowait())
+    assert len(frames) == 5
+    assert np.array_equal(frames[-1][1], final)
+    assert [t for t, _ in frames] == sorted(t for t, _ in frames)
+
+
+def test_calculate_in_background_pause_resume_stop(simple_environment):
+    """Test that pause, resume and stop are honored by an open-ended run."""
+    import time as clock
+
+    kc = KineticalCalculator(accuracy=0.001)
+    kc.fit(simple_environment)
+    run = kc.calculate_in_background(checkpoint_time=[0.01])
+    while run.number_of_steps < 100:
+        clock.sleep(0.001)
+    run.pause()
+    clock.sleep(0.05)
+    paused_at = run.number_of_steps
+    clock.sleep(0.05)
+    assert run.paused
+    assert run.number_of_steps == paused_at
+    run.resume()
+    while run.number_of_steps <= paused_at:
+        clock.sleep(0.001)
+    run.stop()
+    results = run.result(timeout=30)
+
+    assert len(results) == 2
+    assert run.done
+
+
+def test_calculate_in_background_invalid_arguments(simple_environment):
+    """Test argument validation of calculate_in_background."""
+    with pytest.raises(NameError):
+        KineticalCalculator().calculate_in_background(time=1.0)
+    kc = KineticalCalculator()
+    kc.fit(simple_environment)
+    with pytest.raises(ValueError):
+        kc.calculate_in_background(time=1.0, frame_stride=0)
+    with pytest.raises(ValueError):
+        kc.calculate_in_background(time=1.0, queue_size=0)
+
+
 # ---------- Edge Cases and Integration Tests ---------- #
 
 def test_zero_time_calculation(simple_environment):
@@ -460,3 +832,526 @@ def test_reaction_with_zero_rate_constants():
     initial = env.concentrations_array
     final = results[-1]
     assert np.allclose(final, initial, atol=1e-6)
+
+
+def test_calculate_plot_records_trajectory_one_line_per_compound(simple_environment, tmp_path):
+    """Plotting records the trajectory into arrays and draws one line per compound."""
+    import matplotlib.pyplot as plt
+    kc = KineticalCalculator(accuracy=0.01)
+    kc.fit(simple_environment)
+    with patch('matplotlib.pyplot.close'):
+        results = kc.calculate(time=1.0, plot="save", directory=str(tmp_path / "plot.png"))
+        lines = plt.gca().get_lines()
+    plt.close('all')
+    assert (tmp_path / "plot.png").exists()
+    assert len(lines) == len(simple_environment.compounds)
+    assert kc.trajectory.shape == (kc.number_of_steps + 1, len(simple_environment.compounds))
+    assert kc.trajectory_time[0] == 0.0
+    assert np.allclose(kc.trajectory[-1], results[-1])
+
+
+def test_calculate_plot_record_stride_downsamples(simple_environment, tmp_path):
+    """record_stride keeps every n-th step plus the final state."""
+    kc = KineticalCalculator(accuracy=0.01)
+    kc.fit(simple_environment)
+    kc.calculate(time=1.0, plot="save", directory=str(tmp_path / "full.png"))
+    full_time, full = kc.trajectory_time, kc.trajectory
+    kc.calculate(time=1.0, plot="save", directory=str(tmp_path / "strided.png"), record_stride=7)
+    assert len(kc.trajectory) == 1 + -(-kc.number_of_steps // 7)
+    assert np.allclose(kc.trajectory[:-1], full[::7])
+    assert kc.trajectory_time[-1] == full_time[-1]
+    assert np.allclose(kc.trajectory[-1], full[-1])
+
+
+@pytest.mark.parametrize("stride", [0, 1.5])
+def test_calculate_invalid_record_stride(simple_environment, stride):
+    """record_stride must be a positive integer."""
+    kc = KineticalCalculator(accuracy=0.01)
+    kc.fit(simple_environment)
+    with pytest.raises(ValueError, match="record_stride"):
+        kc.calculate(time=1.0, record_stride=stride)
+
+
+def test_numpy_integers_accepted_for_strides_and_chunks(simple_environment):
+    """NumPy integers (e.g. from np.arange) are valid strides and chunk sizes."""
+    kc = KineticalCalculator(accuracy=0.01)
+    kc.fit(simple_environment)
+    expected = kc.calculate(time=1.0, record_stride=5)
+    assert np.allclose(kc.calculate(time=1.0, record_stride=np.int64(5)), expected)
+    chunks = list(kc.iter_calculate(time=1.0, chunk_steps=np.arange(1, 40)[-1]))
+    assert len(chunks[0][0]) == 39
+
+
+def test_trajectory_buffer_grows_past_capacity():
+    """The trajectory buffer doubles when an adaptive run outgrows its capacity."""
+    buffer = _TrajectoryBuffer(np.zeros(2), capacity=2)
+    for step in range(1, 10):
+        buffer.record(0.1 * step, np.full(2, step))
+    buffer.finish()
+    assert len(buffer.time) == 10
+    assert np.allclose(buffer.concentrations[:, 0], np.arange(10))
+    assert np.allclose(buffer.time, 0.1 * np.arange(10))
+
+
+@pytest.mark.parametrize("method", ["euler", "rk45", "trbdf2"])
+def test_iter_calculate_chunks_match_calculate(simple_environment, method):
+    """Streamed chunks cover the whole run and end at the state calculate returns."""
+    kc = KineticalCalculator(accuracy=0.01, method=method)
+    kc.fit(simple_environment)
+    final = kc.calculate(time=2.0)[-1]
+    steps = kc.number_of_steps
+    chunks = list(kc.iter_calculate(time=2.0, chunk_steps=16))
+    assert all(len(t_chunk) == 16 for t_chunk, _ in chunks[:-1])
+    assert 1 <= len(chunks[-1][0]) <= 16
+    times = np.concatenate([t_chunk for t_chunk, _ in chunks])
+    states = np.concatenate([c_chunk for _, c_chunk in chunks])
+    assert len(times) == steps + 1
+    assert times[0] == 0.0 and np.all(np.diff(times) > 0)
+    assert np.allclose(states[0], simple_environment.concentrations_array)
+    assert np.allclose(states[-1], final)
+
+
+def test_iter_calculate_can_stop_early(simple_environment):
+    """Breaking out of the generator stops the integration."""
+    kc = KineticalCalculator(accuracy=0.01)
+    kc.fit(simple_environment)
+    for t_chunk, concentrations_chunk in kc.iter_calculate(time=1e6, chunk_steps=10):
+        break
+    assert kc.number_of_steps == 10
+    assert concentrations_chunk.shape == (10, len(simple_environment.compounds))
+
+
+def test_iter_calculate_validation(simple_environment):
+    """iter_calculate requires a fitted model and a positive chunk size."""
+    with pytest.raises(NameError):
+        next(KineticalCalculator().iter_calculate(time=1.0))
+    kc = KineticalCalculator()
+    kc.fit(simple_environment)
+    with pytest.raises(ValueError, match="chunk_steps"):
+        next(kc.iter_calculate(time=1.0, chunk_steps=0))
+
+
+@pytest.mark.parametrize("method", ["euler", "rk45"])
+def test_calculate_output_writes_memmap_trajectory(simple_environment, tmp_path, method):
+    """output streams states, times and species names into .npy files."""
+    kc = KineticalCalculator(accuracy=0.01, method=method)
+    kc.fit(simple_environment)
+    results = kc.calculate(time=1.0, output=tmp_path / "run.npy")
+    states = np.load(tmp_path / "run.npy", mmap_mode="r")
+    times = np.load(tmp_path / "run.time.npy")
+    assert isinstance(states, np.memmap)
+    assert states.shape == (kc.number_of_steps + 1, len(simple_environment.compounds))
+    assert times[0] == 0.0 and np.all(np.diff(times) > 0)
+    assert np.allclose(states[0], simple_environment.concentrations_array)
+    assert np.allclose(states[-1], results[-1])
+    assert list(np.load(tmp_path / "run.species.npy")) == simple_environment.compounds_unicode_formula
+
+
+def test_calculate_output_append_resumes_run(simple_environment, tmp_path):
+    """Appending continues from the stored state and matches one long run."""
+    kc = KineticalCalculator(accuracy=0.01, method="rk45")
+    kc.fit(simple_environment)
+    kc.calculate(time=1.0, output=tmp_path / "run.npy", record_stride=3)
+    first = len(np.load(tmp_path / "run.npy"))
+    kc.calculate(time=1.0, output=tmp_path / "run.npy", append=True, record_stride=3)
+    states = np.load(tmp_path / "run.npy")
+    times = np.load(tmp_path / "run.time.npy")
+    assert len(states) == len(times) > first
+    assert np.all(np.diff(times) > 0)
+    assert times[-1] == pytest.approx(2.0)
+    assert np.allclose(states[-1], kc.calculate(time=2.0)[-1], rtol=1e-5)
+
+
+def test_calculate_output_overwrites_without_append(simple_environment, tmp_path):
+    """Without append an existing trajectory is replaced."""
+    kc = KineticalCalculator(accuracy=0.01)
+    kc.fit(simple_environment)
+    kc.calculate(time=1.0, output=tmp_path / "run.npy")
+    kc.calculate(time=0.5, output=tmp_path / "run.npy")
+    assert np.load(tmp_path / "run.time.npy")[-1] == pytest.approx(0.5, abs=0.02)
+
+
+def test_calculate_output_append_rejects_other_compounds(simple_environment, multi_reaction_environment, tmp_path):
+    """A stored trajectory can only be extended for the same compounds."""
+    kc = KineticalCalculator(accuracy=0.01)
+    kc.fit(simple_environment)
+    kc.calculate(time=0.1, output=tmp_path / "run.npy")
+    kc.fit(multi_reaction_environment)
+    with pytest.raises(ValueError, match="compounds"):
+        kc.calculate(time=0.1, output=tmp_path / "run.npy", append=True)
+
+
+def test_npy_appender_grows_across_blocks(tmp_path):
+    """Rows spanning several memmap blocks end up in one valid .npy file."""
+    path = str(tmp_path / "rows.npy")
+    appender = _NpyAppender(path, (3,), block_rows=4)
+    for i in range(10):
+        appender.append(np.full(3, i))
+    appender.close()
+    appender = _NpyAppender(path, (3,), append=True, block_rows=4)
+    for i in range(10, 13):
+        appender.append(np.full(3, i))
+    appender.close()
+    assert np.array_equal(np.load(path)[:, 0], np.arange(13))
+
+
+@pytest.mark.parametrize("method", ["euler", "rk45", "trbdf2"])
+def test_calculate_steady_state_stops_early(simple_environment, method):
+    """A run far past equilibrium stops once the rates vanish and reports when."""
+    kc = KineticalCalculator(accuracy=0.01, method=method)
+    kc.fit(simple_environment)
+    full = kc.calculate(time=200.0, checkpoint_time=[150.0])
+    full_steps = kc.number_of_steps
+    assert kc.steady_state_time is None
+    results = kc.calculate(time=200.0, checkpoint_time=[150.0], steady_state_tol=1e-6, steady_state_window=1.0)
+    assert kc.steady_state_time is not None and kc.steady_state_time < 100.0
+    assert kc.number_of_steps < full_steps
+    assert len(results) == len(full)
+    assert np.allclose(results[0], full[0], atol=1e-5)
+    assert np.allclose(results[-1], full[-1], atol=1e-5)
+
+
+def test_calculate_steady_state_not_reached(simple_environment):
+    """A tolerance that is never met runs the whole horizon."""
+    kc = KineticalCalculator(accuracy=0.01)
+    kc.fit(simple_environment)
+    kc.calculate(time=1.0, steady_state_tol=1e-12)
+    assert kc.steady_state_time is None
+    assert kc.number_of_steps == int(1.0 / 0.01 + 1)
+
+
+def test_fit_compiles_rate_of_change(multi_reaction_environment):
+    """fit exposes a compiled dc/dt that agrees with the NumPy kernel."""
+    kc = KineticalCalculator()
+    kc.fit(multi_reaction_environment)
+    env = multi_reaction_environment
+    assert hasattr(kc.rate_of_change, "source")
+    states = np.random.default_rng(0).uniform(0, 2, size=(5, len(env.compounds)))
+    expected = _rate_of_change(states, _rate_laws(env.rate_dependency_array), env.stoichiometric_coefficient_array, env.rate_constants_array)
+    assert np.allclose(kc.rate_of_change(states), expected)
+    assert np.allclose(kc.rate_of_change(states[0]), expected[0])
+
+
+def test_compiled_rate_of_change_negative_order_at_zero():
+    """A negative rate order of a depleted species gives a finite rate instead of raising."""
+    env = Enviroment(Reaction.from_string_simple_syntax("A > B-1", [1, 0]))
+    kc = KineticalCalculator(1e-3)
+    kc.fit(env)
+    assert hasattr(kc.rate_of_change, "source")
+    state = np.array([1.0, 0.0])
+    expected = _rate_of_change(state, _rate_laws(env.rate_dependency_array), env.stoichiometric_coefficient_array, env.rate_constants_array)
+    assert np.allclose(kc.rate_of_change(state), expected)
+    assert np.all(np.isfinite(kc.calculate(0.01)))
+
+
+def test_compiled_rate_of_change_matches_numpy_for_steep_negative_order():
+    """An order of -2 on a depleted species overflows to inf in both kernels instead of raising."""
+    env = Enviroment(Reaction.from_string_simple_syntax("A + B-2 > C", [1, 0, 0]))
+    rate_of_change = env.compile_rate_of_change()
+    laws = _rate_laws(env.rate_dependency_array)
+    states = np.array([[1.0, 0.0, 0.0], [1.0, 0.5, 0.0]])
+    with np.errstate(all="ignore"):
+        expected = _rate_of_change(states, laws, env.stoichiometric_coefficient_array, env.rate_constants_array)
+        assert np.allclose(rate_of_change(states), expected, equal_nan=True)
+        for state, row in zip(states, expected):
+            assert np.allclose(rate_of_change(state), row, equal_nan=True)
+    assert np.isinf(expected[0]).any()
+
+
+@pytest.mark.parametrize("method", ["euler", "rk45", "trbdf2"])
+def test_fit_calculate_empty_enviroment(method):
+    """An environment without reactions compiles to a zero rate of change and integrates."""
+    kc = KineticalCalculator(method=method)
+    kc.fit(Enviroment())
+    assert kc.rate_of_change(np.empty(0)).shape == (0,)
+    assert [state.shape for state in kc.calculate(time=1.0)] == [(0,)]
+
+
+def test_implicit_method_uses_fitted_rate_constants(multi_reaction_environment):
+    """Changing the environment after fit affects neither the right-hand side nor the Jacobian."""
+    reference = KineticalCalculator(method="trbdf2").fit_calculate(multi_reaction_environment, time=2.0)
+    kc = KineticalCalculator(method="trbdf2")
+    kc.fit(multi_reaction_environment)
+    multi_reaction_environment.reactions[0].kf = 50.0
+    rate_of_change, jacobian = kc._rate_functions()
+    assert np.allclose(jacobian(np.array([1.0, 0.0, 0.0]))[:, 0], [-0.5, 0.5, 0.0])
+    assert np.allclose(kc.calculate(time=2.0), reference)
+
+
+def test_fit_sparse_uses_numpy_rate_of_change(multi_reaction_environment):
+    """Sparse networks keep the NumPy evaluator instead of generated code."""
+    kc = KineticalCalculator(sparse=True)
+    kc.fit(multi_reaction_environment)
+    assert not hasattr(kc.rate_of_change, "source")
+    env = multi_reaction_environment
+    c = env.concentrations_array
+    expected = _rate_of_change(c, _rate_laws(env.rate_dependency_array), env.stoichiometric_coefficient_array, env.rate_constants_array)
+    assert np.allclose(kc.rate_of_change(c), expected)
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_rate_law_matches_log_exp_for_mixed_orders(sparse):
+    """Integer, half-integer, fractional, negative and high orders agree with exp(orders @ log c)."""
+    orders = np.array([
+        [1.0, 0.0, 0.0, 0.0],
+        [2.0, 1.0, 0.0, 0.0],
+        [0.5, 0.0, 1.5, 0.0],
+        [0.0, 0.3, 0.0, 1.0],
+        [0.0, 0.0, -1.0, 0.0],
+        [10.0, 0.0, 0.0, 2.5],
+        [0.0, 0.0, 0.0, 0.0],
+    ])
+    law = _RateLaw(SparseMatrix.from_dense(orders) if sparse else orders)
+    states = np.random.default_rng(1).uniform(0.1, 2.0, size=(6, 4))
+    expected = np.exp(np.log(states) @ orders.T)
+    assert np.allclose(law(states), expected)
+    for state, row in zip(states, expected):
+        assert np.allclose(law(state), row)
+
+
+def test_rate_law_gives_exact_zero_for_depleted_reactant():
+    """Integer and half-integer orders multiply out to exactly zero at zero concentration."""
+    law = _RateLaw(np.array([[1.0, 1.0], [0.0, 1.5], [0.0, 0.0]]))
+    products = law(np.array([0.0, 0.0]))
+    assert products[0] == 0.0 and products[1] == 0.0
+    assert products[2] == 1.0
+
+
+def test_numba_backend_matches_numpy(multi_reaction_environment, tmp_path):
+    """The compiled Euler loop reproduces checkpoints, steady state and the plotted trajectory."""
+    pytest.importorskip("numba")
+    kwargs = dict(time=50.0, checkpoint_time=[0.5, 2.0, 45.0], steady_state_tol=1e-7, steady_state_window=0.5)
+    reference = KineticalCalculator(accuracy=0.01)
+    reference.fit(multi_reaction_environment)
+    compiled = KineticalCalculator(accuracy=0.01, backend="numba")
+    compiled.fit(multi_reaction_environment)
+    assert compiled.backend == "numba"
+    expected = reference.calculate(**kwargs)
+    results = compiled.calculate(**kwargs)
+    assert len(results) == len(expected)
+    assert np.allclose(results, expected, rtol=1e-10, atol=1e-12)
+    assert compiled.number_of_steps == reference.number_of_steps
+    assert compiled.steady_state_time == pytest.approx(reference.steady_state_time)
+    reference.calculate(time=1.0, plot="save", directory=str(tmp_path / "a.png"), record_stride=7)
+    compiled.calculate(time=1.0, plot="save", directory=str(tmp_path / "b.png"), record_stride=7)
+    assert np.allclose(compiled.trajectory_time, reference.trajectory_time)
+    assert np.allclose(compiled.trajectory, reference.trajectory)
+
+
+def test_numba_backend_requires_euler():
+    """Only the fixed-step loop is compiled."""
+    with pytest.raises(ValueError, match="only supports method='euler'"):
+        KineticalCalculator(method="rk45", backend="numba")
+    with pytest.raises(ValueError, match="`backend` is not one of"):
+        KineticalCalculator(backend="cuda")
+
+
+def test_numba_backend_falls_back_without_numba(simple_environment):
+    """Without numba a warning is issued and NumPy runs the loop."""
+    with patch.dict("sys.modules", {"numba": None}):
+        with pytest.warns(RuntimeWarning, match="numba is not installed"):
+            kc = KineticalCalculator(accuracy=0.01, backend="numba")
+    assert kc.backend == "numpy"
+    kc.fit(simple_environment)
+    assert len(kc.calculate(time=0.1)) == 1
+
+
+def test_fit_does_not_resolve_backend_again(simple_environment):
+    """The model reuses the calculator's validated settings, so a missing numba warns only once."""
+    with patch.dict("sys.modules", {"numba": None}):
+        with pytest.warns(RuntimeWarning, match="numba is not installed"):
+            kc = KineticalCalculator(accuracy=0.01, backend="numba")
+        with patch("ChemCompute.Kinetic._resolve_backend") as resolve:
+            kc.fit(simple_environment)
+    resolve.assert_not_called()
+    assert kc.model._integrator.backend == "numpy" and kc.model._integrator.accuracy == 0.01
+
+
+# ---------- Prepared Model Tests ---------- #
+
+@pytest.mark.parametrize("method", ["euler", "rk45", "trbdf2"])
+def test_model_solve_matches_calculate(multi_reaction_environment, method):
+    """Test that the fitted model reproduces calculate() without touching the calculator."""
+    kc = KineticalCalculator(accuracy=0.01, method=method)
+    kc.fit(multi_reaction_environment)
+    expected = kc.calculate(time=1.0, checkpoint_time=[0.5])
+
+    assert isinstance(kc.model, KineticModel)
+    states = kc.model.solve(1.0, checkpoint_time=[0.5])
+    assert states.shape == (2, 3)
+    assert np.allclose(states, expected, atol=1e-12)
+
+
+def test_model_solve_overrides(multi_reaction_environment):
+    """Test initial-state and rate-constant overrides against a modified environment."""
+    model = KineticModel(multi_reaction_environment, accuracy=0.01)
+    states = model.solve(1.0, {"A": 0.4, "C": 0.6}, {"kf": {1: 2.0}, "kb": [0.1, 0.1]})
+
+    multi_reaction_environment.concentrations = [0.4, 0.0, 0.6]
+    multi_reaction_environment.reactions[1].kf = 2.0
+    multi_reaction_environment.reactions[0].kb = multi_reaction_environment.reactions[1].kb = 0.1
+    expected = KineticalCalculator(accuracy=0.01).fit_calculate(multi_reaction_environment, time=1.0)
+    assert np.allclose(states, expected, atol=1e-12)
+
+
+def test_model_solve_temperature():
+    """Test that a temperature override applies the Arrhenius scaling of Reaction.T."""
+    def environment():
+        A = Compound("A")
+        B = Compound("B")
+        rxn = Reaction([{"stoichiometric_coefficient": 1, "compound": A, "rate_dependency": 1}],
+                       [{"stoichiometric_coefficient": 1, "compound": B, "rate_dependency": 1}],
+                       [1.0], [0.0], K=2.0, kf=0.5, kb=0.25,
+                       activation_energy_forward=20000, activation_energy_backward=30000)
+        return Enviroment(rxn, T=298)
+
+    model = KineticModel(environment(), accuracy=0.01)
+    env = environment()
+    env.T = 330
+    expected = KineticalCalculator(accuracy=0.01).fit_calculate(env, time=1.0)
+    assert np.allclose(model.solve(1.0, params={"T": 330}), expected, atol=1e-12)
+    assert model.T == 298
+
+
+def test_model_solve_batch(simple_environment):
+    """Test that a batch of initial states is integrated as an ensemble."""
+    kc = KineticalCalculator(accuracy=0.01)
+    kc.fit(simple_environment)
+    initial = np.array([[1.0, 0.0], [0.2, 0.8]])
+    expected = kc.calculate_ensemble(time=1.0, initial_concentrations=initial)
+    assert np.allclose(kc.model.solve(1.0, initial), expected, atol=1e-12)
+
+
+def test_model_is_immutable_snapshot(simple_environment):
+    """Test that the model rejects changes and ignores later changes to the environment."""
+    model = KineticModel(simple_environment, accuracy=0.01)
+    before = model.solve(1.0)
+    simple_environment.concentrations = [5.0, 0.0]
+    simple_environment.reactions[0].kf = 10.0
+
+    assert np.array_equal(model.solve(1.0), before)
+    with pytest.raises(AttributeError):
+        model.T = 350
+    with pytest.raises(ValueError):
+        model.rate_constants[0, 0] = 1.0
+    with pytest.raises(ValueError):
+        model.solve(1.0, params={"pressure": 2.0})
+    with pytest.raises(ValueError):
+        model.solve(1.0, {"D": 1.0})
+    with pytest.raises(ValueError):
+        KineticModel("not an environment")
+
+
+def test_model_pickle_roundtrip(multi_reaction_environment):
+    """Test that a pickled model (e.g. sent to a worker process) solves identically."""
+    import pickle
+
+    model = KineticModel(multi_reaction_environment, accuracy=0.01)
+    restored = pickle.loads(pickle.dumps(model))
+    assert np.array_equal(restored.solve(1.0), model.solve(1.0))
+
+
+@pytest.mark.parametrize("backend", ["numpy", "numba"])
+def test_model_solve_concurrent_threads(multi_reaction_environment, backend):
+    """Test that one shared model gives the same answers from many threads."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    if backend == "numba":
+        pytest.importorskip("numba")
+    model = KineticModel(multi_reaction_environment, accuracy=0.01, backend=backend)
+    states = [{"A": value} for value in np.linspace(0.5, 2.0, 16)]
+    expected = [model.solve(2.0, state, checkpoint_time=[1.0]) for state in states]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda state: model.solve(2.0, state, checkpoint_time=[1.0]), states))
+    assert all(np.array_equal(result, serial) for result, serial in zip(results, expected))
+    assert np.allclose(expected[0], KineticModel(multi_reaction_environment, accuracy=0.01).solve(2.0, states[0], checkpoint_time=[1.0]), atol=1e-12)
+
+
+# ---------- Async API Tests ---------- #
+
+def test_acalculate_matches_calculate(multi_reaction_environment):
+    """Test that acalculate returns the same checkpoints as calculate."""
+    import asyncio
+
+    kc = KineticalCalculator(accuracy=0.01)
+    kc.fit(multi_reaction_environment)
+    expected = kc.calculate(time=2.0, checkpoint_time=[0.5, 1.5])
+    results = asyncio.run(kc.acalculate(time=2.0, checkpoint_time=[0.5, 1.5], yield_every=7))
+
+    assert len(results) == len(expected)
+    assert all(np.array_equal(a, b) for a, b in zip(results, expected))
+    assert kc.number_of_steps == int(2.0 / 0.01 + 1)
+
+
+def test_acalculate_yields_to_event_loop(simple_environment):
+    """Test that other tasks run while a long simulation is in progress."""
+    import asyncio
+
+    kc = KineticalCalculator(accuracy=0.001)
+    kc.fit(simple_environment)
+    ticks = []
+
+    async def main():
+        async def ticker():
+            while True:
+                ticks.append(kc.number_of_steps)
+                await asyncio.sleep(0)
+        other = asyncio.create_task(ticker())
+        await kc.acalculate(time=5.0, yield_every=100)
+        other.cancel()
+
+    asyncio.run(main())
+    assert len(ticks) > 10
+    assert 0 < ticks[len(ticks) // 2] < kc.number_of_steps
+
+
+def test_acalculate_cancellation_closes_output(simple_environment, tmp_path):
+    """Test that cancelling stops the run and leaves a valid partial trajectory file."""
+    import asyncio
+
+    kc = KineticalCalculator(accuracy=0.001)
+    kc.fit(simple_environment)
+    path = tmp_path / "run.npy"
+
+    async def main():
+        task = asyncio.create_task(kc.acalculate(time=1000.0, output=path, yield_every=50))
+        for _ in range(5):
+            await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    stored = np.load(path)
+    assert 1 < len(stored) < 1000
+    assert len(np.load(tmp_path / "run.time.npy")) == len(stored)
+
+
+def test_aiter_calculate_matches_iter_calculate(simple_environment):
+    """Test that the async chunks equal the synchronous ones."""
+    import asyncio
+
+    kc = KineticalCalculator(accuracy=0.01)
+    kc.fit(simple_environment)
+    expected = list(kc.iter_calculate(time=1.0, chunk_steps=30))
+
+    async def collect():
+        return [chunk async for chunk in kc.aiter_calculate(time=1.0, chunk_steps=30)]
+
+    chunks = asyncio.run(collect())
+    assert len(chunks) == len(expected)
+    for (t, c), (t_expected, c_expected) in zip(chunks, expected):
+        assert np.array_equal(t, t_expected)
+        assert np.array_equal(c, c_expected)
+
+
+def test_acalculate_invalid_arguments(simple_environment):
+    """Test argument validation of acalculate."""
+    import asyncio
+
+    with pytest.raises(NameError):
+        asyncio.run(KineticalCalculator().acalculate(time=1.0))
+    kc = KineticalCalculator()
+    kc.fit(simple_environment)
+    with pytest.raises(ValueError):
+        asyncio.run(kc.acalculate(time=1.0, yield_every=0))
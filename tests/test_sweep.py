@@ -0,0 +1,105 @@
+import pytest
+import numpy as np
+
+# Import from ChemCompute package
+from ChemCompute import Enviroment, Compound, Reaction
+from ChemCompute.Kinetic import KineticalCalculator
+from ChemCompute.Sweep import sweep
+
+
+# -------------------------
+# Parameter Sweep Tests
+# -------------------------
+
+def _environment(T=298):
+    """Create the environment A ⇌ B, B ⇌ C with temperature-dependent rate constants."""
+    A = Compound("A")
+    B = Compound("B")
+    C = Compound("C")
+    rxn1 = Reaction([{"stoichiometric_coefficient": 1, "compound": A, "rate_dependency": 1}],
+                    [{"stoichiometric_coefficient": 1, "compound": B, "rate_dependency": 1}],
+                    [1.0], [0.0], K=2.0, kf=0.5, kb=0.25,
+                    activation_energy_forward=20000, activation_energy_backward=30000)
+    rxn2 = Reaction([{"stoichiometric_coefficient": 1, "compound": B, "rate_dependency": 1}],
+                    [{"stoichiometric_coefficient": 1, "compound": C, "rate_dependency": 1}],
+                    [0.0], [0.0], K=1.5, kf=0.3, kb=0.2)
+    return Enviroment(rxn1, rxn2, T=T)
+
+
+@pytest.fixture
+def environment():
+    return _environment()
+
+
+def test_sweep_matches_individual_runs(environment):
+    """Test that each run equals fit_calculate on an environment with the same parameters."""
+    overrides = [{}, {"concentrations": {"A": 0.4, "C": 0.6}}, {"kf": {1: 2.0}, "kb": [0.1, 0.1]}, {"T": 320}]
+    results = sweep(environment, overrides, time=1.0, checkpoint_time=[0.5], workers=1, accuracy=0.01)
+
+    assert results.shape == (4, 2, 3)
+    expected = [KineticalCalculator(accuracy=0.01).fit_calculate(_environment(), time=1.0, checkpoint_time=[0.5])]
+    env = _environment()
+    env.concentrations = [0.4, 0.0, 0.6]
+    expected.append(KineticalCalculator(accuracy=0.01).fit_calculate(env, time=1.0, checkpoint_time=[0.5]))
+    env = _environment()
+    env.reactions[1].kf = 2.0
+    env.reactions[0].kb = env.reactions[1].kb = 0.1
+    expected.append(KineticalCalculator(accuracy=0.01).fit_calculate(env, time=1.0, checkpoint_time=[0.5]))
+    env = _environment()
+    env.T = 320
+    expected.append(KineticalCalculator(accuracy=0.01).fit_calculate(env, time=1.0, checkpoint_time=[0.5]))
+    for run, states in enumerate(expected):
+        assert np.allclose(results[run], states, atol=1e-12)
+
+
+def test_sweep_does_not_modify_environment(environment):
+    """Test that the base environment keeps its parameters."""
+    sweep(environment, [{"T": 350, "kf": [1.0, 1.0], "concentrations": [0.0, 1.0, 0.0]}], time=0.1, workers=1)
+    assert environment.T == 298
+    assert environment.rate_constants_array.tolist() == [[0.5, 0.25], [0.3, 0.2]]
+    assert environment.concentrations_array.tolist() == [1.0, 0.0, 0.0]
+
+
+def test_sweep_grid_order(environment):
+    """Test that a grid expands to its cartesian product with the last key varying fastest."""
+    grid = {"T": [290, 310], "kf": [{0: 0.5}, {0: 1.0}, {0: 2.0}]}
+    results = sweep(environment, grid, time=0.5, workers=1)
+    listed = sweep(environment, [{"T": T, "kf": kf} for T in grid["T"] for kf in grid["kf"]], time=0.5, workers=1)
+
+    assert results.shape == (6, 1, 3)
+    assert np.array_equal(results, listed)
+
+
+def test_sweep_process_pool_matches_in_process(environment):
+    """Test that worker processes return the same results, in input order."""
+    overrides = [{"concentrations": {"A": value}} for value in np.linspace(0.1, 2.0, 7)]
+    serial = sweep(environment, overrides, time=0.5, checkpoint_time=[0.1, 0.2], workers=1)
+    parallel = sweep(environment, overrides, time=0.5, checkpoint_time=[0.1, 0.2], workers=2, chunksize=2)
+
+    assert np.array_equal(serial, parallel)
+
+
+@pytest.mark.parametrize("method", ["rk45", "trbdf2"])
+def test_sweep_adaptive_methods(environment, method):
+    """Test that the integration settings are passed to the calculator."""
+    results = sweep(environment, [{"kb": {0: 0.5}}], time=1.0, workers=1, method=method)
+    env = _environment()
+    env.reactions[0].kb = 0.5
+    expected = KineticalCalculator(method=method).fit_calculate(env, time=1.0)
+    assert np.allclose(results[0], expected, atol=1e-12)
+
+
+def test_sweep_invalid_overrides(environment):
+    """Test that malformed overrides raise ValueError before anything runs."""
+    with pytest.raises(ValueError):
+        sweep(environment, [{"pressure": 2.0}], time=1.0, workers=1)
+    with pytest.raises(ValueError):
+        sweep(environment, [{"concentrations": {"D": 1.0}}], time=1.0, workers=1)
+    with pytest.raises(ValueError):
+        sweep(environment, [{"kf": {2: 1.0}}], time=1.0, workers=1)
+    with pytest.raises(ValueError):
+        sweep(environment, [{"kb": [1.0]}], time=1.0, workers=1)
+    with pytest.raises(ValueError):
+        sweep("not an environment", [{}], time=1.0)
+    with pytest.raises(ValueError):
+        sweep(environment, [{}], time=1.0, method="leapfrog")
@@ -3,7 +3,7 @@ import numpy as np
 
 # Import from ChemCompute package
 from ChemCompute import Enviroment, Compound, Reaction
-from ChemCompute.Thermodynamic import EquilibriumCalculator
+from ChemCompute.Thermodynamic import EquilibriumCalculator, EquilibriumModel
 
 
 # -------------------------
@@ -155,6 +155,50 @@ def phase_environment():
     return env
 
 
+@pytest.mark.parametrize("method", ["bgd", "sgd", "newton"])
+def test_calculate_sparse_matches_dense(complex_stoichiometry_environment, method):
+    """Test that the sparse network representation gives the dense equilibrium."""
+    np.random.seed(0)
+    dense = EquilibriumCalculator(method_of_calculation=method, sparse=False)
+    result_dense = dense.fit_calculate(complex_stoichiometry_environment, max_iter=2000)
+    np.random.seed(0)
+    sparse = EquilibriumCalculator(method_of_calculation=method, sparse=True)
+    result_sparse = sparse.fit_calculate(complex_stoichiometry_environment, max_iter=2000)
+    assert np.allclose(result_dense, result_sparse, atol=1e-8)
+
+
+def test_calculate_sparse_phase_exclusion(phase_environment):
+    """Test that s/l phases are excluded from the sparse mass-action exponents."""
+    dense = EquilibriumCalculator(method_of_calculation="newton", sparse=False)
+    sparse = EquilibriumCalculator(method_of_calculation="newton", sparse=True)
+    assert np.allclose(dense.fit_calculate(phase_environment), sparse.fit_calculate(phase_environment))
+
+
+@pytest.mark.parametrize("method", ["bgd", "newton"])
+def test_calculate_numba_backend_matches_numpy(multi_reaction_equilibrium_environment, phase_environment, method):
+    """Test that the compiled iterations reproduce the NumPy solver."""
+    pytest.importorskip("numba")
+    for env in (multi_reaction_equilibrium_environment, phase_environment):
+        numpy_result = EquilibriumCalculator(method_of_calculation=method).fit_calculate(env)
+        numba_calc = EquilibriumCalculator(method_of_calculation=method, backend="numba")
+        assert numba_calc.backend == "numba"
+        assert np.allclose(numba_calc.fit_calculate(env), numpy_result, rtol=1e-6, atol=1e-10)
+
+
+def test_calculate_numba_backend_sgd_converges(simple_equilibrium_environment):
+    """Test that compiled SGD reaches the equilibrium K = [B]/[A] = 2."""
+    pytest.importorskip("numba")
+    calc = EquilibriumCalculator(method_of_calculation="sgd", backend="numba")
+    A, B = calc.fit_calculate(simple_equilibrium_environment)
+    assert np.isclose(B / A, 2.0, rtol=1e-4)
+
+
+def test_invalid_backend_raises():
+    """Test that an unknown backend is rejected."""
+    with pytest.raises(ValueError, match="`backend` is not one of"):
+        EquilibriumCalculator(backend="cuda")
+
+
 # ---------- Fit Method Tests ---------- #
 
 def test_fit_valid_environment(simple_equilibrium_environment):
@@ -742,3 +786,103 @@ def test_x_solution_multi_reaction(multi_reaction_equilibrium_environment):
     assert isinstance(calc.x_solution, np.ndarray)
     assert len(calc.x_solution) == 2  # Two reactions
 
+
+
+# ---------- Prepared Model Tests ---------- #
+
+def _enthalpy_environment():
+    """Create A ⇌ B with a reaction enthalpy, so K depends on temperature."""
+    A = Compound("A")
+    B = Compound("B")
+    rxn = Reaction([{"stoichiometric_coefficient": 1, "compound": A, "rate_dependency": 1}],
+                   [{"stoichiometric_coefficient": 1, "compound": B, "rate_dependency": 1}],
+                   [1.0], [0.0], K=2.0, kf=0.5, kb=0.25, enthalpy=-40000)
+    return Enviroment(rxn, T=298)
+
+
+@pytest.mark.parametrize("method", ["bgd", "sgd", "newton"])
+def test_model_solve_matches_calculate(multi_reaction_equilibrium_environment, method):
+    """Test that the fitted model reproduces calculate() and leaves the calculator untouched."""
+    calc = EquilibriumCalculator(method_of_calculation=method)
+    calc.fit(multi_reaction_equilibrium_environment)
+    expected = calc.calculate(max_iter=1000, tol=1e-10)
+
+    assert isinstance(calc.model, EquilibriumModel)
+    result = calc.model.solve(max_iter=1000, tol=1e-10, seed=0)
+    assert np.allclose(result, expected, atol=1e-6)
+
+
+def test_model_solve_overrides():
+    """Test initial-state and temperature overrides against a modified environment."""
+    model = EquilibriumModel(_enthalpy_environment(), method_of_calculation="newton")
+    env = _enthalpy_environment()
+    env.T = 350
+    env.concentrations = [0.5, 0.5]
+    expected = EquilibriumCalculator(method_of_calculation="newton").fit_calculate(env, tol=1e-12)
+
+    result = model.solve({"A": 0.5, "B": 0.5}, {"T": 350}, tol=1e-12)
+    assert np.allclose(result, expected, atol=1e-9)
+    assert model.T == 298
+
+
+def test_model_solve_equilibrium_constant_override(simple_equilibrium_environment):
+    """Test that a K override is used as given."""
+    calc = EquilibriumCalculator(method_of_calculation="newton")
+    calc.fit(simple_equilibrium_environment)
+    result = calc.model.solve(params={"K": {0: 4.0}}, tol=1e-12)
+    assert np.isclose(result[1] / result[0], 4.0)
+
+
+def test_model_is_immutable_snapshot(simple_equilibrium_environment):
+    """Test that the model rejects changes and ignores later changes to the environment."""
+    model = EquilibriumModel(simple_equilibrium_environment)
+    before = model.solve()
+    simple_equilibrium_environment.concentrations = [5.0, 0.0]
+
+    assert np.allclose(model.solve(), before)
+    with pytest.raises(AttributeError):
+        model.T = 350
+    with pytest.raises(ValueError):
+        model.concentrations[0] = 2.0
+    with pytest.raises(ValueError):
+        model.solve(params={"pressure": 2.0})
+    with pytest.raises(ValueError):
+        model.solve({"D": 1.0})
+
+
+def test_model_solve_concurrent_threads(multi_reaction_equilibrium_environment):
+    """Test that one shared model gives the same answers from many threads."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    model = EquilibriumModel(multi_reaction_equilibrium_environment, method_of_calculation="newton")
+    states = [[value, 0.0, 0.0] for value in np.linspace(0.5, 2.0, 16)]
+    expected = [model.solve(state) for state in states]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(model.solve, states))
+    assert all(np.array_equal(result, serial) for result, serial in zip(results, expected))
+
+
+# ---------- Async API Tests ---------- #
+
+@pytest.mark.parametrize("method", ["bgd", "newton"])
+def test_acalculate_matches_calculate(multi_reaction_equilibrium_environment, method):
+    """Test that acalculate gives the calculate() result and stores x_solution."""
+    import asyncio
+
+    calc = EquilibriumCalculator(method_of_calculation=method)
+    calc.fit(multi_reaction_equilibrium_environment)
+    expected = calc.calculate(max_iter=1000, tol=1e-10)
+    expected_x = calc.x_solution
+    del calc.x_solution
+
+    result = asyncio.run(calc.acalculate(max_iter=1000, tol=1e-10))
+    assert result == expected
+    assert np.array_equal(calc.x_solution, expected_x)
+
+
+def test_acalculate_not_fitted():
+    """Test that acalculate raises ValueError when not fitted."""
+    import asyncio
+
+    with pytest.raises(ValueError, match="Environment not fitted"):
+        asyncio.run(EquilibriumCalculator().acalculate())